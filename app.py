@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, Response, stream_with_context, send_file
 from models import db, User, Resume, UserEmotionData, SessionSummary, EyeMetrics, Performance
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
@@ -20,9 +20,7 @@ from interview_advisor.integration import get_menu_options, mainmenu, getresumes
 import glob
 import requests
 import json
-import subprocess
 # Import pydub
-from pydub import AudioSegment
 import re
 from markupsafe import Markup
 
@@ -32,6 +30,11 @@ from interview_advisor.api import api_app as interview_advisor_api_blueprint
 # Import the advanced Interview class and Resume Processor
 from interview_advisor.interview import Interview
 from interview_advisor.resume_processor import ResumeProcessor
+from interview_advisor.document_context import get_document_context
+from interview_advisor.llm_gateway import get_llm_gateway, get_llm_metrics
+from interview_advisor.turn_jobs import TurnJobQueue
+from interview_advisor.session_store import StaleSessionError, create_session_store
+from interview_advisor.sessions import SessionJanitor, new_session_id
 
 # Import and configure Google Generative AI
 import google.generativeai as genai
@@ -41,7 +44,8 @@ try:
     from interview_advisor.tts_service import TTSService
     TTS_AVAILABLE = True
     # Initialize TTS service
-    tts_service = TTSService(silent_mode=False)
+    # The browser plays interview audio (fetched from /interview/audio), never the server
+    tts_service = TTSService(silent_mode=False, playback='client')
 except Exception as e:
     print(f"WARNING: TTS service could not be imported: {e}")
     print("Text-to-speech functionality will be disabled.")
@@ -50,6 +54,13 @@ except Exception as e:
 
 # Add this near your other imports
 from improved_career_recommendations import get_career_recommendations
+from career_match_engine import get_career_match_engine
+from skill_matcher import DEFAULT_SKILL_KEYWORDS
+from audio_pipeline import StageTimer, pcm_duration
+from interview_advisor.audio_signal import AudioDecodeError, PCM_SAMPLE_RATE, decode_to_pcm, pcm_to_samples
+from interview_advisor.speech_fluency import analyze_pcm
+from interview_advisor.utils import DatabaseManager
+from speech_stream import StreamLimitError, close_stream, get_stream, open_stream
 
 load_dotenv()
 
@@ -73,6 +84,11 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 app.secret_key = os.getenv('SECRET_KEY') or 'dev_secret_key_for_testing_only'
 
+# Accounts (comma-separated emails) that may read internal metrics such as /llm_metrics
+app.config['METRICS_ADMIN_EMAILS'] = {
+    email.strip().lower() for email in os.getenv('METRICS_ADMIN_EMAILS', '').split(',') if email.strip()
+}
+
 # Calculate instance path relative to project root (2 levels up from CWD)
 # Note: This instance path calculation might still be fragile. Consider using app.instance_path
 cwd = os.getcwd()
@@ -99,8 +115,13 @@ os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Suppress TensorFlow warnings
 # Ensure the upload folder exists
 # os.makedirs(UPLOAD_FOLDER, exist_ok=True) # Moved up
 
-# Dictionary to hold active Interview instances (keyed by user_id or session_id)
-active_interviews = {}
+# Active Interview instances keyed by user_id; set INTERVIEW_SESSION_STORE=sqlite
+# to share them between worker processes
+active_interviews = create_session_store(
+    lambda state: Interview.from_state(state, ai_client=ai_client, tts_service=tts_service))
+
+# Worker pool for interview turns submitted with async=1
+turn_jobs = TurnJobQueue()
 
 # Register the API blueprint with the /api prefix
 app.register_blueprint(interview_advisor_api_blueprint, url_prefix='/api')
@@ -609,7 +630,6 @@ def generate_improved_career_recommendations(resume_data, user_profile=None):
     try:
         # Use the AI client (assuming it's already set up elsewhere in your code)
         if ai_client:
-            recommendation_model = ai_client.GenerativeModel('gemini-1.5-flash')
             safety_settings = [
                 { "category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE" },
                 { "category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE" },
@@ -617,8 +637,9 @@ def generate_improved_career_recommendations(resume_data, user_profile=None):
                 { "category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE" }
             ]
             
-            response = recommendation_model.generate_content(
+            response = get_llm_gateway(ai_client).generate(
                 prompt,
+                call_site="app.improved_career_recommendations",
                 safety_settings=safety_settings
             )
             
@@ -683,19 +704,41 @@ def start_guidance():
         # Add any other profile fields you have
     }
 
+    # Reuse the text ResumeProcessor already extracted for this file; only
+    # extract here if that step did not run or failed
+    resume_text = ""
+    if os.path.exists(resume_path_abs):
+        try:
+            resume_text = get_document_context(resume_path_abs).get(
+                "text", lambda: functions.extract_resume_text(resume_path_abs))
+        except Exception as e:
+            print(f"Warning: OCR dependencies issue - {str(e)}. Will proceed with empty text.")
+            resume_text = ""
+
+    # Rank the career catalog against the resume; the LLM only phrases the top matches
+    career_matches = []
+    try:
+        parsed_skills = resume_data.get('skills') or resume_data.get('Skills') or []
+        parsed_skills = [s for s in parsed_skills if isinstance(s, str)]
+        career_matches = get_career_match_engine().top_matches(resume_text, parsed_skills, k=3)
+    except Exception as e:
+        print(f"Error matching career catalog: {e}")
+
     # Generate improved career recommendations
     career_paths = []
     
-    if ai_client:
-        try:
+    try:
+        if career_matches:
+            career_paths = get_career_recommendations(ai_client, resume_data, user_profile, matches=career_matches)
+        elif ai_client:
             # Get improved career recommendations
             career_paths = get_career_recommendations(ai_client, resume_data, user_profile)
-        except Exception as e:
-            print(f"Error getting career recommendations: {e}")
-            # Use fallback or empty list
-            career_paths = []
-    else:
-        print("AI client not available for career recommendations")
+        else:
+            print("AI client not available for career recommendations")
+    except Exception as e:
+        print(f"Error getting career recommendations: {e}")
+        # Use fallback or empty list
+        career_paths = []
 
     # Convert career_paths (list of dictionaries) to career_paths_list (list of lists) format
     # that's expected by the template
@@ -769,58 +812,16 @@ def start_guidance():
         # Create dummy career paths data structure if none exists
         dummy_career_paths = []
         # Create default empty variables for initialization
-        resume_text = ""
         analysis = {}
         skill_keywords = []
         
-        # Create a comprehensive list of common skills to detect in resumes
-        skill_keywords = [
-            "python", "java", "javascript", "html", "css", "react", "node.js", "angular", "vue",
-            "c++", "c#", "swift", "kotlin", "sql", "mysql", "postgresql", "mongodb", "nosql",
-            "aws", "azure", "gcp", "cloud", "docker", "kubernetes", "devops", "ci/cd", "git",
-            "machine learning", "artificial intelligence", "ai", "data science", "data analysis",
-            "excel", "word", "powerpoint", "tableau", "power bi", "data visualization",
-            "project management", "agile", "scrum", "leadership", "teamwork", "communication",
-            "problem solving", "critical thinking", "time management", "customer service",
-            "sales", "marketing", "seo", "sem", "digital marketing", "content writing",
-            "accounting", "finance", "budgeting", "financial analysis", "human resources", "hr",
-            "recruiting", "talent acquisition", "administrative", "office management",
-            "research", "analytics", "statistics", "r", "spss", "product management",
-            "ui/ux", "user experience", "user interface", "graphic design", "adobe",
-            "photoshop", "illustrator", "indesign", "figma", "sketch", "wireframing",
-            "networking", "security", "cybersecurity", "linux", "windows", "macos",
-            "mobile development", "ios", "android", "flutter", "react native",
-            "api", "rest", "graphql", "json", "xml", "testing", "qa", "quality assurance",
-            "jira", "confluence", "trello", "asana", "ms project", "microsoft office"
-        ]
-        
-        # Extract text from resume file if possible
-        if os.path.exists(resume_path_abs):
-            # Check if we can safely import PIL and use Tesseract
-            try:
-                # Check if Tesseract OCR is properly installed
-                if resume_path_abs.lower().endswith(('.png', '.jpg', '.jpeg')):
-                    from PIL import Image
-                    import pytesseract
-                    # Test Tesseract path - this will raise an exception if not configured
-                    if not os.path.exists(pytesseract.pytesseract.tesseract_cmd):
-                        print(f"Warning: Tesseract executable not found at {pytesseract.pytesseract.tesseract_cmd}")
-                        # Try to find tesseract in PATH
-                        pytesseract.pytesseract.tesseract_cmd = "tesseract"
-                        # Test a basic call
-                        pytesseract.get_tesseract_version()
-                    
-                    resume_text = functions.extract_text_from_image(resume_path_abs)
-                elif resume_path_abs.lower().endswith('.pdf'):
-                    resume_text = functions.extract_text_from_pdf(resume_path_abs)
-            except (ImportError, Exception) as e:
-                print(f"Warning: OCR dependencies issue - {str(e)}. Will proceed with empty text.")
-                resume_text = ""
+        # Comprehensive list of common skills to detect in resumes
+        skill_keywords = DEFAULT_SKILL_KEYWORDS
         
         # Initialize the functions module
         functions.initialize(resume_path_abs, resume_text, analysis, dummy_career_paths, skill_keywords, user_id)
         
-        # Analyze the resume to get the data needed for tips
+        # Analyze the resume to get the data needed for tips (shares the extracted text)
         functions.analyze_resume()
     except Exception as e:
         print(f"Error initializing functions module: {e}")
@@ -977,7 +978,6 @@ Make the recommendations specific and easy to follow.
 
         # 4. Call the LLM
         print("[DEBUG] Calling LLM for resume analysis and recommendations...")
-        model = ai_client.GenerativeModel('gemini-1.5-flash') # Or your preferred model
         safety_settings = [
             { "category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE" },
             { "category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE" },
@@ -985,7 +985,8 @@ Make the recommendations specific and easy to follow.
             { "category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE" }
         ]
         
-        response = model.generate_content(prompt, safety_settings=safety_settings)
+        response = get_llm_gateway(ai_client).generate(
+            prompt, call_site="app.resume_analysis_chat", safety_settings=safety_settings)
         analysis_text = response.text
         
         if not analysis_text.strip():
@@ -1118,9 +1119,22 @@ def start_interview():
             print(f"[DEBUG] Is message '4'? {is_end_command}") # Debug
             if is_end_command:
                 print(f"[DEBUG] Ending interview for user {user_id} via command.") # Debug
-                
+                # Let queued or streamed turns finish first, then end the stored copy
+                with turn_jobs.exclusive(str(user_id)):
+                    interview_instance = active_interviews.get(user_id)
+                    ended = interview_instance.end_interview() if interview_instance else None
+                    active_interviews.pop(user_id, None)
+
+            if is_end_command and ended is None:
+                # Another request ended the interview while this one waited
+                response_data = {
+                    "type": "menu",
+                    "options": get_menu_data(),
+                    "prompt": "Interview ended. Select an option:"
+                }
+            elif is_end_command:
                 # 1. Get closing statement and transcript from Interview object
-                closing_statement, transcript = interview_instance.end_interview()
+                closing_statement, transcript = ended
                 print(f"[DEBUG] Closing statement: {closing_statement[:100]}...") 
                 print(f"[DEBUG] Transcript length: {len(transcript)}")
 
@@ -1185,7 +1199,6 @@ Keep the feedback professional, encouraging, and helpful.
                 if ai_client:
                     try:
                         print("[DEBUG] Calling AI for feedback...")
-                        feedback_model = ai_client.GenerativeModel('gemini-1.5-flash')
                         # Add safety settings to potentially mitigate content filtering issues
                         safety_settings = [
                             { "category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE" },
@@ -1193,8 +1206,9 @@ Keep the feedback professional, encouraging, and helpful.
                             { "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE" },
                             { "category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE" }
                         ]
-                        feedback_response = feedback_model.generate_content(
+                        feedback_response = get_llm_gateway(ai_client).generate(
                             feedback_prompt,
+                            call_site="app.interview_feedback",
                             safety_settings=safety_settings
                         )
                         ai_feedback = feedback_response.text
@@ -1235,22 +1249,42 @@ Keep the feedback professional, encouraging, and helpful.
                     response_data = {
                         "type": "composite",
                         "content": ai_response,
+                        "audio_urls": _audio_urls(_prepare_speech(closing_statement)),
                         "menu": {
                             "options": get_menu_data(),
                             "prompt": "Interview ended. Select an option:"
                         }
                     }
-                    
-                    # Clean up active interview
-                    active_interviews.pop(user_id, None) 
                     print(f"[DEBUG] Final response_data created for interview end")
+            elif request.form.get('async') == '1':
+                # Run the turn on the job queue and let the page poll for the result
+                job_id = turn_jobs.submit(run_interview_turn, user_id, user_message,
+                                          key=str(user_id), owner=user_id)
+                print(f"[DEBUG] Queued interview turn job {job_id} for user {user_id}.") # Debug
+                session['chat_history'] = chat_history
+                return jsonify({"type": "job", "job_id": job_id,
+                                "status_url": url_for('interview_turn_status', job_id=job_id)}), 202
             else:
                 # Otherwise, process the answer normally
                 print(f"[DEBUG] Processing answer normally for user {user_id}.") # Debug
-                ai_response_text = interview_instance.process_answer(user_message)
+                # Wait for any queued or streamed turn of this interview to finish first
+                stale = False
+                with turn_jobs.exclusive(str(user_id)):
+                    interview_instance = active_interviews.get(user_id) or interview_instance
+                    ai_response_text = interview_instance.process_answer(user_message)
+                    if not interview_instance.interview_end_time:
+                        try:
+                            active_interviews.save(user_id, interview_instance)
+                        except StaleSessionError as e:
+                            print(f"[DEBUG] Not saving interview turn: {e}")
+                            stale = True
                 print(f"[DEBUG] Response from process_answer(): {ai_response_text[:100]}...") # Debug
+                if stale:
+                    # Another worker answered for this interview in the meantime
+                    response_data = {"type": "text",
+                                     "content": "This interview was updated elsewhere. Please send your answer again."}
                 # Check if process_answer itself ended the interview
-                if interview_instance.interview_end_time:
+                elif interview_instance.interview_end_time:
                     print(f"[DEBUG] Interview ended during process_answer for user {user_id}.") # Debug
                     active_interviews.pop(user_id, None)
                     # Combine text response with the menu options
@@ -1264,7 +1298,8 @@ Keep the feedback professional, encouraging, and helpful.
                     }
                 else:
                     # Just a text response
-                    response_data = {"type": "text", "content": ai_response_text}
+                    response_data = {"type": "text", "content": ai_response_text,
+                                     "audio_urls": _audio_urls(_prepare_speech(ai_response_text))}
         
         else:
             print(f"[DEBUG] User {user_id} NOT found in active_interviews. Treating as menu command.") # Debug
@@ -1306,8 +1341,10 @@ Keep the feedback professional, encouraging, and helpful.
                              active_interviews[user_id] = interview_instance
                              # Call start_interview and store the response
                              ai_response_text = interview_instance.start_interview() 
+                             active_interviews.save(user_id, interview_instance)
                              print(f"[DEBUG] Interview started for user {user_id}. First question: {ai_response_text[:100]}...") # Log the actual question
-                             response_data = {"type": "text", "content": ai_response_text}
+                             response_data = {"type": "text", "content": ai_response_text,
+                                              "audio_urls": _audio_urls(_prepare_speech(ai_response_text))}
                          else:
                              print("[DEBUG] Error occurred during resume processing or file handling, skipping Interview creation.")
                              # Minor improvement: Use specific error message if available
@@ -1379,6 +1416,177 @@ Keep the feedback professional, encouraging, and helpful.
     return jsonify(response_data)
 
 
+def _sse_event(event, data):
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route('/start-interview/stream', methods=['POST'])
+def stream_interview_turn():
+    """
+    Stream the interviewer's reply to an answer as server-sent events
+    ("delta" events with text chunks, then "done" with the full reply). If
+    the turn cannot be saved because another worker moved the interview on
+    meanwhile, "stale" replaces "done" and the page discards the reply.
+
+    Only answers within an active interview are streamed. Anything else (menu
+    commands, starting or ending the interview) gets a 409 telling the page
+    to use the regular /start-interview POST.
+    """
+    if 'user_id' not in session:
+        return jsonify({'stream': False, 'error': 'User not logged in'}), 401
+
+    user_id = session['user_id']
+    user_message = request.form.get('message', '')
+    interview_instance = active_interviews.get(user_id)
+    if not interview_instance or user_message.strip() == '4':
+        return jsonify({'stream': False}), 409
+
+    chat_history = session.get('chat_history', [])
+    chat_history.append(("User", user_message))
+    session['chat_history'] = chat_history
+
+    def generate():
+        reply = ""
+        try:
+            # One turn per interview at a time, shared with queued and synchronous turns
+            with turn_jobs.exclusive(str(user_id)):
+                current = active_interviews.get(user_id) or interview_instance
+                for chunk in current.process_answer_stream(user_message):
+                    reply += chunk
+                    yield _sse_event('delta', {'text': chunk})
+                active_interviews.save(user_id, current)
+            # Differs from the streamed text if the stream broke off and the reply was regenerated
+            reply = current.last_reply
+            yield _sse_event('done', {'type': 'text', 'content': reply,
+                                      'audio_urls': _audio_urls(_prepare_speech(reply))})
+        except StaleSessionError as e:
+            print(f"[DEBUG] Not saving streamed interview turn: {e}")
+            yield _sse_event('stale', {'error': "This interview was updated elsewhere. "
+                                                "Please send your answer again."})
+        except Exception as e:
+            print(f"[DEBUG] Error streaming interview turn: {e}")
+            yield _sse_event('error', {'error': str(e)})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def run_interview_turn(user_id, user_message):
+    """Process one interview answer on the turn job queue; returns the chat response data."""
+    # Load the interview when the job runs: turns queued before it have changed the stored copy
+    interview_instance = active_interviews.get(user_id)
+    if interview_instance is None:
+        return {
+            "type": "menu",
+            "options": get_menu_data(),
+            "prompt": "Interview ended. Select an option:"
+        }
+    ai_response_text = interview_instance.process_answer(user_message, background_io=True)
+    try:
+        active_interviews.save(user_id, interview_instance)
+    except StaleSessionError as e:
+        print(f"[DEBUG] Not saving queued interview turn: {e}")
+        return {"type": "text", "content": "This interview was updated elsewhere. Please send your answer again."}
+    # Audio keys become URLs when the result is collected (url_for needs a request)
+    audio_keys = _prepare_speech(ai_response_text)
+    if interview_instance.interview_end_time:
+        return {
+            "type": "composite",
+            "content": ai_response_text,
+            "audio_keys": audio_keys,
+            "menu": {
+                "options": get_menu_data(),
+                "prompt": "Interview ended. Select an option:"
+            }
+        }
+    return {"type": "text", "content": ai_response_text, "audio_keys": audio_keys}
+
+
+@app.route('/start-interview/jobs/<job_id>', methods=['GET'])
+def interview_turn_status(job_id):
+    """Poll a queued interview turn. Returns the response data once the job is done."""
+    if 'user_id' not in session:
+        return jsonify({'status': 'error', 'error': 'User not logged in'}), 401
+
+    job = turn_jobs.get(job_id)
+    if not job or job['owner'] != session['user_id']:
+        return jsonify({'status': 'error', 'error': 'Unknown job'}), 404
+
+    if job['status'] == 'done':
+        if job['result'].get('type') == 'composite':
+            active_interviews.pop(session['user_id'], None)
+        result = dict(job['result'])
+        result['audio_urls'] = _audio_urls(result.pop('audio_keys', []))
+        return jsonify({'status': 'done', 'response': result})
+    if job['status'] == 'error':
+        return jsonify({'status': 'error', 'error': job['error']})
+    return jsonify({'status': job['status']})
+
+
+@app.route('/start-interview/prefetch', methods=['POST'])
+def prefetch_interview_question():
+    """
+    Called when the candidate starts recording an answer, so likely follow-up
+    questions can be prepared while they speak (only when INTERVIEW_SPECULATIVE=1).
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'User not logged in'})
+
+    interview_instance = active_interviews.get(session['user_id'])
+    if not interview_instance:
+        return jsonify({'success': True, 'prefetching': False})
+
+    try:
+        prefetching = interview_instance.prefetch_next_question()
+    except Exception as e:
+        print(f"[DEBUG] Error starting speculative prefetch: {e}")
+        prefetching = False
+    return jsonify({'success': True, 'prefetching': prefetching})
+
+
+# Audio keys are SHA-256 hex digests (see interview_advisor.audio_cache)
+AUDIO_KEY_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+
+def _prepare_speech(text):
+    """Start synthesizing an interviewer message for the browser; returns its audio keys in play order."""
+    if not tts_service or tts_service.server_playback or not text:
+        return []
+    try:
+        return tts_service.prepare_speech(text)
+    except Exception as e:
+        print(f"[DEBUG] Error preparing speech: {e}")
+        return []
+
+
+def _audio_urls(audio_keys):
+    return [url_for('interview_audio', key=key) for key in audio_keys]
+
+
+@app.route('/interview/audio/<key>.mp3', methods=['GET'])
+def interview_audio(key):
+    """
+    Serve synthesized interview audio by content key. The content never
+    changes for a key, so it is cacheable indefinitely; Range requests and
+    conditional requests are handled by send_file.
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'User not logged in'}), 401
+    if not tts_service or not AUDIO_KEY_PATTERN.fullmatch(key):
+        return jsonify({'success': False, 'error': 'Unknown audio'}), 404
+
+    audio_file = tts_service.audio_file_for_key(key)
+    if not audio_file:
+        return jsonify({'success': False, 'error': 'Unknown audio'}), 404
+
+    response = send_file(os.path.abspath(audio_file), mimetype='audio/mpeg',
+                         conditional=True, etag=key, max_age=365 * 24 * 3600)
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    return response
+
+
 @app.route('/clear-chat-history', methods=['GET', 'POST'])
 def clear_chat_history():
     if 'user_id' not in session:
@@ -1524,6 +1732,29 @@ def emotion_stats():
     })
 
 
+@app.route('/llm_metrics', methods=['GET'])
+def llm_metrics():
+    """
+    Latency, cache and token counters for each LLM call site, plus the reply
+    latency per turn mode (single-call, two-phase, speculative, stream) of
+    the caller's active interview.
+
+    Only for the accounts in METRICS_ADMIN_EMAILS, or anyone while the app
+    runs in debug mode.
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'User not logged in'})
+    if not app.debug:
+        user = User.query.get(session['user_id'])
+        if not user or user.email.lower() not in app.config['METRICS_ADMIN_EMAILS']:
+            return jsonify({'success': False, 'error': 'Not allowed'}), 403
+
+    interview_instance = active_interviews.get(session['user_id'])
+    return jsonify({'success': True, 'metrics': get_llm_metrics(),
+                    'turn_latency': interview_instance.get_turn_latency_summary() if interview_instance else None,
+                    'tts': tts_service.health() if tts_service else None})
+
+
 # Initialize the metrics tracker
 metrics_tracker = None
 # Route to start video analysis
@@ -1821,8 +2052,35 @@ def view_eye_metrics():
 # New route to process audio recordings
 
 
+def _analyze_answer_audio(pcm, transcript):
+    """
+    Fluency metrics for a transcribed answer's PCM. While the user has an
+    active interview they are also saved under its session id, as the CLI does.
+    """
+    try:
+        audio_metrics = analyze_pcm(pcm_to_samples(pcm), PCM_SAMPLE_RATE, transcript)
+    except Exception as e:
+        print(f"Warning: Could not analyze speech fluency: {e}")
+        return None
+
+    interview_instance = active_interviews.get(session['user_id']) if 'user_id' in session else None
+    if interview_instance is not None:
+        db_manager = DatabaseManager()
+        try:
+            db_manager.save_audio_metrics(interview_instance.session_id, audio_metrics)
+        finally:
+            db_manager.close()
+    return audio_metrics
+
+
 @app.route('/process_audio_recording', methods=['POST'])
 def process_audio_recording():
+    """
+    Transcribe a recorded answer. The upload is decoded by ffmpeg through
+    pipes into 16 kHz mono PCM and handed to the recognizer in memory; the
+    same PCM is analyzed for fluency. The response includes the time spent
+    in each stage.
+    """
     print("=== Processing audio recording ===")
     # Temporarily disabled user check for testing
     # if 'user_id' not in session:
@@ -1833,125 +2091,130 @@ def process_audio_recording():
         print("Error: No audio file provided")
         return jsonify({'success': False, 'error': 'No audio file provided'})
 
-    original_audio_path = None
-    converted_audio_path = None
-    output_text_file = None
-
+    timer = StageTimer()
     try:
         # Get the audio file from the request
         audio_file = request.files['audio']
-        print(f"Received audio file: {audio_file.filename}, type: {audio_file.mimetype}, size: {audio_file.content_length} bytes")
-
-        # Save the original audio file temporarily (likely WebM or similar)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        temp_dir = 'temp_audio'
-        os.makedirs(temp_dir, exist_ok=True)
-        # Use a generic extension first, or determine from mimetype if possible
-        original_filename = f"recording_original_{timestamp}.audio"
-        original_audio_path = os.path.join(temp_dir, original_filename)
-        print(f"Saving original audio to: {os.path.abspath(original_audio_path)}")
-        audio_file.save(original_audio_path)
-        print(f"Original audio file saved successfully")
-
-        # Convert the saved audio to standard PCM WAV using pydub
-        try:
-            print("Attempting audio conversion to WAV...")
-            # Load the audio file (pydub will try to auto-detect format)
-            audio_segment = AudioSegment.from_file(original_audio_path)
-            # Define the path for the converted WAV file
-            converted_filename = f"recording_converted_{timestamp}.wav"
-            converted_audio_path = os.path.join(temp_dir, converted_filename)
-            print(f"Exporting converted WAV to: {os.path.abspath(converted_audio_path)}")
-            # Export as WAV (16-bit PCM is standard for speech recognition)
-            audio_segment.export(converted_audio_path, format="wav")
-            print("Audio conversion successful!")
-        except Exception as convert_e:
-            print(f"Error converting audio with pydub: {convert_e}")
-            print("Ensure FFmpeg is installed and in your system's PATH.")
-            # Fallback: Try using the original file anyway? Or fail here?
-            # For now, let's fail if conversion doesn't work.
-            return jsonify({'success': False, 'error': f'Audio conversion failed: {convert_e}. Is FFmpeg installed?'})
-
-        # Transcribe the *converted* WAV audio file
+        with timer.stage('read'):
+            audio_bytes = audio_file.read()
+        print(f"Received audio file: {audio_file.filename}, type: {audio_file.mimetype}, size: {len(audio_bytes)} bytes")
+
+        # Decode (WebM/Opus or similar) to the recognizer's PCM format
         try:
-            from audio_to_text import transcribe_audio_file
-            text_filename = f"transcript_{timestamp}.txt"
-            text_path = os.path.join(temp_dir, text_filename)
-            print(f"Transcribing converted WAV: {converted_audio_path}")
-            output_text_file = transcribe_audio_file(converted_audio_path, text_path)
-
-            if output_text_file and os.path.exists(output_text_file):
-                with open(output_text_file, 'r', encoding='utf-8') as file:
-                    transcribed_text = file.read().strip()
-                print(f"Transcription successful: '{transcribed_text}'")
-                return jsonify({'success': True, 'transcribed_text': transcribed_text})
-            else:
-                print("Transcription failed after conversion.")
-                # Use the error message from transcribe_audio_file if possible, 
-                # otherwise provide a generic message.
-                # This requires transcribe_audio_file to potentially return the error.
-                # For now:
-                return jsonify({'success': False, 'error': "Transcription failed after audio conversion."})
+            with timer.stage('decode'):
+                pcm = decode_to_pcm(audio_bytes)
+        except AudioDecodeError as convert_e:
+            print(f"Error decoding audio with ffmpeg: {convert_e}")
+            return jsonify({'success': False, 'error': f'Audio conversion failed: {convert_e}',
+                            'timings': timer.as_dict()})
 
+        try:
+            from audio_to_text import transcribe_pcm
+            with timer.stage('transcribe'):
+                transcribed_text, error_message = transcribe_pcm(pcm, PCM_SAMPLE_RATE)
         except Exception as trans_e:
             print(f"Error during transcription call: {trans_e}")
             import traceback
             traceback.print_exc()
             return jsonify({'success': False, 'error': f'Error calling transcription: {str(trans_e)}'})
 
+        audio_metrics = None
+        if transcribed_text:
+            transcribed_text = transcribed_text.strip()
+            with timer.stage('fluency'):
+                audio_metrics = _analyze_answer_audio(pcm, transcribed_text)
+
+        timings = timer.as_dict()
+        timings['audio_seconds'] = round(pcm_duration(pcm), 3)
+        print(f"[AudioPipeline] {pcm_duration(pcm):.1f}s of audio: {timer.summary()}")
+
+        if transcribed_text:
+            print(f"Transcription successful: '{transcribed_text}'")
+            return jsonify({'success': True, 'transcribed_text': transcribed_text, 'timings': timings,
+                            'audio_metrics': audio_metrics})
+
+        print("Transcription failed after conversion.")
+        return jsonify({'success': False, 'timings': timings,
+                        'error': error_message or "Transcription failed after audio conversion."})
+
     except Exception as e:
         import traceback
         print(f"Server error in /process_audio_recording: {str(e)}")
         traceback.print_exc()
         return jsonify({'success': False, 'error': f'Server error: {str(e)}'})
-    
-    finally:
-        # Cleanup temporary files
-        print("Cleaning up temporary audio files...")
-        if original_audio_path and os.path.exists(original_audio_path):
-            try:
-                os.remove(original_audio_path)
-                print(f"Removed: {original_audio_path}")
-            except Exception as e:
-                print(f"Error removing original file {original_audio_path}: {e}")
-        if converted_audio_path and os.path.exists(converted_audio_path):
-            try:
-                os.remove(converted_audio_path)
-                print(f"Removed: {converted_audio_path}")
-            except Exception as e:
-                print(f"Error removing converted file {converted_audio_path}: {e}")
-        if output_text_file and os.path.exists(output_text_file):
-            try:
-                os.remove(output_text_file)
-                print(f"Removed: {output_text_file}")
-            except Exception as e:
-                print(f"Error removing transcript file {output_text_file}: {e}")
-
-# Helper function to run run_interview_advisor.py as a subprocess
 
-
-def run_interview_advisor_process(text_input):
+@app.route('/process_audio_recording/stream', methods=['POST'])
+def start_audio_stream():
     """
-    Run run_interview_advisor.py as a subprocess and pass the text input to it.
-    Returns the response from the advisor.
+    Start transcribing an answer while it is recorded. The page then posts
+    each MediaRecorder timeslice to /process_audio_recording/stream/<id>
+    and gets the partial transcript back, and calls .../finish when the
+    recording stops. Streams belong to the logged-in user and live in this
+    worker, so multi-worker deployments need sticky sessions.
     """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'User not logged in'}), 401
+
     try:
-        # Construct the command
-        cmd = [sys.executable, 'run_interview_advisor.py', '--input', text_input]
-
-        # Run the process
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, check=True)
-
-        # Return the stdout output
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"Error running run_interview_advisor.py: {e}")
-        print(f"Error output: {e.stderr}")
-        return None
+        stream = open_stream(new_session_id("speech"), session['user_id'])
+    except StreamLimitError as e:
+        print(f"Refusing audio stream: {e}")
+        return jsonify({'success': False, 'error': 'Too many recordings in progress'}), 429
+    except AudioDecodeError as e:
+        print(f"Error starting audio stream: {e}")
+        return jsonify({'success': False, 'error': f'Audio conversion failed: {e}'})
+    return jsonify({'success': True, 'stream_id': stream.stream_id})
+
+
+@app.route('/process_audio_recording/stream/<stream_id>', methods=['POST'])
+def add_audio_stream_chunk(stream_id):
+    """Feed one timeslice (raw request body, sequence number in X-Chunk-Seq)."""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'User not logged in'}), 401
+
+    stream = get_stream(stream_id, session['user_id'])
+    if stream is None:
+        return jsonify({'success': False, 'error': 'Unknown audio stream'}), 404
+
+    seq = request.headers.get('X-Chunk-Seq', type=int)
+    try:
+        partial = stream.add_chunk(request.get_data(), seq)
+    except AudioDecodeError as e:
+        print(f"Error decoding audio stream {stream_id}: {e}")
+        close_stream(stream_id, session['user_id'])
+        stream.abort()
+        return jsonify({'success': False, 'error': f'Audio conversion failed: {e}'})
+    return jsonify({'success': True, 'partial_transcript': partial})
+
+
+@app.route('/process_audio_recording/stream/<stream_id>/finish', methods=['POST'])
+def finish_audio_stream(stream_id):
+    """End the recording and return the full transcript and its fluency metrics."""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'User not logged in'}), 401
+
+    stream = close_stream(stream_id, session['user_id'])
+    if stream is None:
+        return jsonify({'success': False, 'error': 'Unknown audio stream'}), 404
+
+    try:
+        transcribed_text, timings = stream.finish()
     except Exception as e:
-        print(f"Unexpected error running run_interview_advisor.py: {e}")
-        return None
+        print(f"Error during streaming transcription: {e}")
+        return jsonify({'success': False, 'error': f'Error calling transcription: {str(e)}'})
+
+    if not transcribed_text:
+        print(f"[AudioPipeline] Streamed transcription timings: {timings}")
+        return jsonify({'success': False, 'error': 'Could not understand the audio.', 'timings': timings})
+
+    transcribed_text = transcribed_text.strip()
+    # The decoder keeps all the PCM of the recording after it is closed
+    audio_metrics = _analyze_answer_audio(stream.decoder.pcm(), transcribed_text)
+    if audio_metrics:
+        timings['fluency'] = audio_metrics['analysis_seconds']
+    print(f"[AudioPipeline] Streamed transcription timings: {timings}")
+    return jsonify({'success': True, 'transcribed_text': transcribed_text, 'timings': timings,
+                    'audio_metrics': audio_metrics})
 
 # Register custom Jinja filters
 @app.template_filter('escapejs')
@@ -1968,4 +2231,8 @@ def escapejs_filter(val):
     return val
 
 if __name__ == '__main__':
+    # Expire old interview session directories in the background. This is the
+    # only process; under a multi-worker server run `python -m interview_advisor.sessions`
+    # from cron instead, so the shared tree is swept once rather than by every worker
+    SessionJanitor().start()
     app.run(debug=False)
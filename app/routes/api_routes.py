@@ -6,6 +6,7 @@ import os
 import time
 import json
 from flask import Blueprint, request, jsonify
+from interview_advisor.sessions import new_session_id
 
 # Create blueprint
 api_bp = Blueprint('api', __name__)
@@ -31,7 +32,7 @@ def create_session():
         print(f"Using resume_id: {resume_id}")
 
         # Create unique session ID
-        session_id = f"session_{int(time.time())}"
+        session_id = new_session_id("session")
         print(f"Generated session_id: {session_id}")
 
         # Store session in memory
@@ -10,13 +10,14 @@ from typing import Dict, List, Any, Optional
 
 # Import TTS service
 from app.services.tts_service import TTSService
+from interview_advisor.sessions import new_session_id, session_path
 
 
 class InterviewService:
     def __init__(self, resume_id=None):
         """Initialize the interview service"""
         self.resume_id = resume_id
-        self.session_id = f"interview_{int(time.time())}"
+        self.session_id = new_session_id("interview")
         self.conversation_history = []
         self.current_question_index = 0
         self.interview_start_time = None
@@ -43,7 +44,7 @@ class InterviewService:
             self.tts_service = None
 
         # Create session directory
-        self.session_dir = f"cache/interviews/{self.session_id}"
+        self.session_dir = session_path(self.session_id)
         os.makedirs(self.session_dir, exist_ok=True)
 
     def start_interview(self) -> str:
@@ -0,0 +1,108 @@
+"""
+In-memory audio pipeline
+
+Whole recordings are decoded with interview_advisor.audio_signal.decode_to_pcm
+straight into 16 kHz mono 16-bit PCM, the format speech recognizers want.
+
+StreamingDecoder keeps one ffmpeg process open for a recording that
+arrives in pieces (MediaRecorder timeslices, which are not decodable on
+their own): pieces are written to its stdin as they arrive and the PCM
+decoded so far can be read at any time.
+
+StageTimer records how long each step of a request takes.
+"""
+
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from interview_advisor.audio_signal import (FFMPEG_BINARY, FFMPEG_TIMEOUT, PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH,
+                                            AudioDecodeError)
+
+
+class StreamingDecoder:
+    """Incremental ffmpeg decode of one recording to mono 16-bit PCM."""
+
+    def __init__(self, sample_rate: int = PCM_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._pcm = bytearray()
+        self._lock = threading.Lock()
+        command = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+                   "-i", "pipe:0", "-vn", "-ac", "1", "-ar", str(sample_rate),
+                   "-f", "s16le", "-acodec", "pcm_s16le", "-flush_packets", "1", "pipe:1"]
+        try:
+            self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL)
+        except FileNotFoundError:
+            raise AudioDecodeError(f"{FFMPEG_BINARY} not found. Is FFmpeg installed?")
+        self._reader = threading.Thread(target=self._read, name="audio-decoder", daemon=True)
+        self._reader.start()
+
+    def _read(self) -> None:
+        while True:
+            data = self._process.stdout.read1(65536)
+            if not data:
+                return
+            with self._lock:
+                self._pcm.extend(data)
+
+    def feed(self, data: bytes) -> None:
+        """Write the next piece of the encoded stream."""
+        try:
+            self._process.stdin.write(data)
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise AudioDecodeError("Audio decoder exited")
+
+    def pcm(self) -> bytes:
+        """PCM decoded so far (whole samples only)."""
+        with self._lock:
+            return bytes(self._pcm[:len(self._pcm) - len(self._pcm) % PCM_SAMPLE_WIDTH])
+
+    def close(self, timeout: float = FFMPEG_TIMEOUT) -> bytes:
+        """End the stream, wait for ffmpeg to decode the rest and return all PCM."""
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        self._reader.join(timeout)
+        try:
+            self._process.wait(timeout=max(1.0, timeout))
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+        return self.pcm()
+
+    def abort(self) -> None:
+        self._process.kill()
+
+
+def pcm_duration(pcm: bytes, sample_rate: int = PCM_SAMPLE_RATE) -> float:
+    """Length in seconds of mono 16-bit PCM."""
+    return len(pcm) / (sample_rate * PCM_SAMPLE_WIDTH)
+
+
+class StageTimer:
+    """Wall-clock duration of each named stage of a pipeline run."""
+
+    def __init__(self):
+        self._stages: List[Tuple[str, float]] = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages.append((name, time.perf_counter() - start))
+
+    def as_dict(self) -> Dict[str, float]:
+        """Seconds per stage, plus the total since the timer was created."""
+        timings = {name: round(seconds, 4) for name, seconds in self._stages}
+        timings["total"] = round(time.perf_counter() - self._start, 4)
+        return timings
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.as_dict().items())
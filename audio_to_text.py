@@ -7,6 +7,8 @@ import argparse
 import threading
 from datetime import datetime
 
+from speech_recognizers import SAMPLE_RATE, RecognitionError, get_transcriber
+
 
 def list_devices():
     """List all available audio input devices and exit."""
@@ -138,6 +140,36 @@ def record_audio_to_file(output_audio_file=None, max_duration=60, device_index=3
         return None
 
 
+def transcribe_pcm(pcm, sample_rate=16000):
+    """
+    Transcribe raw mono 16-bit PCM held in memory (e.g. from audio_pipeline.decode_to_pcm)
+    with the configured recognizer (see speech_recognizers).
+
+    Returns:
+        (text, None) on success, (None, error message) on failure
+    """
+    if not pcm:
+        return None, "No audio data"
+    try:
+        transcriber = get_transcriber()
+        print(f"Transcribing with the {transcriber.backend.name} recognizer...")
+        text = transcriber.transcribe(pcm, sample_rate)
+    except RecognitionError as e:
+        print(e)
+        return None, str(e)
+    except Exception as e:
+        error_message = f"Unexpected error during transcription: {e}"
+        print(error_message)
+        import traceback
+        traceback.print_exc()
+        return None, error_message
+    if not text:
+        error_message = "Could not understand the audio."
+        print(error_message)
+        return None, error_message
+    return text, None
+
+
 def transcribe_audio_file(audio_file, output_text_file=None):
     """
     Transcribe an audio file to text.
@@ -179,43 +211,9 @@ def transcribe_audio_file(audio_file, output_text_file=None):
             audio_data = r.record(source)
             print("Audio data read successfully.")
 
-            # --- Attempt Google Web Speech API --- 
-            try:
-                print("Attempting transcription via Google Web Speech API...")
-                text = r.recognize_google(audio_data, language="en-US")
-                print("Google API transcription successful!")
-                transcribed_text = text
-            except sr.UnknownValueError:
-                error_message = "Google Web Speech API could not understand the audio."
-                print(error_message)
-            except sr.RequestError as e:
-                error_message = f"Could not request results from Google Web Speech API; {e}"
-                print(error_message)
-            except Exception as e:
-                error_message = f"Unexpected error during Google API transcription: {e}"
-                print(error_message)
-                import traceback
-                traceback.print_exc()
-            
-            # --- Potential Fallback (Example: Sphinx - requires pocketsphinx package) ---
-            # if not transcribed_text:
-            #     try:
-            #         print("Attempting transcription via CMU Sphinx (Offline)...")
-            #         # Requires `pip install pocketsphinx`
-            #         text = r.recognize_sphinx(audio_data, language="en-US")
-            #         print("Sphinx transcription successful!")
-            #         transcribed_text = text
-            #     except sr.UnknownValueError:
-            #         error_message = "CMU Sphinx could not understand the audio."
-            #         print(error_message)
-            #     except sr.RequestError as e: # Should not happen for offline
-            #         error_message = f"Error with CMU Sphinx; {e}"
-            #         print(error_message)
-            #     except Exception as e:
-            #         error_message = f"Unexpected error during Sphinx transcription: {e}"
-            #         print(error_message)
-            #         import traceback
-            #         traceback.print_exc()
+        # Resampled to the recognizer's format and transcribed in parallel chunks
+        pcm = audio_data.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+        transcribed_text, error_message = transcribe_pcm(pcm, SAMPLE_RATE)
 
     except ValueError as ve:
          error_message = f"Audio file format error: {ve}. Ensure it is a compatible WAV/AIFF/FLAC."
@@ -0,0 +1,133 @@
+"""
+Career path skill index
+
+Precomputes an inverted index from normalized skill names and skill tokens to
+the career paths that need them, so scoring a resume against the catalog is a
+sparse dot product over the user's skills instead of a scan of every path.
+"""
+
+import heapq
+import random
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Same weights as the original scoring loop: an exact skill match scores 10
+# plus the 5 it also earns as a partial match; a partial match scores 5
+EXACT_MATCH_WEIGHT = 15
+PARTIAL_MATCH_WEIGHT = 5
+
+# Tokens too generic to count as a partial skill match on their own
+STOPWORDS = {"and", "of", "the", "in", "for", "with", "to", "a", "an", "skills", "basics"}
+
+_TOKEN_RE = re.compile(r"[^\W_]+(?:[+#]+)?")
+
+
+def normalize_skill(skill: str) -> str:
+    """Lower-case a skill name and collapse internal whitespace."""
+    return " ".join(skill.lower().split())
+
+
+def skill_tokens(skill: str) -> List[str]:
+    """Split a skill name into the tokens used for partial matching."""
+    return [token for token in _TOKEN_RE.findall(skill.lower()) if token not in STOPWORDS]
+
+
+class CareerPathIndex:
+    """Inverted index over the "skills_needed" of a list of career paths."""
+
+    def __init__(self, career_paths: List[Dict]):
+        self.career_paths = career_paths
+        # normalized skill -> [(path index, needed skill index)]
+        self._exact: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        # skill token -> [(path index, needed skill index)]
+        self._tokens: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._tie_breaks: Dict[Optional[int], List[float]] = {}
+        # Memoized per-skill score vectors; user skills come from a small vocabulary
+        self._skill_vectors: Dict[str, Dict[int, int]] = {}
+
+        for path_idx, path in enumerate(career_paths):
+            for skill_idx, needed_skill in enumerate(path.get("skills_needed", [])):
+                self._exact[normalize_skill(needed_skill)].append((path_idx, skill_idx))
+                for token in set(skill_tokens(needed_skill)):
+                    self._tokens[token].append((path_idx, skill_idx))
+
+    def score(self, skills: List[str]) -> Dict[int, int]:
+        """
+        Score every career path that shares at least one skill with the user.
+
+        Each (user skill, needed skill) pair contributes once: the exact weight
+        when the normalized names are equal, otherwise the partial weight when
+        they share a token.
+
+        Returns:
+            Dict of path index -> score (paths with no overlap are omitted)
+        """
+        scores: Dict[int, int] = defaultdict(int)
+        for skill in dict.fromkeys(normalize_skill(s) for s in skills):
+            for path_idx, weight in self._skill_vector(skill).items():
+                scores[path_idx] += weight
+        return scores
+
+    def _skill_vector(self, skill: str) -> Dict[int, int]:
+        """Sparse path-index -> weight vector for one normalized user skill."""
+        vector = self._skill_vectors.get(skill)
+        if vector is not None:
+            return vector
+
+        exact_pairs = set(self._exact.get(skill, ()))
+        partial_pairs = set()
+        for token in skill_tokens(skill):
+            partial_pairs.update(self._tokens.get(token, ()))
+        partial_pairs -= exact_pairs
+
+        vector = defaultdict(int)
+        for path_idx, _ in exact_pairs:
+            vector[path_idx] += EXACT_MATCH_WEIGHT
+        for path_idx, _ in partial_pairs:
+            vector[path_idx] += PARTIAL_MATCH_WEIGHT
+
+        self._skill_vectors[skill] = dict(vector)
+        return self._skill_vectors[skill]
+
+    def top_matches(self, skills: List[str], limit: int = 3,
+                    tie_break_seed: Optional[int] = None) -> List[Tuple[Dict, int]]:
+        """
+        Return the best (career path, score) pairs, highest score first.
+
+        Ties are broken by catalog order, or by a reproducible shuffle when
+        tie_break_seed is given.
+        """
+        scores = self.score(skills)
+        tie_break = self._tie_break(tie_break_seed)
+
+        # Find the cut-off score on the bare values first, then only order the
+        # few paths at or above it
+        best = []
+        if scores and limit > 0:
+            cutoff = heapq.nlargest(limit, scores.values())[-1]
+            contenders = [idx for idx, score in scores.items() if score >= cutoff]
+            contenders.sort(key=lambda idx: (scores[idx], tie_break[idx]), reverse=True)
+            best = contenders[:limit]
+
+        # Paths with no overlap still fill the list when few paths match
+        if len(best) < limit:
+            chosen = set(best)
+            for idx in sorted(range(len(self.career_paths)), key=lambda i: tie_break[i], reverse=True):
+                if idx not in chosen:
+                    best.append(idx)
+                    if len(best) == limit:
+                        break
+
+        return [(self.career_paths[idx], scores.get(idx, 0)) for idx in best]
+
+    def _tie_break(self, seed: Optional[int]) -> List[float]:
+        """Per-path tie-break keys (higher wins), computed once per seed."""
+        if seed not in self._tie_breaks:
+            if seed is None:
+                keys = [-idx for idx in range(len(self.career_paths))]
+            else:
+                rng = random.Random(seed)
+                keys = [rng.random() for _ in self.career_paths]
+            self._tie_breaks[seed] = keys
+        return self._tie_breaks[seed]
@@ -0,0 +1,337 @@
+"""
+Career match engine
+
+Matches a resume against a large catalog of career roles with NumPy. The
+catalog is compiled once from data/career_catalog.json into a sparse
+skill -> role matrix (CSR arrays stored as .npy files) plus IDF weights, and
+loaded memory-mapped so many worker processes share one copy of it. A resume
+becomes a TF-IDF-weighted skill profile; scoring is a single weighted
+bincount over the postings of the user's skills, and the top roles are picked
+with argpartition instead of sorting the whole catalog.
+
+Each build is written to its own directory and published by atomically
+replacing manifest.json, which names the current build. Workers only load
+the build the manifest points to, so they never see a half-written or mixed
+set of arrays, even while another worker is rebuilding the catalog.
+
+Run this module directly to (re)compile the catalog and time a query.
+"""
+
+import os
+import json
+import math
+import time
+import shutil
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from skill_matcher import SkillMatcher
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Human-editable catalog source and the directory its compiled arrays go to
+CATALOG_SOURCE = os.path.join(BASE_DIR, "data", "career_catalog.json")
+CATALOG_CACHE_DIR = os.path.join(BASE_DIR, "cache", "career_catalog")
+
+# Reported match percentages are kept within the same band as the rest of the app
+MIN_MATCH_PERCENT = 60
+MAX_MATCH_PERCENT = 95
+
+_ARRAYS = ("indptr", "indices", "data", "idf")
+_MANIFEST = "manifest.json"
+# Superseded builds are removed once they are this old (workers may still be loading them)
+_OLD_BUILD_SECONDS = 600
+
+
+def normalize_skill(skill: str) -> str:
+    """Lower-case a skill name and collapse internal whitespace."""
+    return " ".join(str(skill).lower().split())
+
+
+def build_catalog(source_path: str = CATALOG_SOURCE, out_dir: str = CATALOG_CACHE_DIR) -> str:
+    """
+    Compile a JSON list of roles into the engine's on-disk format.
+
+    Each role needs a "role" title and a "skills_needed" list (a comma
+    separated string is accepted too); every other field is kept as metadata
+    and returned with matches. The skill -> role matrix is stored row-per-skill
+    (indptr/indices/data), so scoring only touches the postings of the skills
+    a resume actually has. Role columns are IDF-weighted and L2-normalized.
+
+    Returns:
+        The output directory
+    """
+    with open(source_path, "r", encoding="utf-8") as f:
+        roles = json.load(f)
+
+    vocab: Dict[str, int] = {}
+    role_skills: List[List[int]] = []
+    for role in roles:
+        needed = role.get("skills_needed", [])
+        if isinstance(needed, str):
+            needed = needed.split(",")
+        skill_ids = []
+        for skill in needed:
+            skill = normalize_skill(skill)
+            if skill:
+                skill_ids.append(vocab.setdefault(skill, len(vocab)))
+        role_skills.append(sorted(set(skill_ids)))
+
+    n_roles = len(roles)
+    n_skills = len(vocab)
+
+    # Document frequency and smoothed IDF per skill
+    df = np.zeros(n_skills, dtype=np.float64)
+    for skill_ids in role_skills:
+        df[skill_ids] += 1
+    idf = (np.log((1 + n_roles) / (1 + df)) + 1).astype(np.float32)
+
+    # Per-role L2 norm of the IDF-weighted skill vector
+    norms = np.array([math.sqrt(float(np.sum(idf[ids] ** 2))) or 1.0 for ids in role_skills],
+                     dtype=np.float32)
+
+    # Invert role -> skills into skill -> roles postings
+    postings: List[List[int]] = [[] for _ in range(n_skills)]
+    for role_id, skill_ids in enumerate(role_skills):
+        for skill_id in skill_ids:
+            postings[skill_id].append(role_id)
+
+    indptr = np.zeros(n_skills + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(p) for p in postings])
+    indices = np.fromiter((r for p in postings for r in p), dtype=np.int32, count=int(indptr[-1]))
+    skill_of_entry = np.repeat(np.arange(n_skills), np.diff(indptr))
+    data = (idf[skill_of_entry] / norms[indices]).astype(np.float32)
+
+    # Write the build to a directory of its own, then publish it through the manifest
+    os.makedirs(out_dir, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix="build-", dir=out_dir)
+    arrays = {"indptr": indptr, "indices": indices, "data": data, "idf": idf}
+    for name, array in arrays.items():
+        np.save(os.path.join(build_dir, f"{name}.npy"), array)
+
+    vocab_list = sorted(vocab, key=vocab.get)
+    with open(os.path.join(build_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(vocab_list, f)
+    with open(os.path.join(build_dir, "roles.json"), "w", encoding="utf-8") as f:
+        json.dump(roles, f)
+
+    build = os.path.basename(build_dir)
+    manifest_path = os.path.join(out_dir, _MANIFEST)
+    temp_path = f"{manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"build": build, "built_at": time.time(), "roles": n_roles, "skills": n_skills}, f)
+    os.replace(temp_path, manifest_path)
+
+    _remove_old_builds(out_dir, keep=build)
+    return out_dir
+
+
+def _read_manifest(out_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(out_dir, _MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_old_builds(out_dir: str, keep: str) -> None:
+    """Delete superseded and abandoned builds that no worker can still be loading."""
+    now = time.time()
+    for entry in os.scandir(out_dir):
+        if entry.is_dir() and entry.name.startswith("build-") and entry.name != keep:
+            try:
+                if now - entry.stat().st_mtime > _OLD_BUILD_SECONDS:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                pass
+
+
+def _catalog_is_stale(source_path: str, out_dir: str) -> bool:
+    manifest = _read_manifest(out_dir)
+    if manifest is None:
+        return True
+    return os.path.exists(source_path) and os.path.getmtime(source_path) > manifest["built_at"]
+
+
+class CareerMatchEngine:
+    """Top-k career role matching over a compiled, memory-mapped catalog."""
+
+    def __init__(self, catalog_dir: str = CATALOG_CACHE_DIR):
+        """
+        Load the build the catalog directory's manifest points to.
+
+        Raises:
+            FileNotFoundError: if the catalog has not been built
+        """
+        self.catalog_dir = catalog_dir
+        manifest = _read_manifest(catalog_dir)
+        if manifest is None:
+            raise FileNotFoundError(f"No compiled career catalog in {catalog_dir}")
+        build_dir = os.path.join(catalog_dir, manifest["build"])
+
+        arrays = {name: np.load(os.path.join(build_dir, f"{name}.npy"), mmap_mode="r")
+                  for name in _ARRAYS}
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.data = arrays["data"]
+        self.idf = arrays["idf"]
+
+        with open(os.path.join(build_dir, "vocab.json"), "r", encoding="utf-8") as f:
+            self.vocab: List[str] = json.load(f)
+        with open(os.path.join(build_dir, "roles.json"), "r", encoding="utf-8") as f:
+            self.roles: List[Dict] = json.load(f)
+
+        self.skill_ids = {skill: i for i, skill in enumerate(self.vocab)}
+        # Canonical names are the vocabulary terms themselves
+        self._matcher = SkillMatcher(self.vocab, aliases={skill: skill for skill in self.vocab})
+
+    @property
+    def n_roles(self) -> int:
+        return len(self.roles)
+
+    def profile(self, resume_text: str = "",
+                skills: Optional[Iterable[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build a TF-IDF-weighted, L2-normalized skill profile.
+
+        Term frequency comes from catalog skills found in resume_text; skills
+        listed explicitly (e.g. from the AI-parsed resume) count once each.
+
+        Returns:
+            (skill ids, weights) arrays; skills outside the catalog are ignored
+        """
+        counts: Dict[int, int] = {}
+        if resume_text:
+            for skill, count in self._matcher.match(resume_text)["counts"].items():
+                counts[self.skill_ids[skill]] = count
+        for skill in skills or ():
+            skill_id = self.skill_ids.get(normalize_skill(skill))
+            if skill_id is not None:
+                counts[skill_id] = counts.get(skill_id, 0) + 1
+
+        skill_ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        weights = (1 + np.log(tf)) * self.idf[skill_ids]
+        norm = float(np.linalg.norm(weights)) or 1.0
+        return skill_ids, (weights / norm).astype(np.float32)
+
+    def _postings(self, skill_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Matrix entry positions of all the skills' postings, and how many each skill has."""
+        starts = self.indptr[skill_ids]
+        lengths = self.indptr[skill_ids + 1] - starts
+        # Concatenated ranges [start, start + length) without a Python loop
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return np.arange(int(lengths.sum()), dtype=np.int64) + offsets, lengths
+
+    def score(self, skill_ids: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score the profile against every role.
+
+        Returns:
+            Dense arrays over all roles: cosine similarity with the profile, and
+            the share of each role's IDF-weighted skill mass the profile covers
+        """
+        entries, lengths = self._postings(skill_ids)
+        role_ids = self.indices[entries]
+        values = self.data[entries]
+
+        scores = np.bincount(role_ids, weights=values * np.repeat(weights, lengths), minlength=self.n_roles)
+        # data is idf / norm, so each shared skill covers data**2 of its role's mass
+        coverage = np.bincount(role_ids, weights=values.astype(np.float64) ** 2, minlength=self.n_roles)
+        return scores.astype(np.float32), coverage
+
+    def top_matches(self, resume_text: str = "", skills: Optional[Iterable[str]] = None,
+                    k: int = 3) -> List[Dict]:
+        """
+        Return the k best roles, best first.
+
+        Each result is a copy of the role's catalog entry with "score" (cosine
+        similarity, used for ranking), "match" (the percentage of the role's
+        weighted skills the user has) and "matched_skills" added. Roles that
+        share no skill with the user are never returned, so a resume with no
+        overlap gives an empty list.
+        """
+        skill_ids, weights = self.profile(resume_text, skills)
+        scores, coverage = self.score(skill_ids, weights)
+        candidates = np.flatnonzero(scores > 0)
+        k = min(k, len(candidates))
+        if k <= 0:
+            return []
+
+        if k < len(candidates):
+            top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        else:
+            top = candidates
+        # Stable sort keeps catalog order among equal scores
+        top = top[np.lexsort((top, -scores[top]))]
+        percents = np.clip(np.rint(100 * coverage[top]), MIN_MATCH_PERCENT, MAX_MATCH_PERCENT).astype(int)
+
+        user_skills = {self.vocab[skill_id] for skill_id in skill_ids}
+        results = []
+        for role_id, percent in zip(top, percents):
+            role = dict(self.roles[role_id])
+            needed = role.get("skills_needed", [])
+            if isinstance(needed, str):
+                needed = needed.split(",")
+            role["score"] = round(float(scores[role_id]), 4)
+            role["match"] = int(percent)
+            role["matched_skills"] = [s.strip() for s in needed if normalize_skill(s) in user_skills]
+            results.append(role)
+        return results
+
+
+_engine: Optional[CareerMatchEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_career_match_engine() -> CareerMatchEngine:
+    """Return the shared engine, compiling the catalog first if it is missing or stale."""
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            if _catalog_is_stale(CATALOG_SOURCE, CATALOG_CACHE_DIR):
+                build_catalog(CATALOG_SOURCE, CATALOG_CACHE_DIR)
+            _engine = CareerMatchEngine(CATALOG_CACHE_DIR)
+        return _engine
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    start = time.perf_counter()
+    build_catalog()
+    print(f"Compiled {CATALOG_SOURCE} in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    engine = get_career_match_engine()
+    sample = ("Built REST APIs in Python and Node.js, deployed with Docker and Kubernetes on AWS. "
+              "Wrote SQL for PostgreSQL reporting and prototyped machine learning features. "
+              "Strong communication and problem solving; agile team lead.")
+    for match in engine.top_matches(sample, k=3):
+        print(f"  {match['role']} ({match['match']}%) - {', '.join(match['matched_skills'])}")
+
+    # Synthetic large catalog built from the shipped skill vocabulary
+    rng = random.Random(0)
+    vocab = engine.vocab + [f"skill {i}" for i in range(2000)]
+    roles = [{"role": f"Role {i}", "skills_needed": rng.sample(vocab, rng.randint(4, 12))}
+             for i in range(20000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "catalog.json")
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(roles, f)
+        start = time.perf_counter()
+        build_catalog(source, tmp)
+        build_ms = (time.perf_counter() - start) * 1000
+        large = CareerMatchEngine(tmp)
+
+        repeat = 200
+        start = time.perf_counter()
+        for _ in range(repeat):
+            large.top_matches(sample, k=5)
+        query_ms = (time.perf_counter() - start) / repeat * 1000
+        print(f"{large.n_roles} roles / {len(large.vocab)} skills: build {build_ms:.0f} ms, "
+              f"query {query_ms:.3f} ms")
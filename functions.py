@@ -1,14 +1,19 @@
 import os
-import random
 import pytesseract
 from PIL import Image
-import fitz
+from interview_advisor.pdf_extraction import extract_pdf_text
+from interview_advisor.document_context import get_document_context
+from skill_matcher import get_skill_matcher
+from career_index import CareerPathIndex
 from roadmap_interactive import handle_roadmap_interactive
 import datetime
 import sqlite3
 
 HAS_ROADMAP_INTERACTIVE = True
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+# Use the default Windows install location when present, otherwise rely on PATH
+WINDOWS_TESSERACT_PATH = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+if os.path.exists(WINDOWS_TESSERACT_PATH):
+    pytesseract.pytesseract.tesseract_cmd = WINDOWS_TESSERACT_PATH
 
 # Database setup
 
@@ -76,6 +81,9 @@ education = []
 experience = []
 current_user_id = None
 
+# Skill index over the current career_paths list, rebuilt when the list changes
+_career_index = None
+
 
 def initialize(abs_path, b, c, d, e, user_id=None):
     global absolute_resume_path
@@ -117,30 +125,21 @@ def extract_text_from_image(image_path):
 def extract_text_from_pdf(pdf_path):
 
     global resume_text
-    """Extract text from a PDF file"""
-    try:
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
+    """Extract text from a PDF file, OCR'ing image-only pages"""
+    result = extract_pdf_text(pdf_path)
+    ocr_pages = sum(1 for page in result["pages"] if page["ocr"])
+    print(f"Extracted {len(result['pages'])} PDF pages ({ocr_pages} via OCR) in {result['seconds']:.2f}s")
+    return result["text"]
 
-        # Fallback: Try to use OCR on the PDF pages
-        try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap()
-                img = Image.frombytes(
-                    "RGB", [pix.width, pix.height], pix.samples)
-                text += pytesseract.image_to_string(img)
-            return text
-        except Exception as e2:
-            print(f"Fallback extraction failed: {e2}")
-            return ""
+
+def extract_resume_text(resume_path):
+    """Extract text from a resume file based on its extension"""
+    if resume_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
+        return extract_text_from_image(resume_path)
+    elif resume_path.lower().endswith('.pdf'):
+        return extract_text_from_pdf(resume_path)
+    print("Unsupported file format. Please provide a PDF or image file.")
+    return ""
 
 
 def analyze_resume(): # No longer needs path as argument, uses global
@@ -160,24 +159,28 @@ def analyze_resume(): # No longer needs path as argument, uses global
         print(f"\nError: Resume file not found at: {resume_path}")
         return False
 
-    # Extract text based on file type
-    if resume_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-        resume_text = extract_text_from_image(resume_path)
-    elif resume_path.lower().endswith('.pdf'):
-        resume_text = extract_text_from_pdf(resume_path)
-    else:
-        print("Unsupported file format. Please provide a PDF or image file.")
-        return False
+    # Reuse text already extracted for this file (e.g. by ResumeProcessor)
+    context = get_document_context(resume_path)
+    resume_text = context.get("text", lambda: extract_resume_text(resume_path))
 
     if not resume_text.strip():
         print("Could not extract text from the resume. Please try another file.")
         return False
 
+    # The analysis (and its resume_data row) only needs computing once per file version
+    analysis = context.get(f"analysis:{current_user_id}",
+                           lambda: _analyze_resume_text(resume_path, resume_text))
+    skills = analysis["skills"]
+    education = analysis["education"]
+    experience = analysis["experience"]
+    return True
+
+
+def _analyze_resume_text(resume_path, resume_text):
+    """Extract skills, education and experience from resume text and save them"""
     # Simple extraction of skills, education, and experience
-    skills = []
-    for skill in skill_keywords:
-        if skill in resume_text.lower():
-            skills.append(skill.title())
+    # One pass over the text, most frequently mentioned skills first
+    skills = get_skill_matcher(skill_keywords).match(resume_text)["skills"]
 
     # Simple education extraction
     education = []
@@ -231,7 +234,7 @@ def analyze_resume(): # No longer needs path as argument, uses global
                     experience.append(f"{line.strip()} - {lines[i+1].strip()}")
 
     # Limit the number of items
-    skills = list(set(skills))[:10]  # Remove duplicates and limit to 10
+    skills = skills[:10]  # Already de-duplicated; limit to 10
     education = list(set(education))[:3]  # Remove duplicates and limit to 3
     experience = experience[:3]  # Limit to 3 experiences
 
@@ -265,10 +268,19 @@ def analyze_resume(): # No longer needs path as argument, uses global
     except Exception as e:
         print(f"Error saving resume data to database: {str(e)}")
 
-    return True
+    return analysis
+
+
+def get_career_index():
+    """Return the skill index for the current career_paths, building it on first use."""
+    global _career_index
 
+    if _career_index is None or _career_index.career_paths is not career_paths:
+        _career_index = CareerPathIndex(career_paths)
+    return _career_index
 
-def get_matching_career_paths(limit=3):
+
+def get_matching_career_paths(limit=3, tie_break_seed=None):
     global skills
     global education
     global experience
@@ -279,27 +291,9 @@ def get_matching_career_paths(limit=3):
     if not analysis:
         return []
 
-    scored_paths = []
-    for path in career_paths:
-        score = 0
-
-        # Score based on skill matches
-        for skill in analysis["skills"]:
-            if skill.lower() in [s.lower() for s in path["skills_needed"]]:
-                score += 10
-
-            # Partial matches
-            for needed_skill in path["skills_needed"]:
-                if skill.lower() in needed_skill.lower() or needed_skill.lower() in skill.lower():
-                    score += 5
-
-        # Add some randomness to make it more interesting
-        score += random.randint(0, 20)
-
-        scored_paths.append((path, score))
-
-    # Sort by score descending
-    scored_paths.sort(key=lambda x: x[1], reverse=True)
+    # Equal scores are ordered by catalog position, or by a reproducible
+    # shuffle when a tie_break_seed is given
+    scored_paths = get_career_index().top_matches(analysis["skills"], limit, tie_break_seed)
 
     # Return the top matches with match percentage
     results = []
@@ -10,9 +10,18 @@ import json
 import re
 from typing import Dict, List, Any, Optional
 
+from interview_advisor.llm_gateway import get_llm_gateway
+
 # Assuming you have a Google AI client set up in your main application
 # If using a different AI service, you'll need to modify this
 
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"}
+]
+
 def parse_llm_career_recommendations(llm_response: str) -> List[Dict[str, Any]]:
     """
     Parse the LLM response text into structured career recommendations.
@@ -159,7 +168,72 @@ def generate_improved_career_prompt(resume_data: Dict[str, Any], user_profile: O
     
     return prompt
 
-def get_career_recommendations(ai_client, resume_data: Dict[str, Any], user_profile: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def generate_phrasing_prompt(matches: List[Dict[str, Any]], resume_data: Dict[str, Any]) -> str:
+    """
+    Generate a prompt asking the LLM to describe already-selected career matches.
+
+    The roles and match percentages come from the career match engine; the
+    LLM only writes the descriptive fields, in the same format as above.
+
+    Args:
+        matches: Top results from CareerMatchEngine.top_matches
+        resume_data: Extracted data from the user's resume
+
+    Returns:
+        Prompt string for the LLM
+    """
+    resume_str = json.dumps(resume_data, indent=2)
+    roles_str = "\n".join(
+        f"- {m['role']} (Match: {m['match']}%); candidate already has: "
+        f"{', '.join(m.get('matched_skills', [])) or 'none of the listed skills'}"
+        for m in matches
+    )
+
+    prompt = f"""
+    The following career paths were selected for this candidate by skill matching:
+    {roles_str}
+    
+    Resume data: {resume_str}
+    
+    For EACH career path above, in the same order and keeping the role title and match
+    percentage exactly as given, write the recommendation in this EXACT format:
+    
+    Role Title (Match: X%)
+    
+    Description: [One sentence description of the role, tailored to this candidate]
+    
+    Skills needed: [Comma-separated list of specific skills required]
+    
+    Growth potential: [High/Medium/Low]
+    
+    Salary range: $X - $Y
+    
+    Do not add, remove or rename any career paths.
+    """
+
+    return prompt
+
+def _merge_phrasing(matches: List[Dict[str, Any]], phrased: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Overlay LLM-written fields on the engine's matches, keeping its roles and scores."""
+    recommendations = []
+    for i, match in enumerate(matches):
+        rec = {
+            'role': match['role'],
+            'match': match['match'],
+            'description': match.get('description'),
+            'skills_needed': ", ".join(match['skills_needed']) if isinstance(match.get('skills_needed'), list) else match.get('skills_needed'),
+            'growth_potential': match.get('growth_potential'),
+            'salary_range': match.get('salary_range')
+        }
+        if i < len(phrased):
+            for field in ('description', 'skills_needed', 'growth_potential', 'salary_range'):
+                if phrased[i].get(field):
+                    rec[field] = phrased[i][field]
+        recommendations.append(rec)
+    return recommendations
+
+def get_career_recommendations(ai_client, resume_data: Dict[str, Any], user_profile: Optional[Dict[str, Any]] = None,
+                               matches: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
     """
     Generate improved career recommendations using the LLM while maintaining the same UI format.
     
@@ -167,26 +241,36 @@ def get_career_recommendations(ai_client, resume_data: Dict[str, Any], user_prof
         ai_client: AI client to use for generating recommendations
         resume_data: Extracted data from the user's resume
         user_profile: Additional user profile information if available
+        matches: Career matches already ranked by the career match engine. When
+            given, the LLM only phrases these, and they are returned as-is if
+            the LLM is unavailable or fails.
         
     Returns:
         List of dictionaries containing structured career recommendations
     """
+    if matches:
+        if not ai_client:
+            return _merge_phrasing(matches, [])
+        try:
+            response = get_llm_gateway(ai_client).generate(
+                generate_phrasing_prompt(matches, resume_data),
+                call_site="career.phrase_matches",
+                safety_settings=SAFETY_SETTINGS
+            )
+            return _merge_phrasing(matches, parse_llm_career_recommendations(response.text))
+        except Exception as e:
+            print(f"Error phrasing career recommendations: {e}")
+            return _merge_phrasing(matches, [])
+
     try:
         # Generate the prompt
         prompt = generate_improved_career_prompt(resume_data, user_profile)
         
         # Call the LLM
-        recommendation_model = ai_client.GenerativeModel('gemini-1.5-flash')
-        safety_settings = [
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"}
-        ]
-        
-        response = recommendation_model.generate_content(
+        response = get_llm_gateway(ai_client).generate(
             prompt,
-            safety_settings=safety_settings
+            call_site="career.recommendations",
+            safety_settings=SAFETY_SETTINGS
         )
         
         # Parse the response
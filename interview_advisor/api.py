@@ -12,6 +12,8 @@ from flask import Blueprint, request, jsonify, Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+from .sessions import new_session_id
+
 # Load environment variables
 load_dotenv()
 
@@ -39,7 +41,7 @@ def create_session():
         print(f"Using resume_id: {resume_id}")
 
         # Create unique session ID
-        session_id = f"session_{int(time.time())}"
+        session_id = new_session_id("session")
         print(f"Generated session_id: {session_id}")
 
         # Store session in memory
@@ -0,0 +1,234 @@
+"""
+Content-addressed TTS audio cache
+
+Synthesized speech is stored under the hash of everything that determines
+it (text, voice, model, voice settings), so the same utterance is only ever
+synthesized once: fallback questions, the audio test and repeated closing
+statements are served from disk without calling ElevenLabs. Files are
+written atomically, so concurrent writers of the same clip cannot leave a
+partial file behind.
+
+An in-memory index (ordered by last access) is built from the directory once
+at start-up; lookups and evictions never list the directory again. A
+janitor thread keeps the cache under a byte budget and a maximum age, least
+recently used first. It runs on a timer, or sooner when a write takes the
+cache over budget, so requests never delete files themselves. The janitor
+also stamps accessed files' modification times, so the access order
+survives a restart.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+TTS_CACHE_DIR = os.path.join("cache", "audio")
+TTS_CACHE_MAX_BYTES = int(os.environ.get('TTS_CACHE_MAX_MB', 200)) * 1024 * 1024
+TTS_CACHE_MAX_AGE_SECONDS = float(os.environ.get('TTS_CACHE_MAX_AGE_DAYS', 30)) * 86400
+TTS_CACHE_JANITOR_INTERVAL = float(os.environ.get('TTS_CACHE_JANITOR_INTERVAL', 300))
+
+AUDIO_EXTENSION = ".mp3"
+TEMP_EXTENSION = ".tmp"
+# Temp files older than this at start-up were left by a crashed writer
+STALE_TEMP_SECONDS = 300
+
+
+def audio_cache_key(text: str, voice_id: str, model_id: str, voice_settings: Dict[str, Any]) -> str:
+    """Hash of everything that determines the synthesized audio."""
+    payload = json.dumps({"text": text, "voice_id": voice_id, "model_id": model_id,
+                          "voice_settings": voice_settings}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Size- and age-bounded LRU of audio files keyed by content hash."""
+
+    def __init__(self, cache_dir: str = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES,
+                 max_age: float = TTS_CACHE_MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # key -> (size, last access); least recently used first
+        self._index: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Keys read since the janitor last ran; their mtimes are updated off the request path
+        self._touched = set()
+        self._wake = threading.Event()
+        self._janitor = None
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """
+        Index existing files once, oldest first (also picks up files from before
+        the cache), and delete temp files abandoned by interrupted writes.
+        """
+        entries = []
+        now = time.time()
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(TEMP_EXTENSION):
+                # Recent ones may belong to another worker writing right now
+                try:
+                    if now - entry.stat().st_mtime > STALE_TEMP_SECONDS:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+            elif entry.is_file() and entry.name.endswith(AUDIO_EXTENSION):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-len(AUDIO_EXTENSION)], stat.st_size))
+        for mtime, key, size in sorted(entries):
+            self._index[key] = (size, mtime)
+            self._total_bytes += size
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + AUDIO_EXTENSION)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._index:
+                return True
+        return self._adopt(key)
+
+    def _adopt(self, key: str) -> bool:
+        """Index a file written by another process sharing the directory."""
+        try:
+            size = os.path.getsize(self.path_for(key))
+        except OSError:
+            return False
+        with self._lock:
+            if key not in self._index:
+                self._index[key] = (size, time.time())
+                self._total_bytes += size
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached audio for key, or None."""
+        if key not in self:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None:
+                self._index[key] = (entry[0], time.time())
+                self._index.move_to_end(key)
+                self._touched.add(key)
+            self.hits += 1
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            # Removed behind our back
+            with self._lock:
+                if key in self._index:
+                    self._total_bytes -= self._index.pop(key)[0]
+                self.hits -= 1
+                self.misses += 1
+            return None
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        """Store audio for key and return its path; wakes the janitor if the cache is now over budget."""
+        path = self.path_for(key)
+        # Unique per process and thread: forked workers can share thread ids
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{TEMP_EXTENSION}"
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            if key in self._index:
+                self._total_bytes -= self._index[key][0]
+            self._index[key] = (len(data), time.time())
+            self._index.move_to_end(key)
+            self._total_bytes += len(data)
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            if self._janitor is not None:
+                self._wake.set()
+            else:
+                self.evict(keep=key)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove least recently used entries that are too old or over the byte budget. Returns the count."""
+        now = time.time()
+        victims = []
+        with self._lock:
+            for key, (size, last_access) in self._index.items():
+                if key == keep:
+                    continue
+                if self._total_bytes <= self.max_bytes and now - last_access <= self.max_age:
+                    break
+                victims.append(key)
+                self._total_bytes -= size
+            for key in victims:
+                del self._index[key]
+
+        for key in victims:
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+        return len(victims)
+
+    def _flush_access_times(self) -> None:
+        """Record recent reads as file modification times (used to order the index after a restart)."""
+        with self._lock:
+            touched, self._touched = self._touched, set()
+            times = {key: self._index[key][1] for key in touched if key in self._index}
+        for key, last_access in times.items():
+            try:
+                os.utime(self.path_for(key), (last_access, last_access))
+            except OSError:
+                pass
+
+    def start_janitor(self, interval: float = TTS_CACHE_JANITOR_INTERVAL) -> None:
+        """Evict and record access times every interval seconds (or when woken) on a daemon thread."""
+        if self._janitor is not None:
+            return
+
+        def run():
+            while True:
+                self._wake.wait(interval)
+                self._wake.clear()
+                try:
+                    self._flush_access_times()
+                    removed = self.evict()
+                    if removed:
+                        print(f"[AudioCache] Evicted {removed} clips, {self._total_bytes / 1024 / 1024:.1f} MB cached")
+                except Exception as e:
+                    print(f"[AudioCache] Janitor failed: {e}")
+
+        self._janitor = threading.Thread(target=run, name="audio-cache-janitor", daemon=True)
+        self._janitor.start()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._index), "bytes": self._total_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+
+_caches: Dict[str, AudioCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_audio_cache(cache_dir: str = TTS_CACHE_DIR) -> AudioCache:
+    """Shared cache per directory, so every TTSService instance uses one index."""
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = AudioCache(cache_dir)
+            cache.start_janitor()
+            _caches[cache_dir] = cache
+        return cache
@@ -0,0 +1,95 @@
+"""
+Shared audio helpers
+
+Used by the web routes, the speech recognizers and the fluency analysis, so
+they decode audio and find speech in it the same way:
+- decode_to_pcm: any format ffmpeg understands (WebM/Opus from the browser's
+  MediaRecorder, WAV, MP3, ...) to 16 kHz mono 16-bit PCM, through pipes so
+  nothing is written to disk
+- pcm_to_samples: that PCM as float samples in [-1, 1]
+- voiced_frames: the energy-based voice activity detector
+"""
+
+import os
+import subprocess
+
+import numpy as np
+
+FFMPEG_BINARY = os.environ.get('FFMPEG_BINARY', 'ffmpeg')
+FFMPEG_TIMEOUT = 60
+
+# Recognizer input format: 16 kHz, mono, signed 16-bit little-endian
+PCM_SAMPLE_RATE = 16000
+PCM_SAMPLE_WIDTH = 2
+
+# Voice activity detection
+VAD_FRAME_MS = 30
+# A frame is speech when it is this many dB above the noise floor...
+VAD_THRESHOLD_DB = 12.0
+# ...and above this absolute level (dBFS), so a silent recording stays silent
+VAD_MIN_LEVEL_DB = -50.0
+# Speech varies in level from frame to frame; a clip whose 10th and 90th
+# percentile levels are closer than this is steady noise (hum, fan, hiss)
+VAD_MIN_SPREAD_DB = 12.0
+# Pauses shorter than this stay inside a segment
+VAD_MIN_SILENCE_MS = 300
+# Speech kept around each segment so word edges are not clipped
+VAD_PADDING_MS = 150
+# Segments shorter than this are treated as clicks and dropped
+VAD_MIN_SPEECH_MS = 150
+
+
+class AudioDecodeError(Exception):
+    """Raised when ffmpeg is missing or cannot decode the audio."""
+
+
+def decode_to_pcm(data: bytes, sample_rate: int = PCM_SAMPLE_RATE) -> bytes:
+    """
+    Decode an encoded audio stream to mono 16-bit PCM at sample_rate.
+
+    Raises:
+        AudioDecodeError: if ffmpeg is not installed or rejects the input
+    """
+    if not data:
+        raise AudioDecodeError("Empty audio stream")
+    command = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+               "-i", "pipe:0", "-vn", "-ac", "1", "-ar", str(sample_rate),
+               "-f", "s16le", "-acodec", "pcm_s16le", "pipe:1"]
+    try:
+        result = subprocess.run(command, input=data, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, timeout=FFMPEG_TIMEOUT)
+    except FileNotFoundError:
+        raise AudioDecodeError(f"{FFMPEG_BINARY} not found. Is FFmpeg installed?")
+    except subprocess.TimeoutExpired:
+        raise AudioDecodeError("Audio decoding timed out")
+
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise AudioDecodeError(message[-1] if message else f"ffmpeg exited with code {result.returncode}")
+    if not result.stdout:
+        raise AudioDecodeError("No audio decoded")
+    return result.stdout
+
+
+def pcm_to_samples(pcm: bytes) -> np.ndarray:
+    """Mono 16-bit PCM as float32 samples in [-1, 1]."""
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def voiced_frames(level: np.ndarray) -> np.ndarray:
+    """
+    Which frames contain speech, given each frame's level in dBFS.
+
+    A clip with too little dynamic range (VAD_MIN_SPREAD_DB) has no speech.
+    Otherwise a frame is speech when it is VAD_THRESHOLD_DB above the noise
+    floor (10th percentile), capped at VAD_THRESHOLD_DB below the speech
+    level (90th percentile) so a clip that is almost all speech is still
+    detected, and above VAD_MIN_LEVEL_DB.
+    """
+    if not len(level):
+        return np.zeros(0, dtype=bool)
+    noise_floor, speech_level = np.percentile(level, [10, 90])
+    if speech_level - noise_floor < VAD_MIN_SPREAD_DB:
+        return np.zeros(len(level), dtype=bool)
+    threshold = min(noise_floor + VAD_THRESHOLD_DB, speech_level - VAD_THRESHOLD_DB)
+    return level > max(threshold, VAD_MIN_LEVEL_DB)
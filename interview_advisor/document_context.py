@@ -0,0 +1,83 @@
+"""
+Document context cache
+
+Holds everything derived from an uploaded resume file (extracted text, AI-parsed
+structured data, keyword analysis) so that a file is read and text-extracted
+once and every consumer - within a request and across requests - shares the
+result. Entries are keyed by absolute path and invalidated automatically when
+the file's size or modification time changes (e.g. after a re-upload).
+"""
+
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Optional, Tuple
+
+# Maximum number of documents kept in memory
+MAX_DOCUMENTS = 64
+
+_documents: "OrderedDict[str, DocumentContext]" = OrderedDict()
+_documents_lock = threading.Lock()
+
+
+def _fingerprint(path: str) -> Optional[Tuple[int, int]]:
+    """Return a cheap identity for the file's current contents."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DocumentContext:
+    """Memoizes values derived from a single version of a file."""
+
+    def __init__(self, path: str, fingerprint: Optional[Tuple[int, int]]):
+        self.path = path
+        self.fingerprint = fingerprint
+        self._values = {}
+        self._key_locks = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return the value stored under key, computing it with loader on first use.
+
+        Concurrent callers asking for the same key wait for the first loader
+        instead of running their own. Empty results (failed extraction, failed
+        AI parse) are not stored, so the next caller gets another attempt.
+        """
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            key_lock = self._key_locks[key]
+
+        with key_lock:
+            with self._lock:
+                if key in self._values:
+                    return self._values[key]
+
+            value = loader()
+
+            if value:
+                with self._lock:
+                    self._values[key] = value
+            return value
+
+
+def get_document_context(path: str) -> DocumentContext:
+    """Return the shared context for the current version of the file at path."""
+    abs_path = os.path.abspath(path)
+    fingerprint = _fingerprint(abs_path)
+
+    with _documents_lock:
+        context = _documents.get(abs_path)
+        if context is None or context.fingerprint != fingerprint:
+            context = DocumentContext(abs_path, fingerprint)
+            _documents[abs_path] = context
+        _documents.move_to_end(abs_path)
+
+        while len(_documents) > MAX_DOCUMENTS:
+            _documents.popitem(last=False)
+
+    return context
@@ -1,30 +1,66 @@
 import os
+import re
 import json
 import time
-from typing import Dict, List, Tuple, Optional, Any
-from .utils import read_text_file, save_json_file, ensure_directory
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple, Optional, Any
+from .utils import read_text_file, append_jsonl, iter_jsonl, write_jsonl_atomic, ensure_directory
+from .llm_gateway import get_llm_gateway
+from .interview_context import InterviewContext
+from .speculative import SpeculativeEngine, SPECULATIVE_ENABLED
+from .sessions import new_session_id, session_path
+
+# First line of a streamed turn: "VERDICT: question" or "VERDICT: correction"
+VERDICT_PATTERN = re.compile(r"\s*\**\s*VERDICT\s*:\s*\**\s*(question|correction)\b\**\s*", re.IGNORECASE)
+
+# End of a sentence followed by whitespace
+SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s+")
+
+# fsync the conversation log after each append (slower, but survives power loss)
+CONVERSATION_LOG_FSYNC = os.environ.get("INTERVIEW_LOG_FSYNC", "0") == "1"
 
 
 class Interview:
-    def __init__(self, ai_client, tts_service, resume_data=None):
+    def __init__(self, ai_client, tts_service, resume_data=None, session_id=None):
         """Initialize the interview with AI client and resume data."""
         self.ai_client = ai_client
         self.tts_service = tts_service
         self.resume_data = resume_data or {}
         self.conversation_history = []
+        # Bounded prompt context: resume digest, rolling summary and last few turns
+        self.context = InterviewContext(self.resume_data, ai_client)
         self.introduction = ""
         self.current_question_index = 0
         self.interview_start_time = None
         self.interview_end_time = None
 
-        # Create interview data directory
-        ensure_directory("cache/interviews")
-
-        # Initialize the interview session ID
-        self.session_id = f"interview_{int(time.time())}"
-        self.session_dir = f"cache/interviews/{self.session_id}"
+        # One structured LLM call per turn instead of analysis + reply
+        self.single_call_turns = os.environ.get("INTERVIEW_SINGLE_CALL_TURNS", "1") != "0"
+        self.last_answer_analysis = {}
+        # Per-turn reply latency: {"turn", "mode", "seconds"[, "first_chunk_seconds"]}
+        self.turn_metrics = []
+        # Single worker so streamed sentences are spoken in order
+        self._tts_executor = None
+        # Single worker for conversation writes made off the request thread
+        self._io_executor = None
+
+        # Optional prefetch of follow-up questions while the candidate answers
+        self.speculative = SpeculativeEngine(self) if SPECULATIVE_ENABLED else None
+        # Reply text -> audio file synthesized ahead of time
+        self._prefetched_audio = {}
+
+        # Initialize the interview session ID and its (sharded) data directory
+        self.session_id = session_id or new_session_id("interview")
+        self.session_dir = session_path(self.session_id)
         ensure_directory(self.session_dir)
 
+        # Append-only conversation log; entries/metrics before these indexes are written
+        self.log_path = os.path.join(self.session_dir, "conversation.jsonl")
+        self._logged_turns = 0
+        self._logged_metrics = 0
+        self._log_lock = threading.Lock()
+
     def start_interview(self) -> str:
         """Start the interview with an introduction question."""
         self.interview_start_time = time.time()
@@ -33,17 +69,13 @@ class Interview:
         intro_question = self._generate_introduction_question()
 
         # Add to conversation history
-        self.conversation_history.append({
-            "role": "interviewer",
-            "content": intro_question,
-            "timestamp": time.time()
-        })
+        self._add_to_history("interviewer", intro_question)
 
         # Save the conversation history
         self._save_conversation()
 
         # Convert to speech if TTS is available
-        if self.tts_service:
+        if self._speaks_on_server:
             try:
                 self.tts_service.text_to_speech(intro_question)
             except Exception as e:
@@ -51,44 +83,206 @@ class Interview:
 
         return intro_question
 
-    def process_answer(self, answer_text: str) -> str:
-        """Process the candidate's answer and generate the next question."""
+    def process_answer(self, answer_text: str, background_io: bool = False) -> str:
+        """
+        Process the candidate's answer and generate the next question.
+
+        With background_io, saving the conversation and TTS run on background
+        workers (concurrently with each other) and the question is returned as
+        soon as it has been generated.
+        """
         # Process the answer
         if self.current_question_index == 0:
             # If this is the answer to the intro question, save it as introduction
             self.introduction = answer_text
 
         # Add to conversation history
-        self.conversation_history.append({
-            "role": "candidate",
-            "content": answer_text,
-            "timestamp": time.time()
-        })
+        self._add_to_history("candidate", answer_text)
 
         # Generate the next question
         next_question = self._generate_next_question(answer_text)
 
         # Add to conversation history
-        self.conversation_history.append({
-            "role": "interviewer",
-            "content": next_question,
-            "timestamp": time.time()
-        })
+        self._add_to_history("interviewer", next_question)
 
         # Increment question index
         self.current_question_index += 1
 
+        if background_io:
+            self._save_conversation_async()
+            self._speak_async(next_question)
+            return next_question
+
         # Save the conversation history
         self._save_conversation()
 
         # Convert to speech if TTS is available
-        if self.tts_service:
+        self._speak(next_question)
+
+        return next_question
+
+    def process_answer_stream(self, answer_text: str) -> Iterator[str]:
+        """
+        Like process_answer, but yields the interviewer's reply in chunks as the
+        LLM produces it. Each complete sentence is sent to TTS as soon as it is
+        available instead of after the whole reply.
+
+        The conversation is updated and saved once the reply is complete. If
+        streaming fails, the regular turn path generates the reply instead:
+        it is yielded in one piece when nothing was streamed yet, and when
+        the stream broke off partway the partial reply is dropped and the
+        caller should show last_reply, which is the reply actually recorded.
+        """
+        if self.current_question_index == 0:
+            self.introduction = answer_text
+
+        self._add_to_history("candidate", answer_text)
+
+        start = time.perf_counter()
+        first_chunk = None
+        spoken = 0
+        # A prefetched question beats streaming a new one
+        reply = self._take_speculative(answer_text) or ""
+        if reply:
+            yield reply
+        else:
             try:
-                self.tts_service.text_to_speech(next_question)
+                for chunk in self._stream_turn(answer_text):
+                    if first_chunk is None:
+                        first_chunk = time.perf_counter() - start
+                    reply += chunk
+                    spoken = self._speak_complete_sentences(reply, spoken)
+                    yield chunk
             except Exception as e:
-                print(f"Warning: Could not convert text to speech: {e}")
+                print(f"Streaming turn failed: {e}")
+                # A truncated reply is never recorded; the regular path answers instead
+                reply = ""
+
+            if reply.strip():
+                self._record_turn_latency("stream", time.perf_counter() - start, first_chunk)
+
+        if not reply.strip():
+            # Use the regular path (it records its own latency).
+            # The prefetched questions were already tried above
+            reply = self._generate_reply(answer_text)
+            spoken = 0
+            if first_chunk is None:
+                yield reply
+
+        reply = reply.strip()
+        if spoken < len(reply):
+            self._speak_async(reply[spoken:])
+
+        self._add_to_history("interviewer", reply)
+        self.current_question_index += 1
+        self._save_conversation()
 
-        return next_question
+    def _stream_turn(self, previous_answer: str) -> Iterator[str]:
+        """
+        Stream the moderated reply. The model first writes a one-line verdict
+        marker, which is consumed here so only the reply reaches the caller.
+        """
+        prompt = f"""{self._turn_instructions(previous_answer)}
+
+Start your response with exactly one line, either "VERDICT: question" or
+"VERDICT: correction", then write only your reply to the candidate on the following lines.
+"""
+        stream = get_llm_gateway(self.ai_client).generate_stream(
+            prompt, call_site="interview.turn_stream", cache=False)
+
+        header = ""
+        for chunk in stream:
+            if header is None:
+                yield chunk
+                continue
+            header += chunk
+            if "\n" not in header and len(header) < 40:
+                continue
+
+            text = self._strip_verdict(header)
+            header = None
+            if text:
+                yield text
+
+        if header:
+            text = self._strip_verdict(header).strip()
+            if text:
+                yield text
+
+    def _strip_verdict(self, header: str) -> str:
+        """
+        Remove the verdict marker from the start of a streamed reply, recording
+        the verdict. The reply may follow on the marker's line or the next ones.
+        """
+        first_line, newline, rest = header.partition("\n")
+        match = VERDICT_PATTERN.match(first_line)
+        if not match:
+            # No marker: the whole buffer is reply text
+            return header
+        self.last_answer_analysis = {"response_type": match.group(1).lower()}
+        same_line = first_line[match.end():]
+        return (f"{same_line}{newline}{rest}" if same_line.strip() else rest).lstrip()
+
+    @property
+    def _speaks_on_server(self) -> bool:
+        """Whether replies are spoken here; with client playback the browser fetches the audio itself."""
+        return bool(self.tts_service) and self.tts_service.server_playback
+
+    def _speak_complete_sentences(self, text: str, spoken: int) -> int:
+        """Send sentences of text completed after offset spoken to TTS; return the new offset."""
+        if not self._speaks_on_server:
+            return spoken
+        end = spoken
+        for match in SENTENCE_END.finditer(text, spoken):
+            end = match.end()
+        if end > spoken:
+            self._speak_async(text[spoken:end])
+        return end
+
+    def _speak_async(self, text: str) -> None:
+        """Queue text for TTS; sentences are spoken in order on one worker thread."""
+        if not self._speaks_on_server or not text.strip():
+            return
+        if self._tts_executor is None:
+            self._tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="interview-tts")
+
+        self._tts_executor.submit(self._speak, text)
+
+    def _speak(self, text: str) -> None:
+        """Speak text, playing pre-synthesized audio from a speculative prefetch when there is some."""
+        if not self._speaks_on_server or not text.strip():
+            return
+        audio_path = self._prefetched_audio.pop(text.strip(), None)
+        try:
+            if audio_path and os.path.exists(audio_path):
+                self.tts_service.play_async(audio_path)
+            else:
+                # Sentences are synthesized concurrently and played in order as they are ready
+                self.tts_service.speak_stream(text.strip())
+        except Exception as e:
+            print(f"Warning: Could not convert text to speech: {e}")
+
+    def prefetch_next_question(self) -> bool:
+        """
+        Start preparing likely follow-up questions while the candidate answers.
+        Returns False when speculative prefetch is disabled.
+        """
+        if not self.speculative:
+            return False
+        return self.speculative.prefetch()
+
+    def _take_speculative(self, previous_answer: str) -> Optional[str]:
+        """Use a prefetched follow-up question if one fits the answer."""
+        if not self.speculative:
+            return None
+        start = time.perf_counter()
+        candidate = self.speculative.take(previous_answer)
+        if not candidate:
+            return None
+        if candidate.get("audio_path"):
+            self._prefetched_audio[candidate["text"]] = candidate["audio_path"]
+        self._record_turn_latency("speculative", time.perf_counter() - start)
+        return candidate["text"]
 
     def end_interview(self) -> Tuple[str, str]:
         """End the interview, record the end time, and return closing statement + transcript."""
@@ -97,24 +291,20 @@ class Interview:
         # Generate standard closing statement
         closing = self._generate_closing_statement()
 
-        # Format the conversation history into a transcript string
-        transcript = "Interview Transcript:\n\n"
-        for entry in self.conversation_history:
-            role = entry["role"].capitalize()
-            transcript += f"{role}: {entry['content']}\n\n"
+        # Format the logged conversation into a transcript string
+        self._save_conversation()
+        transcript = "Interview Transcript:\n\n" + "".join(
+            f"{entry['role'].capitalize()}: {entry['content']}\n\n" for entry in self.iter_conversation())
 
         # Add final closing statement to history (optional, might duplicate)
-        self.conversation_history.append({
-            "role": "interviewer",
-            "content": closing,
-            "timestamp": time.time()
-        })
+        self._add_to_history("interviewer", closing)
 
-        # Save the complete conversation history
+        # Log the closing statement and compact the log
         self._save_conversation()
+        self._compact_conversation()
 
         # Convert closing to speech if TTS is available
-        if self.tts_service:
+        if self._speaks_on_server:
             try:
                 self.tts_service.text_to_speech(closing)
             except Exception as e:
@@ -144,13 +334,11 @@ class Interview:
             {system_prompt}
             """
 
-            # Initialize Gemini model
-            model = self.ai_client.GenerativeModel('gemini-1.5-flash')
-
             # Generate introduction
             print("[DEBUG Interview] Generating introduction question...")
             print(f"[DEBUG Interview] Prompt for intro question:\n---\n{user_prompt[:500]}...\n---")
-            response = model.generate_content(user_prompt)
+            response = get_llm_gateway(self.ai_client).generate(
+                user_prompt, call_site="interview.introduction")
             
             # Debug the raw response
             try:
@@ -176,7 +364,153 @@ class Interview:
             return fallback_question
 
     def _generate_next_question(self, previous_answer: str) -> str:
-        """Generate the next interview question based on the conversation history and resume."""
+        """
+        Generate the interviewer's reply to an answer: a correction if the answer
+        had factual errors or inappropriate language, otherwise the next question.
+
+        Uses one structured LLM call per turn, falling back to the two-phase
+        (analysis, then reply) path if that call fails or returns unusable JSON.
+        """
+        reply = self._take_speculative(previous_answer)
+        if reply is not None:
+            return reply
+        return self._generate_reply(previous_answer)
+
+    def _generate_reply(self, previous_answer: str) -> str:
+        """_generate_next_question without the prefetched questions."""
+        start = time.perf_counter()
+        mode = "single_call"
+        reply = self._generate_turn(previous_answer) if self.single_call_turns else None
+        if reply is None:
+            mode = "two_phase"
+            reply = self._generate_next_question_two_phase(previous_answer)
+        self._record_turn_latency(mode, time.perf_counter() - start)
+        return reply
+
+    def _question_context(self) -> str:
+        """Interviewer instructions, resume and conversation so far, shared by the turn prompts."""
+        system_prompt = """You are an experienced HR interviewer conducting a job interview.
+            Ask insightful, relevant questions based on the candidate's resume and previous answers.
+            Your questions should help evaluate the candidate's skills, experience, and fit for roles
+            matching their background. Be conversational but professional. Ask only ONE question at a time.
+            Don't repeat questions already asked. Vary between technical, behavioral, and situational questions."""
+
+        # Resume digest, summary of older turns and the most recent turns, within the token budget
+        return f"""{system_prompt}
+
+{self.context.render()}
+"""
+
+    @property
+    def last_reply(self) -> str:
+        """The interviewer's most recent entry in the conversation."""
+        for entry in reversed(self.conversation_history):
+            if entry["role"] == "interviewer":
+                return entry["content"]
+        return ""
+
+    def _add_to_history(self, role: str, content: str) -> None:
+        """Record a conversation entry in the full history and the prompt context window."""
+        self.conversation_history.append({
+            "role": role,
+            "content": content,
+            "timestamp": time.time()
+        })
+        self.context.add(role, content)
+
+    def _turn_instructions(self, previous_answer: str) -> str:
+        """Context plus the moderate-then-reply instructions used by the single-call turn prompts."""
+        return f"""{self._question_context()}
+
+The candidate's latest answer was:
+
+"{previous_answer}"
+
+First check that answer for:
+1. Factual errors or incorrect technical information
+2. Inappropriate language, profanity, or offensive content
+
+Then write your reply as the interviewer:
+- If the answer contains inappropriate language, respond in a stern, professional tone: express
+  clear disapproval, explain why such language is inappropriate in a professional setting and give
+  the candidate a chance to reformulate their answer. Keep it under 100 words.
+- Otherwise, if it contains factual errors, politely point out the inaccuracies, provide the
+  correct information and ask if they'd like to revise their answer. Be constructive and
+  educational rather than judgmental. Keep it under 100 words.
+- Otherwise, ask the next interview question: ONE clear, specific question that flows naturally
+  from the conversation so far, under 100 words."""
+
+    def _generate_turn(self, previous_answer: str) -> Optional[str]:
+        """
+        Moderate the answer and write the reply in a single structured call.
+
+        Returns:
+            The reply text, or None if the call failed or the JSON was unusable
+        """
+        prompt = f"""{self._turn_instructions(previous_answer)}
+
+Return a JSON object with these fields:
+- "has_factual_errors": true/false
+- "factual_error_details": description of errors if any (empty string if none)
+- "has_inappropriate_language": true/false
+- "inappropriate_language_details": description of inappropriate content if any (empty string if none)
+- "response_type": "correction" or "question"
+- "response": your reply to the candidate
+
+Response format should be valid JSON only.
+"""
+        try:
+            response = get_llm_gateway(self.ai_client).generate(
+                prompt,
+                call_site="interview.turn",
+                generation_config={
+                    "temperature": 0.4,
+                    "response_mime_type": "application/json"
+                }
+            )
+            turn = json.loads(response.text)
+        except Exception as e:
+            print(f"Single-call turn failed, falling back to two-phase: {e}")
+            return None
+
+        reply = turn.get("response") if isinstance(turn, dict) else None
+        if not isinstance(reply, str) or not reply.strip():
+            print("Single-call turn returned no reply, falling back to two-phase")
+            return None
+
+        self.last_answer_analysis = {
+            key: turn.get(key) for key in ("has_factual_errors", "factual_error_details",
+                                           "has_inappropriate_language", "inappropriate_language_details",
+                                           "response_type")
+        }
+        return reply.strip()
+
+    def _record_turn_latency(self, mode: str, seconds: float, first_chunk: Optional[float] = None) -> None:
+        entry = {
+            "turn": self.current_question_index + 1,
+            "mode": mode,
+            "seconds": round(seconds, 3)
+        }
+        if first_chunk is not None:
+            entry["first_chunk_seconds"] = round(first_chunk, 3)
+        self.turn_metrics.append(entry)
+        first_chunk_note = f", first text after {first_chunk:.2f}s" if first_chunk is not None else ""
+        print(f"[Interview] Turn {self.current_question_index + 1} ({mode}) took {seconds:.2f}s{first_chunk_note}")
+
+    def get_turn_latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """Number of turns and average/max seconds per turn, by generation mode."""
+        summary: Dict[str, Dict[str, float]] = {}
+        for entry in self.turn_metrics:
+            stats = summary.setdefault(entry["mode"], {"turns": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stats["turns"] += 1
+            stats["total_seconds"] += entry["seconds"]
+            stats["max_seconds"] = max(stats["max_seconds"], entry["seconds"])
+        for stats in summary.values():
+            stats["avg_seconds"] = stats["total_seconds"] / stats["turns"]
+        return summary
+
+    def _generate_next_question_two_phase(self, previous_answer: str) -> str:
+        """Original turn path: an analysis call, then a correction or next-question call."""
         try:
             # First analyze the previous answer for factual errors and inappropriate language
             analysis_prompt = f"""
@@ -197,16 +531,16 @@ class Interview:
             Response format should be valid JSON only.
             """
 
-            # Initialize Gemini model
-            model = self.ai_client.GenerativeModel('gemini-1.5-flash')
+            gateway = get_llm_gateway(self.ai_client)
             generation_config = {
                 "temperature": 0.1,
                 "response_mime_type": "application/json"
             }
 
             # Analyze the answer
-            analysis_response = model.generate_content(
+            analysis_response = gateway.generate(
                 analysis_prompt,
+                call_site="interview.answer_analysis",
                 generation_config=generation_config
             )
 
@@ -222,6 +556,8 @@ class Interview:
                     "inappropriate_language_details": ""
                 }
 
+            self.last_answer_analysis = analysis
+
             # If there are issues with the answer, address them instead of asking the next question
             if analysis.get("has_factual_errors") or analysis.get("has_inappropriate_language"):
                 correction_prompt = ""
@@ -262,32 +598,12 @@ class Interview:
                     """
 
                 if correction_prompt:
-                    correction_response = model.generate_content(
-                        correction_prompt)
+                    correction_response = gateway.generate(
+                        correction_prompt, call_site="interview.correction")
                     return correction_response.text
 
             # Create a prompt with conversation history for the next question
-            system_prompt = """You are an experienced HR interviewer conducting a job interview.
-            Ask insightful, relevant questions based on the candidate's resume and previous answers.
-            Your questions should help evaluate the candidate's skills, experience, and fit for roles
-            matching their background. Be conversational but professional. Ask only ONE question at a time.
-            Don't repeat questions already asked. Vary between technical, behavioral, and situational questions."""
-
-            # Add resume context
-            resume_context = f"Here is the candidate's resume information: {json.dumps(self.resume_data, indent=2)}\n\n"
-
-            # Add conversation history
-            conversation = "Here's our conversation so far:\n\n"
-            for entry in self.conversation_history:
-                role = entry["role"].capitalize()
-                conversation += f"{role}: {entry['content']}\n\n"
-
-            # Combine all the context
-            prompt = f"""{system_prompt}
-
-{resume_context}
-
-{conversation}
+            prompt = f"""{self._question_context()}
 
 Based on the resume and our conversation so far, generate the next interview question.
 Ask only ONE clear, specific question. Ensure it flows naturally from the previous conversation.
@@ -295,7 +611,7 @@ Keep your question under 100 words.
 """
 
             # Generate next question
-            response = model.generate_content(prompt)
+            response = gateway.generate(prompt, call_site="interview.next_question")
 
             return response.text
 
@@ -318,11 +634,9 @@ Keep your question under 100 words.
             Keep it warm, professional, and under 100 words.
             """
 
-            # Initialize Gemini model
-            model = self.ai_client.GenerativeModel('gemini-1.5-flash')
-
             # Generate closing statement
-            response = model.generate_content(prompt)
+            response = get_llm_gateway(self.ai_client).generate(
+                prompt, call_site="interview.closing")
 
             return response.text
 
@@ -333,14 +647,92 @@ Keep your question under 100 words.
             return f"Thank {candidate_name_fallback} for taking the time to interview with us today. We appreciate your thoughtful responses and sharing your experience. Our team will review the interview and be in touch regarding next steps. Have a great day!"
 
     def _save_conversation(self) -> None:
-        """Save the conversation history to a JSON file."""
-        try:
-            save_json_file(
-                {"conversation": self.conversation_history},
-                os.path.join(self.session_dir, "conversation.json")
-            )
-        except Exception as e:
-            print(f"Error saving conversation: {e}")
+        """Append the entries and turn metrics added since the last save to the conversation log."""
+        with self._log_lock:
+            turns = self.conversation_history[self._logged_turns:]
+            metrics = self.turn_metrics[self._logged_metrics:]
+            records = [dict(entry, type="turn", seq=seq)
+                       for seq, entry in enumerate(turns, start=self._logged_turns)]
+            records.extend(dict(metric, type="metric") for metric in metrics)
+            if append_jsonl(records, self.log_path, fsync=CONVERSATION_LOG_FSYNC):
+                self._logged_turns += len(turns)
+                self._logged_metrics += len(metrics)
+
+    def iter_conversation(self) -> Iterator[Dict]:
+        """Stream the logged conversation entries in order, skipping duplicates left by a crash."""
+        next_seq = 0
+        for record in iter_jsonl(self.log_path):
+            if record.get("type") != "turn" or record.get("seq", next_seq) < next_seq:
+                continue
+            next_seq = record.get("seq", next_seq) + 1
+            yield {"role": record["role"], "content": record["content"], "timestamp": record.get("timestamp")}
+
+    def _compact_conversation(self) -> None:
+        """
+        Rewrite the log once the interview is over: entries in order without
+        duplicates or torn lines, then the turn metrics, then an end record.
+        """
+        def records():
+            for seq, entry in enumerate(self.iter_conversation()):
+                yield dict(entry, type="turn", seq=seq)
+            for record in iter_jsonl(self.log_path):
+                if record.get("type") == "metric":
+                    yield record
+            yield {
+                "type": "end",
+                "start_time": self.interview_start_time,
+                "end_time": self.interview_end_time,
+                "questions": self.current_question_index
+            }
+
+        with self._log_lock:
+            write_jsonl_atomic(records(), self.log_path)
+
+    def _save_conversation_async(self) -> None:
+        """Save the conversation on a single background worker, so writes stay in order."""
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="interview-io")
+        self._io_executor.submit(self._save_conversation)
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Serialize the interview for a session store.
+
+        Only what later turns need is kept: the resume digest (inside the
+        context state) and the candidate's name instead of the parsed resume,
+        the turn list, counters and timings.
+        """
+        return {
+            "session_id": self.session_id,
+            "resume": {key: self.resume_data[key] for key in ("name", "Name") if key in self.resume_data},
+            "introduction": self.introduction,
+            "current_question_index": self.current_question_index,
+            "interview_start_time": self.interview_start_time,
+            "interview_end_time": self.interview_end_time,
+            "last_answer_analysis": self.last_answer_analysis,
+            "turn_metrics": self.turn_metrics,
+            "context": self.context.to_state(),
+            "turns": self.conversation_history
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], ai_client, tts_service) -> "Interview":
+        """Rebuild an interview saved with to_state()."""
+        interview = cls(ai_client, tts_service, resume_data=state.get("resume"),
+                        session_id=state.get("session_id"))
+        interview.introduction = state.get("introduction", "")
+        interview.current_question_index = state.get("current_question_index", 0)
+        interview.interview_start_time = state.get("interview_start_time")
+        interview.interview_end_time = state.get("interview_end_time")
+        interview.last_answer_analysis = state.get("last_answer_analysis") or {}
+        interview.turn_metrics = list(state.get("turn_metrics", []))
+        interview.conversation_history = list(state.get("turns", []))
+        interview.context = InterviewContext.from_state(
+            state.get("context", {}), interview.conversation_history, ai_client)
+        # Restored entries were logged by the worker that added them
+        interview._logged_turns = len(interview.conversation_history)
+        interview._logged_metrics = len(interview.turn_metrics)
+        return interview
 
     def load_answer_from_file(self, file_path: str) -> str:
         """Load the candidate's answer from a text file."""
@@ -0,0 +1,266 @@
+"""
+Interview context window
+
+Builds the resume-and-conversation context sent with every interview turn
+without letting it grow with the length of the interview:
+- a compact resume digest, computed once per interview
+- the last K conversation entries verbatim
+- a rolling summary of everything older, updated incrementally in the
+  background as entries leave the window (on a small thread pool shared by
+  all interviews, with at most one update running per interview)
+all kept under a configurable token budget. The estimated prompt size is
+logged every time the context is rendered.
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .llm_gateway import estimate_tokens, get_llm_gateway
+
+# Conversation entries (questions and answers) kept verbatim
+CONTEXT_RECENT_ENTRIES = int(os.environ.get('INTERVIEW_CONTEXT_ENTRIES', 6))
+
+# Approximate token budget for digest + summary + recent entries
+CONTEXT_TOKEN_BUDGET = int(os.environ.get('INTERVIEW_CONTEXT_TOKENS', 1500))
+
+# Share of the budget the resume digest may use
+DIGEST_BUDGET_SHARE = 0.4
+
+# Entries that always stay verbatim, whatever the budget
+MIN_RECENT_ENTRIES = 2
+
+# Length of each entry in the extractive fallback summary
+FALLBACK_ENTRY_CHARS = 160
+
+# Threads updating summaries, shared by every interview in the process
+SUMMARY_WORKERS = int(os.environ.get('INTERVIEW_SUMMARY_WORKERS', 2))
+
+_summary_executor = ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="interview-summary")
+
+
+def _first(data: Dict, *keys: str, default: Any = None) -> Any:
+    """Return the first present, non-empty value among keys (resume JSON casing varies)."""
+    for key in keys:
+        value = data.get(key)
+        if value:
+            return value
+    return default
+
+
+def _truncate_to_tokens(text: str, tokens: int, keep_end: bool = False) -> str:
+    max_chars = tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return "..." + text[-max_chars:] if keep_end else text[:max_chars] + "..."
+
+
+def build_resume_digest(resume_data: Dict, max_tokens: int) -> str:
+    """Summarize the parsed resume into a few compact lines."""
+    if not resume_data:
+        return "No resume information available."
+
+    lines = []
+    name = _first(resume_data, 'name', 'Name')
+    if name:
+        lines.append(f"Name: {name}")
+
+    skills = _first(resume_data, 'skills', 'Skills', default=[])
+    if isinstance(skills, list):
+        skills = ", ".join(str(s) for s in skills[:20])
+    if skills:
+        lines.append(f"Skills: {skills}")
+
+    experience = _first(resume_data, 'experience', 'Experience', default=[])
+    if isinstance(experience, list):
+        roles = []
+        for job in experience[:5]:
+            if isinstance(job, dict):
+                title = _first(job, 'title', 'Title', 'position', default='')
+                company = _first(job, 'company', 'Company', default='')
+                period = _first(job, 'period', 'Period', 'dates', default='')
+                roles.append(" ".join(part for part in (title, f"at {company}" if company else "",
+                                                        f"({period})" if period else "") if part))
+            else:
+                roles.append(str(job))
+        experience = "; ".join(r for r in roles if r)
+    if experience:
+        lines.append(f"Experience: {experience}")
+
+    education = _first(resume_data, 'education', 'Education', default=[])
+    if isinstance(education, list):
+        degrees = []
+        for entry in education[:3]:
+            if isinstance(entry, dict):
+                degrees.append(" ".join(str(v) for v in (
+                    _first(entry, 'degree', 'Degree', default=''),
+                    _first(entry, 'field', 'Field', default=''),
+                    _first(entry, 'institution', 'Institution', default='')) if v))
+            else:
+                degrees.append(str(entry))
+        education = "; ".join(d for d in degrees if d)
+    if education:
+        lines.append(f"Education: {education}")
+
+    projects = _first(resume_data, 'projects', 'Projects', default=[])
+    if isinstance(projects, list):
+        projects = ", ".join(str(_first(p, 'name', 'Name', default='')) if isinstance(p, dict) else str(p)
+                             for p in projects[:5])
+    if projects:
+        lines.append(f"Projects: {projects}")
+
+    certifications = _first(resume_data, 'certifications', 'Certifications', default=[])
+    if isinstance(certifications, list):
+        certifications = ", ".join(str(c) for c in certifications[:5])
+    if certifications:
+        lines.append(f"Certifications: {certifications}")
+
+    digest = "\n".join(lines) or "No resume information available."
+    return _truncate_to_tokens(digest, max_tokens)
+
+
+class InterviewContext:
+    """Token-bounded resume + conversation context for one interview."""
+
+    def __init__(self, resume_data: Optional[Dict] = None, ai_client=None,
+                 recent_entries: int = CONTEXT_RECENT_ENTRIES, token_budget: int = CONTEXT_TOKEN_BUDGET):
+        self.ai_client = ai_client
+        self.recent_entries = max(MIN_RECENT_ENTRIES, recent_entries)
+        self.token_budget = token_budget
+
+        self.resume_digest = build_resume_digest(resume_data or {}, int(token_budget * DIGEST_BUDGET_SHARE))
+        self._digest_tokens = estimate_tokens(self.resume_digest)
+
+        # Each entry is formatted once: (line, estimated tokens)
+        self._recent = deque()
+        self._recent_tokens = 0
+
+        # Older entries are folded into the summary on a background thread;
+        # until that finishes they are shown in a short extractive form
+        self.summary = ""
+        self._pending: List[str] = []
+        self._summarized_entries = 0
+        self._folding = False
+        self._lock = threading.Lock()
+
+    def add(self, role: str, content: str) -> None:
+        """Append a conversation entry, evicting the oldest ones past the window or budget."""
+        line = f"{role.capitalize()}: {content}"
+        tokens = estimate_tokens(line)
+        evicted = []
+        with self._lock:
+            self._recent.append((line, tokens))
+            self._recent_tokens += tokens
+
+            recent_budget = self.token_budget - self._digest_tokens - self._summary_tokens()
+            while len(self._recent) > MIN_RECENT_ENTRIES and (
+                    len(self._recent) > self.recent_entries or self._recent_tokens > recent_budget):
+                old_line, old_tokens = self._recent.popleft()
+                self._recent_tokens -= old_tokens
+                evicted.append(old_line)
+            self._pending.extend(evicted)
+            # A running update picks up the new entries before it finishes
+            schedule = bool(evicted) and not self._folding
+            self._folding = self._folding or schedule
+
+        if schedule:
+            _summary_executor.submit(self._fold_pending)
+
+    def _summary_tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(
+            estimate_tokens(line[:FALLBACK_ENTRY_CHARS]) for line in self._pending)
+
+    def _fold_pending(self) -> None:
+        """Merge evicted entries into the rolling summary until none are left. Runs on the summary pool."""
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+                previous = self.summary
+                if not pending:
+                    self._folding = False
+                    return
+            self._fold(pending, previous)
+
+    def _fold(self, pending: List[str], previous: str) -> None:
+        summary_budget = max(100, int(self.token_budget * (1 - DIGEST_BUDGET_SHARE) / 2))
+        prompt = f"""You are keeping notes during a job interview.
+Update the running summary with the new exchanges below. Keep what the candidate said about
+their skills, experience and any concerns raised, and which topics have already been covered
+so they are not asked again. Write plain sentences, under {summary_budget * 3 // 4} words.
+
+Current summary:
+{previous or "(none yet)"}
+
+New exchanges:
+{chr(10).join(pending)}
+
+Updated summary:"""
+        try:
+            summary = get_llm_gateway(self.ai_client).generate(
+                prompt, call_site="interview.context_summary").text.strip()
+        except Exception as e:
+            print(f"[InterviewContext] Summary update failed, using extractive summary: {e}")
+            summary = " ".join(filter(None, [previous] + [self._brief(line) for line in pending]))
+
+        with self._lock:
+            self.summary = _truncate_to_tokens(summary, summary_budget, keep_end=True)
+            del self._pending[:len(pending)]
+            self._summarized_entries += len(pending)
+
+    @staticmethod
+    def _brief(line: str) -> str:
+        return line if len(line) <= FALLBACK_ENTRY_CHARS else line[:FALLBACK_ENTRY_CHARS] + "..."
+
+    def render(self) -> str:
+        """Return the context block for the next prompt and log its estimated size."""
+        with self._lock:
+            summary_parts = [self.summary] if self.summary else []
+            summary_parts.extend(self._brief(line) for line in self._pending)
+            recent = [line for line, _ in self._recent]
+            earlier = len(self._pending) + self._summarized_entries
+
+        sections = [f"Here is a digest of the candidate's resume:\n{self.resume_digest}"]
+        if summary_parts:
+            sections.append(f"Summary of the earlier part of the interview ({earlier} messages):\n"
+                            + "\n".join(summary_parts))
+        sections.append("Here's our most recent conversation:\n\n" + "\n\n".join(recent))
+        context = "\n\n".join(sections)
+
+        print(f"[InterviewContext] ~{estimate_tokens(context)} tokens "
+              f"(digest {self._digest_tokens}, summary {estimate_tokens(' '.join(summary_parts))}, "
+              f"{len(recent)} recent messages, budget {self.token_budget})")
+        return context
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Compact serializable state. Recent entries are not stored: they are the
+        tail of the interview's conversation history and are rebuilt from it.
+        """
+        with self._lock:
+            return {
+                "resume_digest": self.resume_digest,
+                "summary": self.summary,
+                "pending": list(self._pending),
+                "summarized_entries": self._summarized_entries,
+                "recent_count": len(self._recent)
+            }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], history: List[Dict], ai_client=None) -> "InterviewContext":
+        """Restore a context saved with to_state(), given the full conversation history."""
+        context = cls(None, ai_client)
+        context.resume_digest = state.get("resume_digest", context.resume_digest)
+        context._digest_tokens = estimate_tokens(context.resume_digest)
+        context.summary = state.get("summary", "")
+        context._pending = list(state.get("pending", []))
+        context._summarized_entries = state.get("summarized_entries", 0)
+
+        recent_count = state.get("recent_count", 0)
+        for entry in history[len(history) - recent_count:] if recent_count else []:
+            line = f"{entry['role'].capitalize()}: {entry['content']}"
+            tokens = estimate_tokens(line)
+            context._recent.append((line, tokens))
+            context._recent_tokens += tokens
+        return context
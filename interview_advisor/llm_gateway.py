@@ -0,0 +1,438 @@
+"""
+LLM gateway
+
+Every Gemini call in the app goes through one gateway, which:
+- reuses GenerativeModel handles instead of building one per call
+- caches responses by a hash of (model, prompt, generation settings) with an
+  LRU bound and a TTL
+- caps concurrent requests with a global semaphore
+- applies a per-call timeout and retries transient failures with backoff
+- records latency, cache hits, errors and token counts per call site
+- streams responses chunk by chunk (generate_stream), tracking time to first
+  token
+
+Set LLM_BACKEND=fake to run against FakeBackend, which answers locally and
+deterministically so the app and the interview flow can be exercised offline.
+"""
+
+import os
+import json
+import time
+import queue
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_MODEL = 'gemini-1.5-flash'
+
+LLM_BACKEND = os.environ.get('LLM_BACKEND', 'gemini').lower()
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', 4))
+LLM_TIMEOUT = float(os.environ.get('LLM_TIMEOUT', 30))
+LLM_RETRIES = int(os.environ.get('LLM_RETRIES', 2))
+LLM_RETRY_BACKOFF = float(os.environ.get('LLM_RETRY_BACKOFF', 0.5))
+LLM_CACHE_SIZE = int(os.environ.get('LLM_CACHE_SIZE', 256))
+LLM_CACHE_TTL = float(os.environ.get('LLM_CACHE_TTL', 600))
+
+
+class LLMError(Exception):
+    """Raised when a call fails after all retries (or cannot be retried)."""
+
+
+class LLMResponse:
+    """Result of a gateway call. Exposes .text like a Gemini response."""
+
+    def __init__(self, text: str, prompt_tokens: int = 0, completion_tokens: int = 0,
+                 latency: float = 0.0, cached: bool = False):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.latency = latency
+        self.cached = cached
+
+    def __repr__(self) -> str:
+        return (f"LLMResponse(cached={self.cached}, latency={self.latency:.3f}s, "
+                f"tokens={self.prompt_tokens}+{self.completion_tokens}, text={self.text[:60]!r})")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for backends without usage data."""
+    return max(1, len(text) // 4) if text else 0
+
+
+class GeminiBackend:
+    """Calls Gemini through the google.generativeai client module."""
+
+    def __init__(self, client):
+        self.client = client
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _model(self, model_name: str):
+        with self._lock:
+            model = self._models.get(model_name)
+            if model is None:
+                model = self.client.GenerativeModel(model_name)
+                self._models[model_name] = model
+            return model
+
+    def generate(self, model_name: str, prompt: str, **kwargs) -> Tuple[str, int, int]:
+        """Return (text, prompt tokens, completion tokens)."""
+        response = self._model(model_name).generate_content(prompt, **kwargs)
+        # .text raises ValueError when the response was blocked; let it propagate
+        text = response.text
+
+        usage = getattr(response, 'usage_metadata', None)
+        prompt_tokens = getattr(usage, 'prompt_token_count', 0) or estimate_tokens(prompt)
+        completion_tokens = getattr(usage, 'candidates_token_count', 0) or estimate_tokens(text)
+        return text, prompt_tokens, completion_tokens
+
+    def generate_stream(self, model_name: str, prompt: str, **kwargs) -> Iterator[str]:
+        """Yield response text chunks as Gemini produces them."""
+        response = self._model(model_name).generate_content(prompt, stream=True, **kwargs)
+        for chunk in response:
+            text = chunk.text
+            if text:
+                yield text
+
+
+class FakeBackend:
+    """
+    Offline backend. Returns a canned reply derived from the prompt, or whatever
+    a responder callable returns, after an optional artificial delay.
+    """
+
+    def __init__(self, responder: Optional[Callable[[str, Dict], str]] = None, delay: float = 0.0):
+        self.responder = responder
+        self.delay = delay
+        self.calls = 0
+
+    def generate(self, model_name: str, prompt: str, **kwargs) -> Tuple[str, int, int]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+
+        if self.responder:
+            text = self.responder(prompt, kwargs)
+        elif (kwargs.get('generation_config') or {}).get('response_mime_type') == 'application/json':
+            text = json.dumps({})
+        else:
+            digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:8]
+            text = f"[fake:{digest}] Could you tell me more about that?"
+        return text, estimate_tokens(prompt), estimate_tokens(text)
+
+    def generate_stream(self, model_name: str, prompt: str, **kwargs) -> Iterator[str]:
+        """Yield the canned reply a few words at a time."""
+        text, _, _ = self.generate(model_name, prompt, **kwargs)
+        words = text.split(' ')
+        for i in range(0, len(words), 3):
+            if i and self.delay:
+                time.sleep(self.delay / 4)
+            yield ' '.join(words[i:i + 3]) + (' ' if i + 3 < len(words) else '')
+
+
+class LLMGateway:
+    """Shared entry point for all LLM calls."""
+
+    def __init__(self, backend, cache_size: int = LLM_CACHE_SIZE, cache_ttl: float = LLM_CACHE_TTL,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY, timeout: float = LLM_TIMEOUT,
+                 retries: int = LLM_RETRIES, retry_backoff: float = LLM_RETRY_BACKOFF):
+        self.backend = backend
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+
+        # A slot is held from submission until the backend call actually returns,
+        # so calls abandoned at the timeout still count against the limit
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        # Calls run on these threads so a hung request can be abandoned at the timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='llm')
+
+        self._cache: "OrderedDict[str, Tuple[float, LLMResponse]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self._metrics: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+            'calls': 0, 'cache_hits': 0, 'errors': 0, 'retries': 0,
+            'latency_total': 0.0, 'latency_max': 0.0,
+            'prompt_tokens': 0, 'completion_tokens': 0,
+            'streams': 0, 'first_token_total': 0.0
+        })
+        self._metrics_lock = threading.Lock()
+
+    def generate(self, prompt: str, call_site: str = 'unknown', model: str = DEFAULT_MODEL,
+                 cache: bool = True, timeout: Optional[float] = None, **kwargs) -> LLMResponse:
+        """
+        Generate a completion.
+
+        Args:
+            prompt: Prompt text
+            call_site: Name used to group metrics (e.g. "interview.next_question")
+            model: Model name
+            cache: Whether an identical earlier response may be reused
+            timeout: Per-attempt timeout in seconds (defaults to LLM_TIMEOUT)
+            **kwargs: Passed to the backend (generation_config, safety_settings)
+
+        Raises:
+            LLMError: If every attempt failed
+        """
+        start = time.perf_counter()
+        key = self._cache_key(model, prompt, kwargs) if cache else None
+
+        if key:
+            cached = self._cache_get(key)
+            if cached is not None:
+                response = LLMResponse(cached.text, cached.prompt_tokens, cached.completion_tokens,
+                                       time.perf_counter() - start, cached=True)
+                self._record(call_site, response)
+                return response
+
+        timeout = timeout or self.timeout
+        text, prompt_tokens, completion_tokens = None, 0, 0
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._record_retry(call_site)
+                time.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+            try:
+                future = self._submit(timeout, self.backend.generate, model, prompt, **kwargs)
+                text, prompt_tokens, completion_tokens = future.result(timeout=timeout)
+                break
+            except FutureTimeoutError:
+                last_error = LLMError(f"{call_site}: no response within {timeout:g}s")
+            except ValueError as e:
+                # Blocked or empty responses will not change on retry
+                last_error = e
+                break
+            except Exception as e:
+                last_error = e
+
+        if text is None:
+            self._record_error(call_site, time.perf_counter() - start)
+            print(f"[LLM] {call_site} failed: {last_error}")
+            raise LLMError(str(last_error)) from last_error
+
+        response = LLMResponse(text, prompt_tokens, completion_tokens, time.perf_counter() - start)
+        if key:
+            self._cache_put(key, response)
+        self._record(call_site, response)
+        return response
+
+    def generate_stream(self, prompt: str, call_site: str = 'unknown', model: str = DEFAULT_MODEL,
+                        cache: bool = True, timeout: Optional[float] = None, **kwargs) -> Iterator[str]:
+        """
+        Generate a completion, yielding text chunks as they arrive.
+
+        Same caching, concurrency limit and metrics as generate(). The timeout
+        applies to the wait for each chunk, and a failed attempt is only
+        retried if it failed before the first chunk was yielded.
+
+        Raises:
+            LLMError: If the stream could not be completed
+        """
+        start = time.perf_counter()
+        key = self._cache_key(model, prompt, kwargs) if cache else None
+
+        if key:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._record(call_site, LLMResponse(cached.text, cached.prompt_tokens, cached.completion_tokens,
+                                                    time.perf_counter() - start, cached=True))
+                yield cached.text
+                return
+
+        timeout = timeout or self.timeout
+        chunks = []
+        first_token = None
+        attempt = 0
+        while True:
+            error = None
+            cancelled = threading.Event()
+            chunk_queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+            try:
+                # The slot is held by the pump only: a slow consumer reading
+                # from the queue does not keep other calls waiting
+                self._submit(timeout, self._pump_stream, model, prompt, kwargs, chunk_queue, cancelled)
+                while True:
+                    kind, value = chunk_queue.get(timeout=timeout)
+                    if kind == 'error':
+                        raise value
+                    if kind == 'end':
+                        break
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+                    chunks.append(value)
+                    yield value
+            except (queue.Empty, FutureTimeoutError):
+                error = LLMError(f"{call_site}: no data within {timeout:g}s")
+            except Exception as e:
+                error = e
+            finally:
+                # Also reached when the consumer stops iterating early
+                cancelled.set()
+
+            if error is None:
+                break
+            if chunks or isinstance(error, ValueError) or attempt >= self.retries:
+                self._record_error(call_site, time.perf_counter() - start)
+                print(f"[LLM] {call_site} stream failed: {error}")
+                raise LLMError(str(error)) from error
+            attempt += 1
+            self._record_retry(call_site)
+            time.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+
+        text = ''.join(chunks)
+        response = LLMResponse(text, estimate_tokens(prompt), estimate_tokens(text), time.perf_counter() - start)
+        if key and text:
+            self._cache_put(key, response)
+        self._record(call_site, response, first_token=first_token or response.latency)
+
+    def _submit(self, timeout: float, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Run fn on the executor once a concurrency slot is free; the slot is
+        released when fn returns, not when the caller stops waiting for it.
+
+        Raises:
+            FutureTimeoutError: If no slot became free within timeout
+        """
+        if not self._semaphore.acquire(timeout=timeout):
+            raise FutureTimeoutError()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._semaphore.release())
+        return future
+
+    def _pump_stream(self, model: str, prompt: str, kwargs: Dict,
+                     chunk_queue: "queue.Queue", cancelled: threading.Event) -> None:
+        """Move chunks from the backend stream onto a queue. Runs on the executor."""
+        try:
+            for chunk in self.backend.generate_stream(model, prompt, **kwargs):
+                if cancelled.is_set():
+                    return
+                chunk_queue.put(('chunk', chunk))
+            chunk_queue.put(('end', None))
+        except Exception as e:
+            chunk_queue.put(('error', e))
+
+    @staticmethod
+    def _cache_key(model: str, prompt: str, kwargs: Dict) -> str:
+        settings = json.dumps(kwargs, sort_keys=True, default=str)
+        return hashlib.sha256(f"{model}\0{settings}\0{prompt}".encode('utf-8')).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[LLMResponse]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, response = entry
+            if time.time() - stored_at > self.cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return response
+
+    def _cache_put(self, key: str, response: LLMResponse) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = (time.time(), response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _record(self, call_site: str, response: LLMResponse, first_token: Optional[float] = None) -> None:
+        with self._metrics_lock:
+            stats = self._metrics[call_site]
+            stats['calls'] += 1
+            if first_token is not None:
+                stats['streams'] += 1
+                stats['first_token_total'] += first_token
+            stats['latency_total'] += response.latency
+            stats['latency_max'] = max(stats['latency_max'], response.latency)
+            if response.cached:
+                stats['cache_hits'] += 1
+            else:
+                stats['prompt_tokens'] += response.prompt_tokens
+                stats['completion_tokens'] += response.completion_tokens
+
+    def _record_retry(self, call_site: str) -> None:
+        with self._metrics_lock:
+            self._metrics[call_site]['retries'] += 1
+
+    def _record_error(self, call_site: str, latency: float) -> None:
+        with self._metrics_lock:
+            stats = self._metrics[call_site]
+            stats['calls'] += 1
+            stats['errors'] += 1
+            stats['latency_total'] += latency
+            stats['latency_max'] = max(stats['latency_max'], latency)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-call-site counters, with average latency in seconds."""
+        with self._metrics_lock:
+            snapshot = {site: dict(stats) for site, stats in self._metrics.items()}
+        for stats in snapshot.values():
+            stats['latency_avg'] = stats['latency_total'] / stats['calls'] if stats['calls'] else 0.0
+            stats['first_token_avg'] = stats['first_token_total'] / stats['streams'] if stats['streams'] else 0.0
+        return snapshot
+
+
+_gateways: Dict[int, LLMGateway] = {}
+_gateways_lock = threading.Lock()
+
+
+def get_llm_gateway(ai_client=None) -> LLMGateway:
+    """
+    Return the shared gateway for an AI client module.
+
+    With LLM_BACKEND=fake every caller shares one FakeBackend gateway,
+    whatever client it was given.
+    """
+    key = 0 if LLM_BACKEND == 'fake' else id(ai_client)
+    with _gateways_lock:
+        gateway = _gateways.get(key)
+        if gateway is None:
+            if LLM_BACKEND == 'fake':
+                backend = FakeBackend()
+            elif ai_client is None:
+                raise LLMError("No AI client configured")
+            else:
+                backend = GeminiBackend(ai_client)
+            gateway = LLMGateway(backend)
+            _gateways[key] = gateway
+        return gateway
+
+
+def get_llm_metrics() -> Dict[str, Dict[str, float]]:
+    """Merged per-call-site metrics across all gateways."""
+    with _gateways_lock:
+        gateways = list(_gateways.values())
+    merged: Dict[str, Dict[str, float]] = {}
+    for gateway in gateways:
+        for site, stats in gateway.metrics().items():
+            if site not in merged:
+                merged[site] = stats
+                continue
+            target = merged[site]
+            for name, value in stats.items():
+                if name == 'latency_max':
+                    target[name] = max(target[name], value)
+                elif name not in ('latency_avg', 'first_token_avg'):
+                    target[name] += value
+            target['latency_avg'] = target['latency_total'] / target['calls'] if target['calls'] else 0.0
+            target['first_token_avg'] = target['first_token_total'] / target['streams'] if target['streams'] else 0.0
+    return merged
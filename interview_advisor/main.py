@@ -3,6 +3,7 @@ from .utils import validate_api_keys, ensure_directory, read_text_file, Database
 from .recommendation import RecommendationEngine
 from .interview import Interview
 from .resume_processor import ResumeProcessor
+from .llm_gateway import get_llm_gateway
 import os
 import sys
 import time
@@ -307,7 +308,7 @@ class InterviewAdvisor:
                     # Analyze speech fluency if possible
                     try:
                         fluency_analysis = self.speech_input.analyze_fluency(
-                            answer_path)
+                            answer_path, transcription)
 
                         if fluency_analysis and self.db_manager and self.current_session_id:
                             self.db_manager.save_audio_metrics(
@@ -373,7 +374,7 @@ class InterviewAdvisor:
         print("\nGenerating recommendations...")
         recommendations = self.recommendation_engine.generate_recommendations(
             self.resume_data,
-            self.interview.conversation_history,
+            self.interview.iter_conversation(),
             self.interview.session_dir
         )
 
@@ -535,11 +536,8 @@ class InterviewAdvisor:
             Keep the analysis brief and actionable. Focus on the most impactful aspects.
             """
 
-            # Initialize Gemini model
-            model = self.ai_client.GenerativeModel('gemini-1.5-flash')
-
             # Generate analysis
-            response = model.generate_content(prompt)
+            response = get_llm_gateway(self.ai_client).generate(prompt, call_site="main.resume_analysis")
 
             # Display the analysis
             print("\n=== RESUME ANALYSIS REPORT ===\n")
@@ -0,0 +1,135 @@
+"""
+PDF text extraction engine
+
+Single-pass PDF text extraction shared by the career guidance functions and the
+ResumeProcessor. Text layers are read with PyMuPDF; pages that have no usable
+text layer (scanned / image-only pages) are rendered and OCR'd with Tesseract,
+and only those pages are sent to a thread pool. Rendering stays on the calling
+thread (PyMuPDF is not thread-safe); tesseract runs as a separate process per
+page, so the threads only wait on it and the pages are OCR'd in parallel. No
+worker processes are forked from the (multithreaded) web server.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import pytesseract
+from PIL import Image
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+    print("WARNING: PyMuPDF not installed. PDF text extraction will be disabled.")
+
+# A page whose text layer is shorter than this is treated as image-only
+MIN_TEXT_CHARS = 20
+
+# Resolution used when rendering image-only pages for OCR
+OCR_DPI = 200
+
+# Upper bound on OCR workers; each worker also spawns a tesseract process
+MAX_OCR_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+
+def _render_page(doc, page_num: int, dpi: int) -> Image.Image:
+    """Render a page for OCR. PyMuPDF calls stay on the thread that opened doc."""
+    pix = doc.load_page(page_num).get_pixmap(dpi=dpi)
+    return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+
+def _ocr_image(page_num: int, image: Image.Image, render_seconds: float) -> Tuple[int, str, float]:
+    """OCR a rendered page. Runs on a pool thread while tesseract does the work."""
+    start = time.perf_counter()
+    try:
+        text = pytesseract.image_to_string(image)
+    except Exception as e:
+        print(f"Error running OCR on page {page_num + 1}: {e}")
+        text = ""
+    return page_num, text, render_seconds + time.perf_counter() - start
+
+
+def extract_pdf_text(pdf_path: str, ocr: bool = True, max_workers: Optional[int] = None) -> Dict:
+    """
+    Extract text from a PDF, OCR'ing only the pages that have no text layer.
+
+    Args:
+        pdf_path: Path to the PDF file
+        ocr: Whether image-only pages should be OCR'd
+        max_workers: Maximum number of parallel OCR workers
+
+    Returns:
+        Dict with the joined "text", per-page details under "pages" (page
+        number, character count, whether OCR was used and seconds spent) and
+        the total "seconds" taken.
+    """
+    start = time.perf_counter()
+    result = {"text": "", "pages": [], "seconds": 0.0}
+
+    if not PYMUPDF_AVAILABLE:
+        print("PyMuPDF is not available. Cannot process PDF.")
+        return result
+
+    page_texts: List[str] = []
+    pages: List[Dict] = []
+    image_only_pages: List[int] = []
+
+    try:
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                page_start = time.perf_counter()
+                text = page.get_text()
+                page_num = page.number
+
+                # Pages with no text layer but with embedded images are scans
+                needs_ocr = len(text.strip()) < MIN_TEXT_CHARS and bool(page.get_images())
+                if needs_ocr and ocr:
+                    image_only_pages.append(page_num)
+
+                page_texts.append(text)
+                pages.append({
+                    "page": page_num + 1,
+                    "chars": len(text),
+                    "ocr": False,
+                    "seconds": time.perf_counter() - page_start
+                })
+    except Exception as e:
+        print(f"Error extracting text from PDF {pdf_path}: {e}")
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+    if image_only_pages:
+        workers = min(len(image_only_pages), max_workers or MAX_OCR_WORKERS)
+        try:
+            with fitz.open(pdf_path) as doc, ThreadPoolExecutor(max_workers=workers,
+                                                               thread_name_prefix="pdf-ocr") as executor:
+                futures = []
+                for page_num in image_only_pages:
+                    # Render the next page while earlier ones are being OCR'd, keeping
+                    # at most two rendered pages per worker in memory
+                    if len(futures) >= 2 * workers:
+                        futures[-2 * workers].result()
+                    render_start = time.perf_counter()
+                    image = _render_page(doc, page_num, OCR_DPI)
+                    futures.append(executor.submit(_ocr_image, page_num, image,
+                                                   time.perf_counter() - render_start))
+                ocr_results = [future.result() for future in futures]
+        except Exception as e:
+            print(f"Error running OCR on {pdf_path}: {e}")
+            ocr_results = []
+
+        for page_num, text, seconds in ocr_results:
+            # Keep whatever text layer there was if OCR produced nothing better
+            if len(text.strip()) > len(page_texts[page_num].strip()):
+                page_texts[page_num] = text
+            pages[page_num]["chars"] = len(page_texts[page_num])
+            pages[page_num]["ocr"] = True
+            pages[page_num]["seconds"] += seconds
+
+    result["text"] = "".join(page_texts)
+    result["pages"] = pages
+    result["seconds"] = time.perf_counter() - start
+    return result
@@ -1,9 +1,10 @@
 import json
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 import time
 import os
 import re
 from .utils import save_json_file
+from .llm_gateway import get_llm_gateway
 
 
 class RecommendationEngine:
@@ -12,7 +13,7 @@ class RecommendationEngine:
         self.ai_client = ai_client
         self.tts_service = tts_service
 
-    def generate_recommendations(self, resume_data: Dict, conversation: List[Dict], session_dir: str) -> Dict:
+    def generate_recommendations(self, resume_data: Dict, conversation: Iterable[Dict], session_dir: str) -> Dict:
         """Generate recommendations based on the resume and interview conversation."""
         try:
             # Create a conversation transcript in a readable format
@@ -39,8 +40,8 @@ class RecommendationEngine:
             print(f"Error generating recommendations: {e}")
             return {"error": str(e)}
 
-    def _create_transcript(self, conversation: List[Dict]) -> str:
-        """Create a readable transcript from the conversation history."""
+    def _create_transcript(self, conversation: Iterable[Dict]) -> str:
+        """Create a readable transcript from the conversation history (a list or a streamed log)."""
         transcript = ""
 
         for entry in conversation:
@@ -88,9 +89,6 @@ class RecommendationEngine:
             {system_prompt}
             """
 
-            # Initialize Gemini model with a preference for structured output
-            model = self.ai_client.GenerativeModel('gemini-1.5-flash')
-
             # Configure the model for more structured output
             generation_config = {
                 "temperature": 0.2,
@@ -100,8 +98,9 @@ class RecommendationEngine:
             }
 
             # Generate recommendations
-            response = model.generate_content(
+            response = get_llm_gateway(self.ai_client).generate(
                 user_prompt,
+                call_site="recommendation.analyze_interview",
                 generation_config=generation_config
             )
 
@@ -212,11 +211,9 @@ class RecommendationEngine:
             {system_prompt}
             """
 
-            # Initialize Gemini model
-            model = self.ai_client.GenerativeModel('gemini-1.5-flash')
-
             # Generate summary
-            response = model.generate_content(user_prompt)
+            response = get_llm_gateway(self.ai_client).generate(
+                user_prompt, call_site="recommendation.summary")
 
             return response.text
 
@@ -6,23 +6,30 @@ import re
 import json
 from typing import Dict, List, Optional, Any
 from .utils import ensure_directory
-# Import PyPDF2
-try:
-    from PyPDF2 import PdfReader
-    PYPDF2_AVAILABLE = True
-except ImportError:
-    PYPDF2_AVAILABLE = False
-    print("WARNING: PyPDF2 not installed. PDF resume processing will be disabled.")
+from .pdf_extraction import extract_pdf_text
+from .document_context import get_document_context
+from .llm_gateway import get_llm_gateway
 
+# EasyOCR model shared by all ResumeProcessor instances, loaded on first use
+_easyocr_reader = None
+_easyocr_failed = False
 
-class ResumeProcessor:
-    def __init__(self, ai_client):
-        """Initialize the resume processor."""
+
+def _get_easyocr_reader():
+    """Load the EasyOCR English model once per process."""
+    global _easyocr_reader, _easyocr_failed
+    if _easyocr_reader is None and not _easyocr_failed:
         try:
-            self.reader = easyocr.Reader(['en'])  # Initialize EasyOCR for English
+            _easyocr_reader = easyocr.Reader(['en'])  # Initialize EasyOCR for English
         except Exception as e:
             print(f"Warning: Could not initialize EasyOCR: {e}. OCR functionality may be limited.")
-            self.reader = None
+            _easyocr_failed = True
+    return _easyocr_reader
+
+
+class ResumeProcessor:
+    def __init__(self, ai_client):
+        """Initialize the resume processor."""
         self.ai_client = ai_client
         self.extracted_text = ""
         self.structured_data = {}
@@ -30,6 +37,11 @@ class ResumeProcessor:
         # Create cache directory for processed resumes
         ensure_directory("cache/resumes")
 
+    @property
+    def reader(self):
+        """EasyOCR reader, only loaded when an image actually needs OCR."""
+        return _get_easyocr_reader()
+
     def extract_text_from_image(self, file_path: str) -> str:
         """Extract text from resume image using OCR."""
         if not self.reader:
@@ -64,20 +76,11 @@ class ResumeProcessor:
                  return ""
 
     def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from resume PDF using PyPDF2."""
-        if not PYPDF2_AVAILABLE:
-            print("PyPDF2 is not available. Cannot process PDF.")
-            return ""
-        try:
-            text = ""
-            with open(file_path, 'rb') as f:
-                reader = PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text() or ""
-            return text
-        except Exception as e:
-            print(f"Error extracting text from PDF {file_path}: {e}")
-            return ""
+        """Extract text from resume PDF, OCR'ing image-only pages."""
+        result = extract_pdf_text(file_path)
+        ocr_pages = sum(1 for page in result["pages"] if page["ocr"])
+        print(f"Extracted {len(result['pages'])} PDF pages ({ocr_pages} via OCR) in {result['seconds']:.2f}s")
+        return result["text"]
 
     def parse_resume_with_ai(self) -> Dict:
         """Extract structured data from resume text using AI."""
@@ -108,9 +111,6 @@ class ResumeProcessor:
             Return only the JSON without any explanation.
             """
 
-            # Initialize Gemini model
-            model = self.ai_client.GenerativeModel('gemini-1.5-flash')
-
             # Configure the model for JSON output
             generation_config = {
                 "temperature": 0.2,
@@ -120,8 +120,9 @@ class ResumeProcessor:
             }
 
             # Generate response
-            response = model.generate_content(
+            response = get_llm_gateway(self.ai_client).generate(
                 prompt,
+                call_site="resume.parse",
                 generation_config=generation_config
             )
 
@@ -152,30 +153,40 @@ class ResumeProcessor:
             print(f"Error parsing resume with AI: {e}")
             return {}
 
-    def process_resume(self, file_path: str) -> Dict:
-        """Process resume file (PDF or image) and return structured data."""
-        self.extracted_text = ""
-        self.structured_data = {}
+    def extract_text(self, file_path: str) -> str:
+        """Extract text from a resume file (PDF, image or plain text)."""
         file_ext = os.path.splitext(file_path)[1].lower()
 
-        print(f"Processing file: {file_path} with extension {file_ext}")
-
         if file_ext == '.pdf':
-            self.extracted_text = self.extract_text_from_pdf(file_path)
+            return self.extract_text_from_pdf(file_path)
         elif file_ext in ['.png', '.jpg', '.jpeg', '.bmp', '.tiff']:
-            self.extracted_text = self.extract_text_from_image(file_path)
+            return self.extract_text_from_image(file_path)
         else:
             print(f"Warning: Unsupported file type '{file_ext}'. Attempting to read as text.")
             try:
                  with open(file_path, 'r', encoding='utf-8') as f:
-                     self.extracted_text = f.read()
+                     return f.read()
             except Exception as e:
                  print(f"Could not read file as text: {e}")
-                 self.extracted_text = ""
+                 return ""
+
+    def process_resume(self, file_path: str) -> Dict:
+        """Process resume file (PDF or image) and return structured data.
+
+        Text extraction and AI parsing are shared through the document context,
+        so each version of a file is only extracted and parsed once.
+        """
+        self.extracted_text = ""
+        self.structured_data = {}
+        context = get_document_context(file_path)
+
+        print(f"Processing file: {file_path}")
+
+        self.extracted_text = context.get("text", lambda: self.extract_text(file_path))
 
         if self.extracted_text:
             print(f"Extracted text length: {len(self.extracted_text)}")
-            self.structured_data = self.parse_resume_with_ai()
+            self.structured_data = context.get("structured_data", self.parse_resume_with_ai)
             # Optionally save structured data
             # save_path = os.path.join("cache/resumes", os.path.basename(file_path) + ".json")
             # save_json_file(self.structured_data, save_path)
@@ -203,11 +214,8 @@ class ResumeProcessor:
             Keep it under 250 words.
             """
 
-            # Initialize Gemini model
-            model = self.ai_client.GenerativeModel('gemini-1.5-flash')
-
             # Generate summary
-            response = model.generate_content(prompt)
+            response = get_llm_gateway(self.ai_client).generate(prompt, call_site="resume.summary")
 
             return response.text
 
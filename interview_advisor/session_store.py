@@ -0,0 +1,252 @@
+"""
+Interview session store
+
+Keeps active interviews, keyed by user id, somewhere every web worker can
+reach. Two backends:
+- "memory": live Interview objects in this process (single worker only)
+- "sqlite": a local SQLite file shared by all workers on the host. Each
+  session is a small state row (resume digest, counters, context summary)
+  plus one row per conversation turn; saving a turn only writes the state
+  row and the turns added since the last save. A worker keeps the
+  Interview objects it has loaded and reuses them while the stored version
+  is unchanged, so a request only rebuilds an interview after another
+  worker has moved it on. At most SESSION_CACHE_SIZE of them are kept, and
+  ones unused for SESSION_CACHE_IDLE_SECONDS are dropped. A save based on
+  an older version than the stored one (another worker saved the session
+  in between) is rejected with StaleSessionError instead of overwriting it.
+
+Both backends are used like the dict they replace (`in`, `[]`, get, pop);
+callers additionally call save() after changing an interview.
+
+Selected with INTERVIEW_SESSION_STORE (memory or sqlite); the SQLite file is
+INTERVIEW_SESSION_DB.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+SESSION_STORE_BACKEND = os.environ.get('INTERVIEW_SESSION_STORE', 'memory')
+SESSION_DB_PATH = os.environ.get('INTERVIEW_SESSION_DB', 'cache/interview_sessions.sqlite')
+# Loaded Interview objects kept per worker by the SQLite store
+SESSION_CACHE_SIZE = int(os.environ.get('INTERVIEW_SESSION_CACHE_SIZE', 256))
+SESSION_CACHE_IDLE_SECONDS = int(os.environ.get('INTERVIEW_SESSION_CACHE_IDLE', 1800))
+
+
+class StaleSessionError(Exception):
+    """Raised when saving an interview that another worker has saved since it was loaded."""
+
+
+class SessionStore(ABC):
+    """Dict-like interface shared by the session store backends."""
+
+    @abstractmethod
+    def get(self, key: Any, default: Any = None):
+        """Return the interview stored under key, or default."""
+
+    @abstractmethod
+    def __setitem__(self, key: Any, interview) -> None:
+        """Store a new interview under key, replacing any previous one."""
+
+    @abstractmethod
+    def save(self, key: Any, interview) -> None:
+        """Persist changes made to an interview since it was stored or last saved."""
+
+    @abstractmethod
+    def pop(self, key: Any, default: Any = None):
+        """Remove and return the interview stored under key, or default."""
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: Any):
+        interview = self.get(key)
+        if interview is None:
+            raise KeyError(key)
+        return interview
+
+
+class MemorySessionStore(SessionStore):
+    """Interviews held in this process; save() is a no-op since the objects are live."""
+
+    def __init__(self):
+        self._interviews: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._interviews.get(str(key), default)
+
+    def __setitem__(self, key, interview):
+        with self._lock:
+            self._interviews[str(key)] = interview
+
+    def save(self, key, interview):
+        pass
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._interviews.pop(str(key), default)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Interviews stored in a SQLite file, written incrementally per turn."""
+
+    def __init__(self, path: str, loader: Callable[[Dict[str, Any]], Any],
+                 cache_size: int = SESSION_CACHE_SIZE, cache_idle: float = SESSION_CACHE_IDLE_SECONDS):
+        """
+        Args:
+            path: SQLite database file
+            loader: Builds an Interview from a saved state (Interview.from_state
+                bound to this app's AI client and TTS service)
+            cache_size: Most loaded interviews kept for reuse
+            cache_idle: Seconds after which an unused loaded interview is dropped
+        """
+        self.path = path
+        self.loader = loader
+        self.cache_size = cache_size
+        self.cache_idle = cache_idle
+        self._local = threading.local()
+        # key -> (interview, last used), least recently used first
+        self._loaded: "OrderedDict[str, tuple]" = OrderedDict()
+        # interview -> (stored version it is based on, turns already written);
+        # kept as long as the object is alive, even after it leaves _loaded
+        self._versions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS interview_sessions (
+                    key TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS interview_turns (
+                    key TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    turn TEXT NOT NULL,
+                    PRIMARY KEY (key, seq)
+                )""")
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets workers read while another writes."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key: str, interview, version: int, written: int) -> None:
+        """Cache interview as the loaded copy of key at version, evicting idle and surplus entries."""
+        now = time.monotonic()
+        with self._lock:
+            self._versions[interview] = (version, written)
+            self._loaded[key] = (interview, now)
+            self._loaded.move_to_end(key)
+            while self._loaded:
+                oldest_key, (_, last_used) = next(iter(self._loaded.items()))
+                if len(self._loaded) <= self.cache_size and now - last_used <= self.cache_idle:
+                    break
+                del self._loaded[oldest_key]
+
+    def get(self, key, default=None):
+        key = str(key)
+        conn = self._connect()
+        row = conn.execute("SELECT version, state FROM interview_sessions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            with self._lock:
+                self._loaded.pop(key, None)
+            return default
+
+        version, state_json = row
+        with self._lock:
+            loaded = self._loaded.get(key)
+            cached = loaded[0] if loaded else None
+            known = self._versions.get(cached) if cached is not None else None
+        if known and known[0] == version:
+            self._remember(key, cached, *known)
+            return cached
+
+        # Another worker saved this session since we last saw it (or we never had it)
+        state = json.loads(state_json)
+        state["turns"] = [json.loads(turn) for (turn,) in conn.execute(
+            "SELECT turn FROM interview_turns WHERE key = ? ORDER BY seq", (key,))]
+        interview = self.loader(state)
+        self._remember(key, interview, version, len(state["turns"]))
+        return interview
+
+    def __setitem__(self, key, interview):
+        key = str(key)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM interview_turns WHERE key = ?", (key,))
+            conn.execute("DELETE FROM interview_sessions WHERE key = ?", (key,))
+        self._remember(key, interview, 0, 0)
+        self.save(key, interview)
+
+    def save(self, key, interview):
+        """
+        Raises:
+            StaleSessionError: if the stored session is newer than the version
+                interview was loaded from, or interview did not come from this store
+        """
+        key = str(key)
+        state = interview.to_state()
+        turns = state.pop("turns")
+        with self._lock:
+            based_on = self._versions.get(interview)
+        if based_on is None:
+            raise StaleSessionError(f"Interview {key} was not loaded from this session store")
+        version, written = based_on
+
+        with self._connect() as conn:
+            if version == 0:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO interview_sessions (key, version, state, updated_at) "
+                    "VALUES (?, 1, ?, ?)", (key, json.dumps(state), time.time()))
+            else:
+                cursor = conn.execute(
+                    "UPDATE interview_sessions SET version = version + 1, state = ?, updated_at = ? "
+                    "WHERE key = ? AND version = ?", (json.dumps(state), time.time(), key, version))
+            if cursor.rowcount != 1:
+                # Another worker saved or removed the session; keep what it stored
+                raise StaleSessionError(f"Interview {key} changed since version {version} was loaded")
+            conn.executemany(
+                "INSERT OR REPLACE INTO interview_turns (key, seq, turn) VALUES (?, ?, ?)",
+                [(key, seq, json.dumps(turn)) for seq, turn in enumerate(turns[written:], start=written)])
+
+        self._remember(key, interview, version + 1, len(turns))
+
+    def pop(self, key, default=None):
+        interview = self.get(key)
+        key = str(key)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM interview_turns WHERE key = ?", (key,))
+            conn.execute("DELETE FROM interview_sessions WHERE key = ?", (key,))
+        with self._lock:
+            self._loaded.pop(key, None)
+        return interview if interview is not None else default
+
+
+def create_session_store(loader: Callable[[Dict[str, Any]], Any],
+                         backend: str = SESSION_STORE_BACKEND,
+                         path: str = SESSION_DB_PATH) -> SessionStore:
+    """Create the configured session store backend."""
+    if backend == 'sqlite':
+        print(f"[SessionStore] Using SQLite session store at {path}")
+        return SQLiteSessionStore(path, loader)
+    if backend != 'memory':
+        print(f"[SessionStore] Unknown backend '{backend}', using in-memory sessions")
+    return MemorySessionStore()
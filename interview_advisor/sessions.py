@@ -0,0 +1,190 @@
+"""
+Interview session identity and storage layout
+
+Session ids are time-ordered and unique: a millisecond timestamp followed by
+80 random bits, both Crockford base32 encoded (ULID layout), so ids sort by
+creation time and two sessions started in the same millisecond still differ.
+Ids generated in one process within the same millisecond increase
+monotonically.
+
+Session directories are spread over two levels of hash-named shards,
+cache/interviews/ab/cd/<session_id>, so no directory holds more than a few
+hundred entries however many sessions accumulate. SessionJanitor removes
+session directories by age and keeps the whole tree under a byte budget.
+The tree is shared by every web worker, so the janitor runs in one process
+only: started by the single-process dev server, or as
+`python -m interview_advisor.sessions` (one sweep) from cron.
+"""
+
+import os
+import time
+import shutil
+import hashlib
+import secrets
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+SESSIONS_ROOT = os.path.join("cache", "interviews")
+
+# Janitor limits: sessions idle longer than this are removed...
+SESSION_MAX_AGE_SECONDS = float(os.environ.get('INTERVIEW_SESSION_MAX_AGE_DAYS', 30)) * 86400
+# ...and the oldest are removed until the tree fits in this many bytes
+SESSION_MAX_BYTES = int(os.environ.get('INTERVIEW_SESSION_MAX_MB', 1024)) * 1024 * 1024
+# Sessions touched this recently are never removed (they may be in progress)
+SESSION_ACTIVE_GRACE_SECONDS = 3600
+JANITOR_INTERVAL_SECONDS = float(os.environ.get('INTERVIEW_JANITOR_INTERVAL', 3600))
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+_id_lock = threading.Lock()
+_last_ms = 0
+_last_random = 0
+
+
+def _encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, 32)
+        chars.append(_CROCKFORD[digit])
+    return "".join(reversed(chars))
+
+
+def new_session_id(prefix: str = "interview") -> str:
+    """Return a new unique, time-ordered session id such as interview_01J9Z3...."""
+    global _last_ms, _last_random
+
+    with _id_lock:
+        now_ms = int(time.time() * 1000)
+        if now_ms <= _last_ms:
+            # Same millisecond (or clock step back): keep ordering by incrementing
+            now_ms = _last_ms
+            random_part = (_last_random + 1) & ((1 << 80) - 1)
+        else:
+            random_part = secrets.randbits(80)
+        _last_ms, _last_random = now_ms, random_part
+
+    return f"{prefix}_{_encode(now_ms, 10)}{_encode(random_part, 16)}"
+
+
+def session_timestamp(session_id: str) -> Optional[float]:
+    """Creation time (seconds) encoded in a session id, or None for legacy ids."""
+    token = session_id.rsplit("_", 1)[-1]
+    if len(token) != 26:
+        return None
+    value = 0
+    for char in token[:10]:
+        digit = _CROCKFORD.find(char)
+        if digit < 0:
+            return None
+        value = value * 32 + digit
+    return value / 1000
+
+
+def session_path(session_id: str, root: str = SESSIONS_ROOT) -> str:
+    """Sharded directory for a session: <root>/<2 hex>/<2 hex>/<session_id>."""
+    digest = hashlib.sha1(session_id.encode("utf-8")).hexdigest()
+    return os.path.join(root, digest[:2], digest[2:4], session_id)
+
+
+def _is_shard(name: str) -> bool:
+    return len(name) == 2 and all(c in "0123456789abcdef" for c in name)
+
+
+def iter_session_dirs(root: str = SESSIONS_ROOT) -> Iterator[str]:
+    """Yield every session directory, sharded or from the old flat layout."""
+    try:
+        top = list(os.scandir(root))
+    except FileNotFoundError:
+        return
+    for entry in top:
+        if not entry.is_dir():
+            continue
+        if not _is_shard(entry.name):
+            # Flat layout used before sharding
+            yield entry.path
+            continue
+        for second in os.scandir(entry.path):
+            if second.is_dir():
+                for session in os.scandir(second.path):
+                    if session.is_dir():
+                        yield session.path
+
+
+def _dir_usage(path: str) -> Tuple[int, float]:
+    """Total size in bytes and latest modification time of the files under path."""
+    size, mtime = 0, 0.0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                stat = os.stat(os.path.join(dirpath, filename))
+            except OSError:
+                continue
+            size += stat.st_size
+            mtime = max(mtime, stat.st_mtime)
+    if not mtime:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            pass
+    return size, mtime
+
+
+class SessionJanitor:
+    """Expires session directories by age and total size."""
+
+    def __init__(self, root: str = SESSIONS_ROOT, max_age: float = SESSION_MAX_AGE_SECONDS,
+                 max_bytes: int = SESSION_MAX_BYTES, grace: float = SESSION_ACTIVE_GRACE_SECONDS):
+        self.root = root
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.grace = grace
+        self._thread = None
+        self._stop = threading.Event()
+
+    def sweep(self) -> List[str]:
+        """Remove expired sessions, then the least recently used ones while over budget. Returns removed paths."""
+        now = time.time()
+        sessions = []
+        for path in iter_session_dirs(self.root):
+            size, mtime = _dir_usage(path)
+            sessions.append((mtime, size, path))
+
+        removed = []
+        total = sum(size for _, size, _ in sessions)
+        # Least recently used first
+        for mtime, size, path in sorted(sessions):
+            idle = now - mtime
+            if idle < self.grace:
+                break
+            if idle > self.max_age or total > self.max_bytes:
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                removed.append(path)
+
+        if removed:
+            print(f"[SessionJanitor] Removed {len(removed)} sessions, {total / 1024 / 1024:.1f} MB remain")
+        return removed
+
+    def start(self, interval: float = JANITOR_INTERVAL_SECONDS) -> None:
+        """Sweep now and then every interval seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+
+        def run():
+            while True:
+                try:
+                    self.sweep()
+                except Exception as e:
+                    print(f"[SessionJanitor] Sweep failed: {e}")
+                if self._stop.wait(interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="session-janitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+if __name__ == "__main__":
+    SessionJanitor().sweep()
@@ -0,0 +1,164 @@
+"""
+Speculative next-question prefetch
+
+While the candidate is recording an answer the server already knows the
+current question, the resume and the conversation so far. The speculative
+engine uses that time to generate a few follow-up questions that fit most
+answers and to pre-synthesize their speech. When the real answer arrives a
+single short LLM call moderates it and picks one of the candidates (or none),
+so the common case skips both the long generation call and TTS. Anything the
+candidates do not fit falls back to a fresh generation.
+
+Disabled unless INTERVIEW_SPECULATIVE=1.
+"""
+
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+
+from .llm_gateway import get_llm_gateway
+
+SPECULATIVE_ENABLED = os.environ.get('INTERVIEW_SPECULATIVE', '0') == '1'
+
+# Follow-up questions generated per prefetch
+SPECULATIVE_CANDIDATES = int(os.environ.get('INTERVIEW_SPECULATIVE_CANDIDATES', 3))
+
+# How long take() waits for an unfinished prefetch before giving up on it
+SPECULATIVE_WAIT_SECONDS = 2.0
+
+
+class SpeculativeEngine:
+    """Prefetches follow-up candidates for one interview."""
+
+    def __init__(self, interview, candidates: int = SPECULATIVE_CANDIDATES):
+        self.interview = interview
+        self.candidates = candidates
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="interview-speculative")
+        self._lock = threading.Lock()
+        # Question index the current prefetch was made for, and its future
+        self._prefetch_index = None
+        self._prefetch = None
+
+    def prefetch(self) -> bool:
+        """
+        Start generating candidates for the current question, unless that is
+        already underway. Returns True if a prefetch is (now) running or done.
+        """
+        index = self.interview.current_question_index
+        with self._lock:
+            if self._prefetch_index == index and self._prefetch is not None:
+                return True
+            self._prefetch_index = index
+            self._prefetch = self._executor.submit(self._generate_candidates, index)
+        return True
+
+    def _generate_candidates(self, index: int) -> List[Dict]:
+        """Generate follow-up questions and synthesize their speech. Runs in the background."""
+        prompt = f"""{self.interview._question_context()}
+
+The candidate is answering your last question right now. Before hearing the answer, write
+{self.candidates} different follow-up interview questions that would fit well after most
+reasonable answers to it: each should move the interview forward (a deeper follow-up, a
+behavioral question, or a new topic from the resume) without depending on specifics of the
+answer. Each question must be under 60 words.
+
+Return a JSON array of {self.candidates} strings, valid JSON only.
+"""
+        try:
+            response = get_llm_gateway(self.interview.ai_client).generate(
+                prompt,
+                call_site="interview.speculative_candidates",
+                cache=False,
+                generation_config={"temperature": 0.7, "response_mime_type": "application/json"}
+            )
+            questions = json.loads(response.text)
+        except Exception as e:
+            print(f"[Speculative] Candidate generation failed: {e}")
+            return []
+
+        candidates = []
+        for question in questions if isinstance(questions, list) else []:
+            if not isinstance(question, str) or not question.strip():
+                continue
+            candidate = {"text": question.strip(), "audio_path": None}
+            tts_service = self.interview.tts_service
+            if tts_service:
+                try:
+                    candidate["audio_path"] = tts_service.text_to_speech(candidate["text"], play_audio=False)
+                except Exception as e:
+                    print(f"[Speculative] Pre-synthesis failed: {e}")
+            candidates.append(candidate)
+
+        print(f"[Speculative] Prepared {len(candidates)} candidates for question {index + 1}")
+        return candidates
+
+    def take(self, answer: str) -> Optional[Dict]:
+        """
+        Pick a prefetched candidate for the real answer.
+
+        Returns:
+            The chosen candidate ({"text", "audio_path"}), or None when there
+            is no usable prefetch, the answer needs a correction, or no
+            candidate fits.
+        """
+        with self._lock:
+            future = self._prefetch if self._prefetch_index == self.interview.current_question_index else None
+            self._prefetch = None
+            self._prefetch_index = None
+        if future is None:
+            return None
+
+        try:
+            candidates = future.result(timeout=SPECULATIVE_WAIT_SECONDS)
+        except FutureTimeoutError:
+            print("[Speculative] Prefetch not ready, generating normally")
+            return None
+        if not candidates:
+            return None
+
+        options = "\n".join(f"{i}. {c['text']}" for i, c in enumerate(candidates))
+        prompt = f"""You are an interviewer. The candidate just answered your question with:
+
+"{answer}"
+
+Check the answer for factual errors or incorrect technical information, and for
+inappropriate language, profanity, or offensive content. Then decide whether one of these
+prepared follow-up questions is a natural next question after this answer:
+{options}
+
+Return a JSON object with these fields:
+- "has_factual_errors": true/false
+- "has_inappropriate_language": true/false
+- "choice": the number of the best fitting question, or -1 if none fits well
+
+Response format should be valid JSON only.
+"""
+        try:
+            response = get_llm_gateway(self.interview.ai_client).generate(
+                prompt,
+                call_site="interview.speculative_pick",
+                cache=False,
+                generation_config={"temperature": 0.1, "response_mime_type": "application/json"}
+            )
+            verdict = json.loads(response.text)
+            if not isinstance(verdict, dict):
+                raise ValueError(f"expected a JSON object, got {type(verdict).__name__}")
+        except Exception as e:
+            print(f"[Speculative] Candidate pick failed: {e}")
+            return None
+
+        if verdict.get("has_factual_errors") or verdict.get("has_inappropriate_language"):
+            return None
+        choice = verdict.get("choice")
+        # bool is an int subclass; true/false is not a question number
+        if type(choice) is not int or not 0 <= choice < len(candidates):
+            return None
+
+        self.interview.last_answer_analysis = {
+            "has_factual_errors": False,
+            "has_inappropriate_language": False,
+            "response_type": "question"
+        }
+        return candidates[choice]
@@ -0,0 +1,275 @@
+"""
+Speech fluency analysis
+
+Scores how fluently an answer was spoken from its audio and transcript:
+- speech rate (words per minute over the time between the first and last
+  speech) and articulation rate (words per minute of actual speech)
+- pauses: every silence of at least PAUSE_MIN_SECONDS inside the answer,
+  with their count, mean, longest and share of the speaking time
+- filler words ("um", "uh", "you know", ...) and immediate word
+  repetitions ("I I think") counted from the transcript
+- energy (loudness) and pitch statistics
+
+The audio features are computed for all frames at once: the signal is viewed
+as a matrix of overlapping 25 ms frames (no copy), frame energy is one
+reduction over it, and pitch comes from the autocorrelation of the speech
+frames computed with batched FFTs. A two-minute answer is analyzed in a
+fraction of a second.
+
+The result has the keys DatabaseManager.save_audio_metrics stores
+(fluency_score, is_stuttering, word_count, filler_word_count, speech_rate,
+transcription) plus the detailed statistics and the reasons behind the score.
+"""
+
+import re
+import time
+import wave
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .audio_signal import PCM_SAMPLE_RATE, decode_to_pcm, pcm_to_samples, voiced_frames
+
+FRAME_MS = 25
+HOP_MS = 10
+PAUSE_MIN_SECONDS = 0.25
+LONG_PAUSE_SECONDS = 1.0
+
+# Pitch search range (adult speech) and minimum normalized autocorrelation for a voiced frame
+PITCH_MIN_HZ = 75
+PITCH_MAX_HZ = 400
+PITCH_MIN_CORRELATION = 0.3
+PITCH_BLOCK_FRAMES = 1024
+
+# Conversational speech rate that is not penalized (words per minute)
+IDEAL_RATE_WPM = (110, 170)
+
+FILLER_WORDS = {"um", "umm", "uh", "uhh", "er", "erm", "ah", "hmm", "mm", "like", "basically",
+                "actually", "literally", "so", "well", "right", "okay"}
+FILLER_PHRASES = ["you know", "i mean", "kind of", "sort of", "you see"]
+# Single-word fillers that are only counted when they are not doing grammatical work
+_CONTEXT_FILLERS = {"like", "so", "well", "right", "okay", "actually", "basically", "literally"}
+# Share of repeated words above which the answer is flagged as stuttering
+STUTTER_REPETITION_RATIO = 0.03
+
+_WORD_RE = re.compile(r"[a-z']+")
+
+
+def load_pcm(audio_file: str) -> Tuple[np.ndarray, int]:
+    """Mono float samples in [-1, 1] and the sample rate of an audio file."""
+    if audio_file.lower().endswith(".wav"):
+        with wave.open(audio_file, "rb") as wav:
+            if wav.getsampwidth() == 2:
+                channels, sample_rate = wav.getnchannels(), wav.getframerate()
+                samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+                samples = samples.reshape(-1, channels).mean(axis=1) if channels > 1 else samples
+                return samples.astype(np.float32) / 32768.0, sample_rate
+
+    # Other formats (and unusual WAVs) are decoded with ffmpeg
+    with open(audio_file, "rb") as file:
+        pcm = decode_to_pcm(file.read())
+    return pcm_to_samples(pcm), PCM_SAMPLE_RATE
+
+
+def frame_signal(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Overlapping FRAME_MS frames every HOP_MS, as a (frames, frame length) view."""
+    frame = int(sample_rate * FRAME_MS / 1000)
+    hop = int(sample_rate * HOP_MS / 1000)
+    if len(samples) < frame:
+        return np.empty((0, frame), dtype=samples.dtype)
+    return sliding_window_view(samples, frame)[::hop]
+
+
+def frame_energy_db(frames: np.ndarray) -> np.ndarray:
+    return 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+
+
+def speech_mask(energy_db: np.ndarray) -> np.ndarray:
+    """Frames that contain speech, by the recognizer's voice activity detector."""
+    return voiced_frames(energy_db)
+
+
+def frame_pitch(frames: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Fundamental frequency of each frame in Hz (NaN where the frame is not voiced)."""
+    if not len(frames):
+        return np.zeros(0)
+    # Blocks of frames keep the FFT buffers small for long recordings
+    return np.concatenate([_block_pitch(frames[i:i + PITCH_BLOCK_FRAMES], sample_rate)
+                           for i in range(0, len(frames), PITCH_BLOCK_FRAMES)])
+
+
+def _block_pitch(frames: np.ndarray, sample_rate: int) -> np.ndarray:
+    frames = frames - frames.mean(axis=1, keepdims=True)
+    frames = frames * np.hanning(frames.shape[1])
+    # Autocorrelation of every frame at once (zero-padded to avoid wrap-around)
+    size = 1 << int(np.ceil(np.log2(2 * frames.shape[1])))
+    spectrum = np.fft.rfft(frames, n=size, axis=1)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum), n=size, axis=1)
+
+    min_lag = int(sample_rate / PITCH_MAX_HZ)
+    max_lag = min(int(sample_rate / PITCH_MIN_HZ), frames.shape[1] - 1)
+    window = autocorr[:, min_lag:max_lag]
+    lags = np.argmax(window, axis=1) + min_lag
+    peak = window[np.arange(len(frames)), lags - min_lag]
+    correlation = peak / (autocorr[:, 0] + 1e-10)
+
+    pitch = sample_rate / lags.astype(np.float64)
+    pitch[correlation < PITCH_MIN_CORRELATION] = np.nan
+    return pitch
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) indexes of the runs of True in mask."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def pause_durations(speech: np.ndarray) -> np.ndarray:
+    """Durations (seconds) of the silences between the first and last speech frames."""
+    starts, ends = _runs(speech)
+    if len(starts) < 2:
+        return np.zeros(0)
+    gaps = (starts[1:] - ends[:-1]) * HOP_MS / 1000
+    return gaps[gaps >= PAUSE_MIN_SECONDS]
+
+
+def count_fillers(words: List[str]) -> Dict[str, int]:
+    """Filler words and phrases in a tokenized transcript."""
+    counts: Dict[str, int] = {}
+    text = " ".join(words)
+    for phrase in FILLER_PHRASES:
+        found = len(re.findall(rf"\b{phrase}\b", text))
+        if found:
+            counts[phrase] = found
+    for i, word in enumerate(words):
+        if word not in FILLER_WORDS:
+            continue
+        # "like", "so", ... count only at the start of the answer or after another filler
+        if word in _CONTEXT_FILLERS and i > 0 and words[i - 1] not in FILLER_WORDS:
+            continue
+        counts[word] = counts.get(word, 0) + 1
+    return counts
+
+
+def count_repetitions(words: List[str]) -> int:
+    """Words immediately repeated ("I I", "the the")."""
+    return sum(1 for previous, word in zip(words, words[1:]) if word == previous)
+
+
+def analyze_pcm(samples: np.ndarray, sample_rate: int, transcript: Optional[str] = None) -> Dict[str, Any]:
+    """Fluency metrics for mono float samples and (optionally) their transcript."""
+    start = time.perf_counter()
+    duration = len(samples) / sample_rate if sample_rate else 0.0
+
+    frames = frame_signal(samples, sample_rate)
+    energy = frame_energy_db(frames)
+    speech = speech_mask(energy)
+    speech_frames = np.flatnonzero(speech)
+
+    if len(speech_frames):
+        speaking_time = (speech_frames[-1] - speech_frames[0]) * HOP_MS / 1000 + FRAME_MS / 1000
+    else:
+        speaking_time = 0.0
+    voiced_time = len(speech_frames) * HOP_MS / 1000
+
+    pauses = pause_durations(speech)
+    pitch = frame_pitch(frames[speech], sample_rate)
+    pitch = pitch[~np.isnan(pitch)]
+    speech_energy = energy[speech]
+
+    words = _WORD_RE.findall((transcript or "").lower())
+    fillers = count_fillers(words)
+    filler_count = sum(fillers.values())
+    repetitions = count_repetitions(words)
+    speech_rate = len(words) / speaking_time * 60 if speaking_time else 0.0
+
+    metrics = {
+        "transcription": transcript or "",
+        "duration": round(duration, 2),
+        "speaking_time": round(speaking_time, 2),
+        "word_count": len(words),
+        "speech_rate": round(speech_rate, 1),
+        "articulation_rate": round(len(words) / voiced_time * 60, 1) if voiced_time else 0.0,
+        "filler_word_count": filler_count,
+        "filler_words": fillers,
+        "repetition_count": repetitions,
+        "is_stuttering": bool(words) and repetitions / len(words) > STUTTER_REPETITION_RATIO,
+        "pauses": {
+            "count": int(len(pauses)),
+            "long_count": int(np.sum(pauses >= LONG_PAUSE_SECONDS)),
+            "mean": round(float(pauses.mean()), 2) if len(pauses) else 0.0,
+            "max": round(float(pauses.max()), 2) if len(pauses) else 0.0,
+            "total": round(float(pauses.sum()), 2),
+            "ratio": round(float(pauses.sum()) / speaking_time, 3) if speaking_time else 0.0,
+            "histogram": np.histogram(pauses, bins=[PAUSE_MIN_SECONDS, 0.5, 1.0, 2.0, np.inf])[0].tolist()
+        },
+        "energy": {
+            "mean_db": round(float(speech_energy.mean()), 1) if len(speech_energy) else 0.0,
+            "std_db": round(float(speech_energy.std()), 1) if len(speech_energy) else 0.0
+        },
+        "pitch": {
+            "mean_hz": round(float(pitch.mean()), 1) if len(pitch) else 0.0,
+            "std_hz": round(float(pitch.std()), 1) if len(pitch) else 0.0,
+            "min_hz": round(float(np.percentile(pitch, 5)), 1) if len(pitch) else 0.0,
+            "max_hz": round(float(np.percentile(pitch, 95)), 1) if len(pitch) else 0.0
+        }
+    }
+    metrics["fluency_score"], metrics["reasons"] = score_fluency(metrics)
+    metrics["analysis_seconds"] = round(time.perf_counter() - start, 4)
+    return metrics
+
+
+def score_fluency(metrics: Dict[str, Any]) -> Tuple[int, List[str]]:
+    """0-100 fluency score and the reasons for each deduction."""
+    if not metrics["speaking_time"]:
+        return 0, ["No speech detected"]
+
+    score = 100.0
+    reasons = []
+    words = metrics["word_count"]
+
+    if words:
+        filler_ratio = metrics["filler_word_count"] / words
+        if filler_ratio > 0.02:
+            score -= min(25, filler_ratio * 250)
+            reasons.append(f"{metrics['filler_word_count']} filler words ({filler_ratio:.0%} of words)")
+
+        low, high = IDEAL_RATE_WPM
+        rate = metrics["speech_rate"]
+        if rate < low:
+            score -= min(20, (low - rate) / 3)
+            reasons.append(f"Slow speech rate ({rate:.0f} words/min)")
+        elif rate > high:
+            score -= min(20, (rate - high) / 3)
+            reasons.append(f"Fast speech rate ({rate:.0f} words/min)")
+
+        if metrics["is_stuttering"]:
+            score -= 15
+            reasons.append(f"{metrics['repetition_count']} repeated words")
+
+    pauses = metrics["pauses"]
+    if pauses["long_count"]:
+        score -= min(20, pauses["long_count"] * 4)
+        reasons.append(f"{pauses['long_count']} long pauses (longest {pauses['max']:.1f}s)")
+    if pauses["ratio"] > 0.3:
+        score -= min(15, (pauses["ratio"] - 0.3) * 50)
+        reasons.append(f"Pauses take {pauses['ratio']:.0%} of the answer")
+
+    if metrics["pitch"]["std_hz"] and metrics["pitch"]["std_hz"] < 15:
+        score -= 5
+        reasons.append("Monotone delivery (little pitch variation)")
+
+    return int(round(max(0.0, score))), reasons
+
+
+def analyze_speech_fluency(audio_file: str, transcript: Optional[str] = None,
+                           verbose: bool = False) -> Dict[str, Any]:
+    """Fluency metrics for an audio file and (optionally) its transcript."""
+    samples, sample_rate = load_pcm(audio_file)
+    metrics = analyze_pcm(samples, sample_rate, transcript)
+    if verbose:
+        print(f"Analyzed {metrics['duration']:.1f}s of speech in {metrics['analysis_seconds'] * 1000:.0f}ms: "
+              f"{metrics['speech_rate']:.0f} words/min, {metrics['filler_word_count']} fillers, "
+              f"{metrics['pauses']['count']} pauses")
+    return metrics
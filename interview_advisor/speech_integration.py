@@ -5,6 +5,8 @@ import subprocess
 import tempfile
 from typing import Optional
 
+from .speech_fluency import analyze_speech_fluency
+
 
 class SpeechInput:
     """
@@ -144,21 +146,10 @@ class SpeechInput:
             print(f"Error transcribing audio file: {e}")
             return None
 
-    def analyze_fluency(self, audio_file):
-        """Analyze speech fluency from an audio file."""
+    def analyze_fluency(self, audio_file, transcript=None):
+        """Analyze speech fluency from an audio file and its transcript."""
         try:
-            # Import speech fluency analyzer
-            sys.path.append("Aurdio speech")
-            try:
-                from speech_fluency_analyzer import analyze_speech_fluency
-            except ImportError:
-                print("Warning: Could not import speech_fluency_analyzer")
-                return None
-
-            # Analyze the audio file
-            analysis = analyze_speech_fluency(audio_file, verbose=True)
-
-            return analysis
+            return analyze_speech_fluency(audio_file, transcript, verbose=True)
         except Exception as e:
             print(f"Error analyzing speech fluency: {e}")
             return None
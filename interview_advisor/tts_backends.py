@@ -0,0 +1,165 @@
+"""
+TTS backends
+
+TTSService synthesizes speech through one of these backends:
+- ElevenLabsBackend: the ElevenLabs HTTP API over a shared keep-alive session
+- LocalTTSBackend: offline, in-process synthesis with pyttsx3 (espeak, SAPI5
+  or NSSpeechSynthesizer depending on the platform), encoded to MP3 with
+  pydub so every backend produces the same format
+
+A backend returns the encoded audio bytes; caching, routing and playback
+stay in TTSService.
+"""
+
+import io
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import pyttsx3
+    PYTTSX3_AVAILABLE = True
+except ImportError:
+    PYTTSX3_AVAILABLE = False
+
+try:
+    from pydub import AudioSegment
+    PYDUB_AVAILABLE = True
+except ImportError:
+    PYDUB_AVAILABLE = False
+
+# Sentences synthesized at the same time in streaming mode (also sizes the connection pool)
+TTS_STREAM_CONCURRENCY = int(os.environ.get('TTS_STREAM_CONCURRENCY', 3))
+
+TTS_MODEL_ID = "eleven_multilingual_v2"
+TTS_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75,
+    "style": 0.0,
+    "use_speaker_boost": True
+}
+
+# Local engine speaking rate (words per minute) and optional engine voice id
+TTS_LOCAL_RATE = int(os.environ.get('TTS_LOCAL_RATE', 175))
+TTS_LOCAL_VOICE = os.environ.get('TTS_LOCAL_VOICE')
+
+# Pooled keep-alive connections shared by every ElevenLabs request
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=TTS_STREAM_CONCURRENCY * 2))
+
+
+class TTSBackendError(Exception):
+    """Raised when a backend cannot synthesize the text."""
+
+
+class TTSBackend(ABC):
+    """Interface implemented by the synthesis backends."""
+
+    name = "base"
+    # Together with the text and voice, these identify the audio in the cache
+    model_id = ""
+    settings: Dict[str, Any] = {}
+
+    @abstractmethod
+    def voice_id(self) -> Optional[str]:
+        """Voice that synthesize() will use, or None if no voice is available."""
+
+    @abstractmethod
+    def synthesize(self, text: str, voice_id: str) -> bytes:
+        """Return MP3 audio for text. Raises TTSBackendError on failure."""
+
+
+class ElevenLabsBackend(TTSBackend):
+    name = "elevenlabs"
+    model_id = TTS_MODEL_ID
+    settings = TTS_VOICE_SETTINGS
+
+    def __init__(self, api_key: str, base_url: str, voice_getter):
+        """
+        Args:
+            voice_getter: Returns the selected ElevenLabs voice dict (TTSService.current_voice)
+        """
+        self.base_url = base_url
+        self.headers = {
+            "xi-api-key": api_key,
+            "Content-Type": "application/json"
+        }
+        self._voice_getter = voice_getter
+
+    def voice_id(self) -> Optional[str]:
+        voice = self._voice_getter()
+        return voice["voice_id"] if voice else None
+
+    def synthesize(self, text: str, voice_id: str) -> bytes:
+        url = f"{self.base_url}/text-to-speech/{voice_id}?output_format=mp3_44100_128"
+        payload = {
+            "text": text,
+            "model_id": self.model_id,
+            "voice_settings": self.settings
+        }
+
+        print("Sending request to ElevenLabs API...")
+        try:
+            response = _http.post(url, headers=self.headers, json=payload, timeout=30)
+        except requests.exceptions.Timeout:
+            raise TTSBackendError("Timeout while connecting to ElevenLabs API")
+        except requests.exceptions.ConnectionError:
+            raise TTSBackendError("Connection error while connecting to ElevenLabs API")
+        print(f"Response status code: {response.status_code}")
+
+        if response.status_code != 200:
+            raise TTSBackendError(f"{response.status_code} - {response.text}")
+        return response.content
+
+
+class LocalTTSBackend(TTSBackend):
+    name = "local"
+    model_id = "pyttsx3"
+
+    def __init__(self, rate: int = TTS_LOCAL_RATE, voice: Optional[str] = TTS_LOCAL_VOICE):
+        self.settings = {"rate": rate}
+        self._voice = voice
+        # pyttsx3 engines are not thread-safe; one thread owns the engine
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-local")
+        self._engine = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        return PYTTSX3_AVAILABLE and PYDUB_AVAILABLE
+
+    def voice_id(self) -> Optional[str]:
+        return self._voice or "default"
+
+    def synthesize(self, text: str, voice_id: str) -> bytes:
+        try:
+            return self._executor.submit(self._render, text).result()
+        except TTSBackendError:
+            raise
+        except Exception as e:
+            raise TTSBackendError(f"Local synthesis failed: {e}")
+
+    def _render(self, text: str) -> bytes:
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty("rate", self.settings["rate"])
+            if self._voice:
+                self._engine.setProperty("voice", self._voice)
+
+        # pyttsx3 can only render to a file
+        fd, wav_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self._engine.save_to_file(text, wav_path)
+            self._engine.runAndWait()
+            if not os.path.getsize(wav_path):
+                raise TTSBackendError("Local engine produced no audio")
+            mp3 = io.BytesIO()
+            AudioSegment.from_wav(wav_path).export(mp3, format="mp3", bitrate="64k")
+            return mp3.getvalue()
+        finally:
+            os.remove(wav_path)
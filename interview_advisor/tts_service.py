@@ -1,75 +1,166 @@
 import os
+import re
 import time
-import requests
 import subprocess
-from typing import Optional, List
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, List
 import platform
 from dotenv import load_dotenv
 
+from .audio_cache import audio_cache_key, get_audio_cache
+from .voice_catalog import get_voice_catalog
+from .tts_backends import TTS_STREAM_CONCURRENCY, ElevenLabsBackend, LocalTTSBackend, TTSBackend
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Import pygame for silent audio playback
+# Import pygame for silent audio playback (the mixer is initialized on first playback)
 try:
     import pygame
     PYGAME_AVAILABLE = True
-    # Initialize pygame mixer
-    pygame.mixer.init()
 except ImportError:
     PYGAME_AVAILABLE = False
     print("Warning: pygame not available. Using fallback methods.")
 
+# "server": play audio on this machine (local CLI use)
+# "client": only synthesize; the web page fetches and plays the audio
+TTS_PLAYBACK = os.environ.get('TTS_PLAYBACK', 'server')
+
+# How long an audio request waits for synthesis that is still running
+AUDIO_READY_TIMEOUT = 30
+# Remembered fallback substitutions for handed-out audio keys
+MAX_FALLBACK_KEYS = 256
+
+# Local backend: "auto" (fallback and slow-remote routing), "always" or "off"
+TTS_LOCAL_BACKEND = os.environ.get('TTS_LOCAL_BACKEND', 'auto')
+# Smoothed ElevenLabs latency (seconds) above which speech is synthesized locally
+TTS_REMOTE_LATENCY_BUDGET = float(os.environ.get('TTS_REMOTE_LATENCY_BUDGET', 2.5))
+# While routed away, one request is sent to ElevenLabs this often to re-measure it
+TTS_REMOTE_PROBE_SECONDS = 30
+# After a failed request ElevenLabs is skipped for this long
+TTS_REMOTE_FAILURE_COOLDOWN = 60
+TTS_LATENCY_SMOOTHING = 0.3
+
+# Sentence boundary; fragments shorter than MIN_SENTENCE_CHARS are merged with the next one
+SENTENCE_BOUNDARY = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+")
+MIN_SENTENCE_CHARS = 20
+
+_synthesis_executor = ThreadPoolExecutor(max_workers=TTS_STREAM_CONCURRENCY, thread_name_prefix="tts-synth")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences for streaming synthesis."""
+    sentences = []
+    pending = ""
+    for part in SENTENCE_BOUNDARY.split(text.strip()):
+        pending = f"{pending} {part}".strip() if pending else part.strip()
+        if len(pending) >= MIN_SENTENCE_CHARS:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
 
 class TTSService:
-    def __init__(self, silent_mode=False):
-        """Initialize the TTS service with ElevenLabs API.
+    def __init__(self, silent_mode=False, playback=None):
+        """Initialize the TTS service.
+
+        Speech comes from ElevenLabs when ELEVENLABS_API is set, and from the
+        local offline engine when it is not, when ElevenLabs fails, or when
+        its recent latency is over TTS_REMOTE_LATENCY_BUDGET.
 
         Args:
             silent_mode: If True, suppresses error messages (useful for presentations)
+            playback: "server" or "client" (defaults to TTS_PLAYBACK); with
+                "client" nothing is ever played on this machine
         """
         self.silent_mode = silent_mode
+        self.playback = playback or TTS_PLAYBACK
         # Use the directly provided API key instead of environment variable
         self.api_key = os.getenv("ELEVENLABS_API")
-        if not self.api_key:
-            raise ValueError("ELEVENLABS_API environment variable not set.")
 
         self.cache_dir = "cache/audio"
 
-        # Create cache directory
-        os.makedirs(self.cache_dir, exist_ok=True)
+        # Synthesized audio, keyed by content hash and shared across sessions
+        self.audio_cache = get_audio_cache(self.cache_dir)
 
         # ElevenLabs API base URL
         self.base_url = "https://api.elevenlabs.io/v1"
 
-        # Set up headers for API requests
-        self.headers = {
-            "xi-api-key": self.api_key,
-            "Content-Type": "application/json"
-        }
-
-        # Get available voices
-        self.available_voices = self._get_voices()
-
-        # Set default voice to Roger if available, otherwise use the first voice
-        self.current_voice = None
-        if self.available_voices:
-            # Try to find Roger
-            roger_voices = [
-                v for v in self.available_voices if v["name"] == "Roger"]
-
-            if roger_voices:
-                self.current_voice = roger_voices[0]
-                self._log("Default voice set to: Roger")
+        self.remote_backend: Optional[TTSBackend] = None
+        self.voice_catalog = None
+        if self.api_key:
+            # Available voices are loaded on first use from a shared, file-backed
+            # catalog, so creating the service never waits on the API
+            self.voice_catalog = get_voice_catalog(self.api_key, self.base_url)
+            self.remote_backend = ElevenLabsBackend(self.api_key, self.base_url, lambda: self.current_voice)
+        self._current_voice = None
+
+        self.local_backend: Optional[TTSBackend] = None
+        if TTS_LOCAL_BACKEND != "off" and LocalTTSBackend.is_supported():
+            self.local_backend = LocalTTSBackend()
+
+        if self.remote_backend is None and self.local_backend is None:
+            raise ValueError("ELEVENLABS_API environment variable not set and no local TTS engine available.")
+
+        # Remote health: smoothed latency, failure cooldown and last request time
+        self._remote_latency: Optional[float] = None
+        self._remote_down_until = 0.0
+        self._remote_last_used = 0.0
+        self._health_lock = threading.Lock()
+
+        # Playback queue for streamed speech, and the last external player process
+        self._player = None
+        self._player_process = None
+        self._mixer_ready = False
+
+        # Audio key -> synthesis still running, for audio requested before it is ready
+        self._pending: Dict[str, Future] = {}
+        self._pending_lock = threading.RLock()
+        # Audio key -> file actually synthesized for it by the fallback backend
+        self._fallbacks: Dict[str, str] = {}
+
+        backends = [backend.name for backend in (self.remote_backend, self.local_backend) if backend]
+        self._log(f"TTS service initialized successfully (backends: {', '.join(backends)})")
+
+    @property
+    def server_playback(self) -> bool:
+        return self.playback != "client"
+
+    @property
+    def available_voices(self) -> List[dict]:
+        return self.voice_catalog.voices() if self.voice_catalog else []
+
+    @property
+    def current_voice(self) -> Optional[dict]:
+        """The selected voice; defaults to Roger if available, otherwise the first voice."""
+        if self._current_voice is None and self.voice_catalog:
+            voices = self.available_voices
+            if voices:
+                # Try to find Roger
+                roger_voices = [v for v in voices if v["name"] == "Roger"]
+
+                if roger_voices:
+                    self._current_voice = roger_voices[0]
+                    self._log("Default voice set to: Roger")
+                else:
+                    # If Roger not found, use the first available voice
+                    self._current_voice = voices[0]
+                    self._log(
+                        f"Voice 'Roger' not found. Default voice set to: {self._current_voice['name']}")
             else:
-                # If Roger not found, use the first available voice
-                self.current_voice = self.available_voices[0]
-                self._log(
-                    f"Voice 'Roger' not found. Default voice set to: {self.current_voice['name']}")
-        else:
-            self._log_error(
-                "No voices available from the API. Check your API key and internet connection.")
+                self._log_error(
+                    "No voices available from the API. Check your API key and internet connection.")
+        return self._current_voice
 
-        self._log("ElevenLabs TTS service initialized successfully")
+    @current_voice.setter
+    def current_voice(self, voice: Optional[dict]) -> None:
+        self._current_voice = voice
 
     def _log(self, message):
         """Log a message only if not in silent mode."""
@@ -80,37 +171,15 @@ class TTSService:
         """Always log error messages, even in silent mode."""
         print(f"Error: {message}")
 
-    def _get_voices(self) -> List[dict]:
-        """Get available voices directly from the ElevenLabs API."""
-        try:
-            url = f"{self.base_url}/voices"
-            response = requests.get(url, headers=self.headers, timeout=10)
-
-            if response.status_code == 200:
-                voices_data = response.json()
-                return voices_data.get("voices", [])
-            else:
-                error_msg = f"Error fetching voices: {response.status_code} - {response.text}"
-                self._log_error(error_msg)
-                return []
-        except requests.exceptions.Timeout:
-            self._log_error("Timeout while connecting to ElevenLabs API")
-            return []
-        except requests.exceptions.ConnectionError:
-            self._log_error(
-                "Connection error while connecting to ElevenLabs API")
-            return []
-        except Exception as e:
-            self._log_error(f"Error fetching voices: {e}")
-            return []
-
     def get_voice_names(self) -> List[str]:
         """Get list of available voice names."""
         try:
-            if not self.available_voices:
-                self.available_voices = self._get_voices()
+            voices = self.available_voices
+            if not voices and self.voice_catalog:
+                # Retry the API in case the catalog could not be fetched earlier
+                voices = self.voice_catalog.refresh() or []
 
-            return [voice["name"] for voice in self.available_voices]
+            return [voice["name"] for voice in voices]
         except Exception as e:
             self._log_error(f"Error getting voice names: {e}")
             return []
@@ -147,80 +216,241 @@ class TTSService:
 
     def text_to_speech(self, text: str, play_audio: bool = True) -> Optional[str]:
         """Convert text to speech using ElevenLabs API directly."""
+        audio_file = self.synthesize(text)
+        if audio_file and play_audio:
+            self._play_audio(audio_file)
+        return audio_file
+
+    def _choose_backend(self) -> Optional[TTSBackend]:
+        """
+        Backend for the next synthesis.
+
+        ElevenLabs is used while it is healthy. After a failure, or while its
+        smoothed latency is over budget, speech is synthesized locally, with
+        one request every TTS_REMOTE_PROBE_SECONDS still sent to ElevenLabs
+        to notice when it recovers.
+        """
+        remote, local = self.remote_backend, self.local_backend
+        if remote is not None and remote.voice_id() is None:
+            # No voice list (e.g. offline at start-up)
+            remote = None
+        if remote is None or local is None:
+            return remote or local
+        if TTS_LOCAL_BACKEND == "always":
+            return local
+
+        now = time.monotonic()
+        with self._health_lock:
+            if now < self._remote_down_until:
+                return local
+            slow = self._remote_latency is not None and self._remote_latency > TTS_REMOTE_LATENCY_BUDGET
+            if slow and now - self._remote_last_used < TTS_REMOTE_PROBE_SECONDS:
+                return local
+            self._remote_last_used = now
+        return remote
+
+    def _record_remote(self, latency: Optional[float]) -> None:
+        """Update remote health with a request's latency, or None for a failed request."""
+        with self._health_lock:
+            if latency is None:
+                self._remote_down_until = time.monotonic() + TTS_REMOTE_FAILURE_COOLDOWN
+            elif self._remote_latency is None or latency <= TTS_REMOTE_LATENCY_BUDGET:
+                # A fast response is trusted at once, so a recovered API is used again right away
+                self._remote_latency = latency
+            else:
+                self._remote_latency += TTS_LATENCY_SMOOTHING * (latency - self._remote_latency)
+
+    def health(self) -> Dict[str, Any]:
+        """Routing state, for monitoring."""
+        with self._health_lock:
+            latency = self._remote_latency
+            down = time.monotonic() < self._remote_down_until
+        return {
+            "remote": self.remote_backend.name if self.remote_backend else None,
+            "local": self.local_backend.name if self.local_backend else None,
+            "remote_latency": round(latency, 3) if latency is not None else None,
+            "remote_latency_budget": TTS_REMOTE_LATENCY_BUDGET,
+            "remote_down": down
+        }
+
+    def _cache_key(self, text: str, backend: TTSBackend, voice_id: str) -> str:
+        return audio_cache_key(text, voice_id, backend.model_id, backend.settings)
+
+    def synthesize(self, text: str, backend: Optional[TTSBackend] = None,
+                   voice_id: Optional[str] = None) -> Optional[str]:
+        """Synthesize text (or take it from the cache) without playing it; returns the audio file path."""
         if not text or len(text.strip()) == 0:
             self._log_error("Empty text provided for TTS")
             return None
 
-        if not self.current_voice:
+        backend = backend or self._choose_backend()
+        voice_id = voice_id or (backend.voice_id() if backend else None)
+        if not voice_id:
             self._log_error("No voice selected")
             return None
 
+        # Same text, voice and settings always give the same audio
+        cache_key = self._cache_key(text, backend, voice_id)
+        cached_file = self.audio_cache.get(cache_key)
+        if cached_file:
+            print(f"Using cached speech: {cached_file}")
+            return cached_file
+
         # Print information about the current process
         print(f"Generating speech for text (length: {len(text)})")
-        print(f"Using voice: {self.current_voice.get('name', 'Unknown')}")
-
-        # Create output file path with timestamp to prevent conflicts
-        timestamp = int(time.time())
-        temp_file = os.path.join(self.cache_dir, f"tts_{timestamp}.mp3")
+        if backend is self.remote_backend:
+            print(f"Using voice: {self.current_voice.get('name', 'Unknown')}")
+        else:
+            print(f"Using {backend.name} voice: {voice_id}")
 
+        start = time.perf_counter()
         try:
-            # Prepare API endpoint
-            voice_id = self.current_voice["voice_id"]
-            url = f"{self.base_url}/text-to-speech/{voice_id}?output_format=mp3_44100_128"
-
-            # Prepare payload
-            payload = {
-                "text": text,
-                "model_id": "eleven_multilingual_v2",
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.75,
-                    "style": 0.0,
-                    "use_speaker_boost": True
-                }
-            }
-
-            print("Sending request to ElevenLabs API...")
-
-            # Send request to ElevenLabs API
-            response = requests.post(
-                url, headers=self.headers, json=payload, timeout=30)
-
-            print(f"Response status code: {response.status_code}")
-
-            # Check if the request was successful
-            if response.status_code == 200:
-                # Write the audio content to the file
-                with open(temp_file, 'wb') as file:
-                    file.write(response.content)
-                print(f"Audio generated successfully and saved to {temp_file}")
-
-                # Play the audio if requested
-                if play_audio:
-                    self._play_audio(temp_file)
-
-                # Clean up old files
-                self.cleanup_cache()
-
-                return temp_file
-            else:
-                self._log_error(
-                    f"Error generating speech: {response.status_code} - {response.text}")
-                return None
-
-        except requests.exceptions.Timeout:
-            self._log_error("Timeout while connecting to ElevenLabs API")
-            return None
-        except requests.exceptions.ConnectionError:
-            self._log_error(
-                "Connection error while connecting to ElevenLabs API")
-            return None
+            audio = backend.synthesize(text, voice_id)
         except Exception as e:
             self._log_error(f"Error generating speech: {e}")
+            if backend is self.remote_backend:
+                self._record_remote(None)
+                if self.local_backend is not None:
+                    self._log("Falling back to local TTS")
+                    return self.synthesize(text, self.local_backend)
+            return None
+
+        if backend is self.remote_backend:
+            self._record_remote(time.perf_counter() - start)
+
+        # Store the audio in the cache (the janitor evicts old entries if over budget)
+        audio_file = self.audio_cache.put(cache_key, audio)
+        print(f"Audio generated successfully and saved to {audio_file}")
+        return audio_file
+
+    def prepare_speech(self, text: str) -> List[str]:
+        """
+        Content keys of the audio for text, for the browser to fetch in order.
+
+        Audio already in the cache (e.g. a prefetched question) is one key;
+        otherwise there is one key per sentence and their synthesis starts
+        now. The keys can be handed out immediately: audio_file_for_key waits
+        for clips that are still being synthesized.
+        """
+        text = text.strip() if text else ""
+        backend = self._choose_backend() if text else None
+        voice_id = backend.voice_id() if backend else None
+        if not voice_id:
+            return []
+
+        whole_key = self._cache_key(text, backend, voice_id)
+        if whole_key in self.audio_cache:
+            return [whole_key]
+
+        keys = []
+        for sentence in split_sentences(text):
+            key = self._cache_key(sentence, backend, voice_id)
+            with self._pending_lock:
+                if key not in self._pending and key not in self.audio_cache:
+                    # A remote failure falls back to local audio, stored under another key;
+                    # the future's result still gives its path
+                    future = _synthesis_executor.submit(self.synthesize, sentence, backend, voice_id)
+                    self._pending[key] = future
+                    future.add_done_callback(lambda future, key=key: self._pending_done(key, future))
+            keys.append(key)
+        return keys
+
+    def _pending_done(self, key: str, future: Future) -> None:
+        audio_file = None if future.cancelled() or future.exception() else future.result()
+        with self._pending_lock:
+            self._pending.pop(key, None)
+            if audio_file and audio_file != self.audio_cache.path_for(key):
+                # Synthesized by the fallback backend under a different key
+                self._fallbacks[key] = audio_file
+                while len(self._fallbacks) > MAX_FALLBACK_KEYS:
+                    self._fallbacks.pop(next(iter(self._fallbacks)))
+
+    def audio_file_for_key(self, key: str, timeout: float = AUDIO_READY_TIMEOUT) -> Optional[str]:
+        """
+        Path of the audio for a key from prepare_speech, waiting for it if it is
+        still being synthesized. Only synthesis running in this process is
+        waited for: any other key that is not cached fails at once, so with
+        several web workers the audio must be fetched from the worker that
+        handed out the key (sticky sessions).
+        """
+        audio_file = self.audio_cache.get(key)
+        if audio_file:
+            return audio_file
+        with self._pending_lock:
+            future = self._pending.get(key)
+            fallback = self._fallbacks.get(key)
+        if fallback and os.path.exists(fallback):
+            return fallback
+        if future is None:
             return None
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            return None
+
+    def speak_stream(self, text: str) -> Future:
+        """
+        Synthesize text sentence by sentence and play the sentences in order as
+        they become ready. Returns at once; the future gives the audio files.
+        """
+        return self._queue_playback(self._synthesize_sentences(text))
+
+    def _synthesize_sentences(self, text: str) -> List[Future]:
+        """Submit text's sentences for synthesis with one backend and voice chosen for the whole text."""
+        backend = self._choose_backend()
+        voice_id = backend.voice_id() if backend else None
+        if not voice_id:
+            self._log_error("No voice selected")
+            return []
+        return [_synthesis_executor.submit(self.synthesize, sentence, backend, voice_id)
+                for sentence in split_sentences(text)]
+
+    def play_async(self, audio_file: str) -> Future:
+        """Queue an existing audio file behind whatever is already being played."""
+        ready = Future()
+        ready.set_result(audio_file)
+        return self._queue_playback([ready])
+
+    def _queue_playback(self, futures: List[Future]) -> Future:
+        # One player thread, so queued clips never overlap
+        if self._player is None:
+            self._player = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-player")
+        return self._player.submit(self._play_in_order, futures)
+
+    def _play_in_order(self, futures: List[Future]) -> List[str]:
+        played = []
+        for future in futures:
+            try:
+                audio_file = future.result()
+            except Exception as e:
+                self._log_error(f"Error generating speech: {e}")
+                continue
+            if audio_file:
+                self._wait_for_playback()
+                self._play_audio(audio_file)
+                played.append(audio_file)
+        return played
+
+    def _wait_for_playback(self) -> None:
+        """Block until the clip currently playing has finished."""
+        if PYGAME_AVAILABLE and self._mixer_ready:
+            try:
+                while pygame.mixer.music.get_busy():
+                    time.sleep(0.05)
+            except Exception:
+                pass
+        if self._player_process is not None:
+            try:
+                self._player_process.wait(timeout=120)
+            except Exception:
+                pass
 
     def _play_audio(self, audio_file: str) -> None:
         """Play audio file silently in background without UI."""
+        if not self.server_playback:
+            # Client delivery: the browser plays the audio
+            return
+
         if not os.path.exists(audio_file):
             self._log_error(f"Audio file not found: {audio_file}")
             return
@@ -230,6 +460,9 @@ class TTSService:
         # Try pygame first (completely UI-less)
         if PYGAME_AVAILABLE:
             try:
+                if not self._mixer_ready:
+                    pygame.mixer.init()
+                    self._mixer_ready = True
                 pygame.mixer.music.load(audio_file)
                 pygame.mixer.music.play()
                 print("Playing with pygame (no UI)")
@@ -243,50 +476,32 @@ class TTSService:
             if platform.system() == 'Windows':
                 # Use hidden PowerShell command
                 cmd = f'powershell -WindowStyle Hidden -Command "(New-Object Media.SoundPlayer \'{audio_file}\').PlaySync();"'
-                subprocess.Popen(cmd, shell=True,
-                                 stdout=subprocess.DEVNULL,
-                                 stderr=subprocess.DEVNULL,
-                                 creationflags=subprocess.CREATE_NO_WINDOW)
+                self._player_process = subprocess.Popen(cmd, shell=True,
+                                                        stdout=subprocess.DEVNULL,
+                                                        stderr=subprocess.DEVNULL,
+                                                        creationflags=subprocess.CREATE_NO_WINDOW)
                 print("Playing with hidden PowerShell")
             # macOS approach
             elif platform.system() == 'Darwin':
-                subprocess.Popen(['afplay', audio_file],
-                                 stdout=subprocess.DEVNULL,
-                                 stderr=subprocess.DEVNULL)
+                self._player_process = subprocess.Popen(['afplay', audio_file],
+                                                        stdout=subprocess.DEVNULL,
+                                                        stderr=subprocess.DEVNULL)
                 print("Playing with afplay")
             # Linux approach
             elif platform.system() == 'Linux':
-                subprocess.Popen(['aplay', audio_file],
-                                 stdout=subprocess.DEVNULL,
-                                 stderr=subprocess.DEVNULL)
+                self._player_process = subprocess.Popen(['aplay', audio_file],
+                                                        stdout=subprocess.DEVNULL,
+                                                        stderr=subprocess.DEVNULL)
                 print("Playing with aplay")
             else:
                 self._log_error(f"Unsupported platform: {platform.system()}")
         except Exception as e:
             self._log_error(f"Audio playback error: {e}")
 
-    def cleanup_cache(self, max_files: int = 20) -> None:
-        """Clean up old cached audio files."""
+    def cleanup_cache(self) -> None:
+        """Evict least recently used audio beyond the cache's size and age limits."""
         try:
-            if not os.path.exists(self.cache_dir):
-                return
-
-            files = os.listdir(self.cache_dir)
-            audio_files = [os.path.join(self.cache_dir, f)
-                           for f in files if f.endswith('.mp3')]
-
-            # Sort by modification time (oldest first)
-            audio_files.sort(key=lambda x: os.path.getmtime(x))
-
-            # Remove oldest files if there are too many
-            if len(audio_files) > max_files:
-                for file_path in audio_files[:-max_files]:
-                    try:
-                        os.remove(file_path)
-                    except Exception:
-                        # Silently continue if a file can't be deleted
-                        pass
-
+            self.audio_cache.evict()
         except Exception as e:
             self._log_error(f"Error cleaning up cache: {e}")
 
@@ -0,0 +1,133 @@
+"""
+Interview turn jobs
+
+Runs interview turns (LLM calls, conversation writes, TTS) on a worker pool
+instead of the web request thread. Submitting a turn returns a job id at
+once; the client polls the job for its result. Turns sharing a key (one
+interview) run one at a time and in submission order: a turn whose key is
+busy waits in a per-key queue and only takes a pool thread once the turn
+before it has finished, so one slow interview cannot tie up the pool.
+Requests that process a turn themselves (streamed or synchronous) hold the
+same per-key slot through exclusive().
+
+Jobs live in the memory of the process that accepted them, so deployments
+with several web workers need sticky sessions (route each user to the same
+worker) for the status polls to find their job.
+"""
+
+import os
+import time
+import uuid
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Set
+
+TURN_WORKERS = int(os.environ.get('INTERVIEW_TURN_WORKERS', 4))
+
+# Finished jobs are kept this long for the client to collect
+JOB_TTL_SECONDS = 600
+
+
+class TurnJobQueue:
+    """Thread-pool backed job queue with per-key ordering."""
+
+    def __init__(self, max_workers: int = TURN_WORKERS, ttl: float = JOB_TTL_SECONDS):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="turn-job")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # Keys with a turn running, and the jobs waiting behind it; both only
+        # hold keys that are in use, so nothing accumulates per interview
+        self._busy_keys: Set[str] = set()
+        self._waiting: Dict[str, Deque[tuple]] = {}
+        self._lock = threading.Lock()
+        self._key_free = threading.Condition(self._lock)
+
+    def submit(self, fn: Callable[..., Any], *args, key: Optional[str] = None,
+               owner: Optional[Any] = None, **kwargs) -> str:
+        """
+        Queue fn(*args, **kwargs) and return its job id.
+
+        Args:
+            key: Jobs with the same key never run concurrently (e.g. one interview)
+            owner: Stored with the job so callers can check who may read it
+        """
+        self._prune()
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "owner": owner,
+            "result": None,
+            "error": None,
+            "created": time.time(),
+            "started": None,
+            "finished": None
+        }
+        task = (job, key, fn, args, kwargs)
+        with self._lock:
+            self._jobs[job_id] = job
+            if key is not None and key in self._busy_keys:
+                self._waiting.setdefault(key, deque()).append(task)
+                return job_id
+            if key is not None:
+                self._busy_keys.add(key)
+
+        self._executor.submit(self._run, *task)
+        return job_id
+
+    @contextmanager
+    def exclusive(self, key: str) -> Iterator[None]:
+        """Hold key's turn slot: waits for queued and running jobs of the key, blocks new ones."""
+        with self._key_free:
+            while key in self._busy_keys:
+                self._key_free.wait()
+            self._busy_keys.add(key)
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    def _release(self, key: str) -> None:
+        """Hand key to its next waiting job, or free it."""
+        with self._lock:
+            waiting = self._waiting.get(key)
+            if not waiting:
+                self._waiting.pop(key, None)
+                self._busy_keys.discard(key)
+                self._key_free.notify_all()
+                return
+            task = waiting.popleft()
+            if not waiting:
+                del self._waiting[key]
+        self._executor.submit(self._run, *task)
+
+    def _run(self, job: Dict, key: Optional[str], fn: Callable, args, kwargs) -> None:
+        try:
+            job["status"] = "running"
+            job["started"] = time.time()
+            job["result"] = fn(*args, **kwargs)
+            job["status"] = "done"
+        except Exception as e:
+            print(f"[TurnJobs] Job {job['id']} failed: {e}")
+            job["error"] = str(e)
+            job["status"] = "error"
+        finally:
+            job["finished"] = time.time()
+            if key is not None:
+                self._release(key)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of the job, or None if it is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _prune(self) -> None:
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job["finished"] and now - job["finished"] > self.ttl]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -3,7 +3,7 @@ from dotenv import load_dotenv
 import json
 import tempfile
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 import sqlite3
 
 # Load environment variables
@@ -34,6 +34,66 @@ def save_json_file(data: Dict, file_path: str) -> bool:
         return False
 
 
+def append_jsonl(records: List[Dict], file_path: str, fsync: bool = False) -> bool:
+    """
+    Append records to a JSON-lines file, one line each, in a single write.
+    With fsync the data is on disk when this returns.
+    """
+    if not records:
+        return True
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode('utf-8')
+        with open(file_path, 'ab+') as file:
+            # Start on a fresh line if a previous write was cut short
+            if file.tell() > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    data = b"\n" + data
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        return True
+    except Exception as e:
+        print(f"Error appending to file {file_path}: {e}")
+        return False
+
+
+def iter_jsonl(file_path: str) -> Iterator[Dict]:
+    """Yield the records of a JSON-lines file, skipping a torn or corrupt line (e.g. after a crash)."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping unreadable line in {file_path}")
+    except FileNotFoundError:
+        return
+
+
+def write_jsonl_atomic(records: Iterator[Dict], file_path: str) -> bool:
+    """Write records to a new JSON-lines file and swap it into place, so readers never see a partial file."""
+    temp_path = f"{file_path}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+        return True
+    except Exception as e:
+        print(f"Error writing file {file_path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+
 def create_temp_file(content: str, suffix: str = '.txt') -> str:
     """Create a temporary file with the given content."""
     temp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
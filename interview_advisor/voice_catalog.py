@@ -0,0 +1,135 @@
+"""
+ElevenLabs voice catalog
+
+The voice list rarely changes, so it is fetched once and kept in a local
+file with a TTL instead of being requested every time a TTSService starts.
+Nothing happens at construction time: the list is loaded on first use, from
+the file if there is one (even an expired one, which is then refreshed on a
+background thread), and only fetched synchronously when no copy exists at
+all. After a failed fetch with nothing cached, callers get an empty list
+straight away for a while instead of each waiting on the API again, so TTS
+falls back to the local backend without stalling. One catalog is shared per
+API key.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+import requests
+
+VOICE_CATALOG_DIR = os.path.join("cache", "voices")
+VOICE_CATALOG_TTL_SECONDS = float(os.environ.get('TTS_VOICE_CATALOG_TTL', 24 * 3600))
+VOICE_FETCH_TIMEOUT = 10
+# How long to stop fetching synchronously after a failed fetch
+VOICE_FETCH_RETRY_SECONDS = float(os.environ.get('TTS_VOICE_FETCH_RETRY', 60))
+
+
+class VoiceCatalog:
+    """Lazily loaded, file-backed list of available voices."""
+
+    def __init__(self, api_key: str, base_url: str, cache_dir: str = VOICE_CATALOG_DIR,
+                 ttl: float = VOICE_CATALOG_TTL_SECONDS):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.ttl = ttl
+        # One file per key: different accounts have different voices
+        key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        self.cache_path = os.path.join(cache_dir, f"voices_{key_hash}.json")
+
+        self._voices: Optional[List[Dict]] = None
+        self._fetched_at = 0.0
+        self._failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def voices(self) -> List[Dict]:
+        """Return the voice list, refreshing it in the background when it has expired."""
+        with self._lock:
+            if self._voices is None:
+                self._load_file()
+            voices, fetched_at, failed_at = self._voices, self._fetched_at, self._failed_at
+
+        if voices is None:
+            if failed_at is not None and time.time() - failed_at < VOICE_FETCH_RETRY_SECONDS:
+                return []
+            # Nothing cached anywhere: this call has to wait for the API
+            return self.refresh() or []
+        if time.time() - fetched_at > self.ttl:
+            self.refresh_async()
+        return voices
+
+    def _load_file(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self._voices = data["voices"]
+            self._fetched_at = data.get("fetched_at", 0.0)
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+    def refresh(self) -> Optional[List[Dict]]:
+        """Fetch the voice list from the API and persist it. Returns None on failure (keeping the old list)."""
+        try:
+            response = requests.get(f"{self.base_url}/voices", headers={"xi-api-key": self.api_key},
+                                    timeout=VOICE_FETCH_TIMEOUT)
+            if response.status_code != 200:
+                print(f"Error: Error fetching voices: {response.status_code} - {response.text}")
+                return self._fetch_failed()
+            voices = response.json().get("voices", [])
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error: Could not fetch voices from ElevenLabs API: {e}")
+            return self._fetch_failed()
+
+        fetched_at = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            # Unique per process and thread: forked workers can share thread ids
+            temp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"fetched_at": fetched_at, "voices": voices}, file)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error: Could not save voice catalog: {e}")
+
+        with self._lock:
+            self._voices, self._fetched_at, self._failed_at = voices, fetched_at, None
+        return voices
+
+    def _fetch_failed(self) -> None:
+        with self._lock:
+            self._failed_at = time.time()
+        return None
+
+    def refresh_async(self) -> None:
+        """Refresh on a background thread, unless a refresh is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="voice-catalog-refresh", daemon=True).start()
+
+
+_catalogs: Dict[str, VoiceCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_voice_catalog(api_key: str, base_url: str) -> VoiceCatalog:
+    """Shared catalog for an API key."""
+    with _catalogs_lock:
+        catalog = _catalogs.get(api_key)
+        if catalog is None:
+            catalog = VoiceCatalog(api_key, base_url)
+            _catalogs[api_key] = catalog
+        return catalog
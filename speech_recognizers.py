@@ -0,0 +1,288 @@
+"""
+Speech recognition backends
+
+Transcribes 16 kHz mono 16-bit PCM (see audio_pipeline) with one of:
+- VoskRecognizer: offline Kaldi models on the CPU; the model is loaded once
+  per process and no network access is needed
+- GoogleRecognizer: the Google Web Speech API through speech_recognition
+
+Long answers are not sent as one clip. segment_speech finds the speech in
+the recording with an energy-based voice activity detector (vectorized over
+30 ms frames with NumPy), drops the silence and cuts the speech into chunks
+of at most CHUNK_MAX_SECONDS at pauses. The chunks are transcribed in
+parallel - on a process pool for the CPU-bound offline engine, on threads
+for the network API - and joined in order.
+
+SPEECH_RECOGNIZER selects the backend: "vosk", "google", or "auto" (Vosk if
+it is installed and its model is present, otherwise Google).
+"""
+
+import os
+import json
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from interview_advisor.audio_signal import (VAD_FRAME_MS, VAD_MIN_SILENCE_MS, VAD_MIN_SPEECH_MS,
+                                            VAD_PADDING_MS, voiced_frames)
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+try:
+    import speech_recognition as sr
+    SPEECH_RECOGNITION_AVAILABLE = True
+except ImportError:
+    SPEECH_RECOGNITION_AVAILABLE = False
+
+SPEECH_RECOGNIZER = os.environ.get('SPEECH_RECOGNIZER', 'auto')
+VOSK_MODEL_PATH = os.environ.get('VOSK_MODEL_PATH', os.path.join("models", "vosk-model-small-en-us-0.15"))
+# Worker processes for offline recognition
+RECOGNIZER_WORKERS = int(os.environ.get('RECOGNIZER_WORKERS', max(1, min(4, (os.cpu_count() or 2) - 1))))
+GOOGLE_RECOGNIZER_THREADS = 4
+
+SAMPLE_RATE = 16000
+
+# Chunks sent to the recognizer in parallel
+CHUNK_MAX_SECONDS = 20.0
+
+
+class RecognitionError(Exception):
+    """Raised when a backend cannot transcribe the audio (not for audio without speech)."""
+
+
+class RecognizerBackend:
+    """Interface implemented by the recognition backends."""
+
+    name = "base"
+    # CPU-bound backends are parallelized with processes, network backends with threads
+    cpu_bound = False
+
+    def transcribe(self, pcm: bytes, sample_rate: int = SAMPLE_RATE) -> str:
+        """Text of one chunk of mono 16-bit PCM; "" if it contains no recognizable speech."""
+        raise NotImplementedError
+
+
+_vosk_models = {}
+_vosk_lock = threading.Lock()
+
+
+def _load_vosk_model(model_path: str):
+    """The Vosk model for model_path, loaded once per process."""
+    with _vosk_lock:
+        model = _vosk_models.get(model_path)
+        if model is None:
+            vosk.SetLogLevel(-1)
+            model = vosk.Model(model_path)
+            _vosk_models[model_path] = model
+        return model
+
+
+class VoskRecognizer(RecognizerBackend):
+    name = "vosk"
+    cpu_bound = True
+
+    def __init__(self, model_path: str = VOSK_MODEL_PATH):
+        self.model_path = model_path
+
+    @staticmethod
+    def is_supported(model_path: str = VOSK_MODEL_PATH) -> bool:
+        return VOSK_AVAILABLE and os.path.isdir(model_path)
+
+    def transcribe(self, pcm: bytes, sample_rate: int = SAMPLE_RATE) -> str:
+        try:
+            recognizer = vosk.KaldiRecognizer(_load_vosk_model(self.model_path), sample_rate)
+            recognizer.AcceptWaveform(pcm)
+            return json.loads(recognizer.FinalResult()).get("text", "")
+        except Exception as e:
+            raise RecognitionError(f"Vosk recognition failed: {e}")
+
+
+class GoogleRecognizer(RecognizerBackend):
+    name = "google"
+
+    def __init__(self, language: str = "en-US"):
+        self.language = language
+
+    @staticmethod
+    def is_supported() -> bool:
+        return SPEECH_RECOGNITION_AVAILABLE
+
+    def transcribe(self, pcm: bytes, sample_rate: int = SAMPLE_RATE) -> str:
+        audio_data = sr.AudioData(pcm, sample_rate, 2)
+        try:
+            return sr.Recognizer().recognize_google(audio_data, language=self.language)
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            raise RecognitionError(f"Could not request results from Google Web Speech API; {e}")
+
+
+def create_recognizer(name: str = SPEECH_RECOGNIZER) -> RecognizerBackend:
+    """
+    Build the recognizer called name ("auto" picks the offline engine when available).
+
+    Raises:
+        RecognitionError: if the requested backend is not installed
+    """
+    if name == "auto":
+        name = "vosk" if VoskRecognizer.is_supported() else "google"
+    if name == "vosk":
+        if not VoskRecognizer.is_supported():
+            raise RecognitionError(f"Vosk is not installed or its model is missing ({VOSK_MODEL_PATH})")
+        return VoskRecognizer()
+    if name == "google":
+        if not GoogleRecognizer.is_supported():
+            raise RecognitionError("speech_recognition is not installed")
+        return GoogleRecognizer()
+    raise RecognitionError(f"Unknown speech recognizer: {name}")
+
+
+def detect_speech(pcm: bytes, sample_rate: int = SAMPLE_RATE) -> List[Tuple[int, int]]:
+    """
+    Find the speech in mono 16-bit PCM.
+
+    Returns:
+        (start, end) sample offsets of the padded speech segments, in order,
+        separated by pauses of at least VAD_MIN_SILENCE_MS. Empty if there is no speech.
+    """
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    frame = int(sample_rate * VAD_FRAME_MS / 1000)
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return []
+
+    # Frame energy in dBFS, one vectorized pass over all frames
+    frames = samples[:n_frames * frame].reshape(n_frames, frame).astype(np.float32) / 32768.0
+    level = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    voiced = voiced_frames(level)
+    if not voiced.any():
+        return []
+
+    # Runs of voiced frames: starts where voiced goes 0 -> 1, ends where it goes 1 -> 0
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    # Bridge short pauses, then drop clicks
+    min_gap = VAD_MIN_SILENCE_MS // VAD_FRAME_MS
+    breaks = np.flatnonzero(starts[1:] - ends[:-1] >= min_gap)
+    starts = np.concatenate((starts[:1], starts[breaks + 1]))
+    ends = np.concatenate((ends[breaks], ends[-1:]))
+    long_enough = (ends - starts) * VAD_FRAME_MS >= VAD_MIN_SPEECH_MS
+    starts, ends = starts[long_enough], ends[long_enough]
+
+    pad = VAD_PADDING_MS // VAD_FRAME_MS
+    return [(int(max(0, s - pad) * frame), int(min(n_frames, e + pad) * frame)) for s, e in zip(starts, ends)]
+
+
+def segment_speech(pcm: bytes, sample_rate: int = SAMPLE_RATE,
+                   max_seconds: float = CHUNK_MAX_SECONDS) -> List[Tuple[int, int]]:
+    """
+    Split the speech in mono 16-bit PCM into chunks for the recognizer.
+
+    Returns:
+        (start, end) sample offsets of chunks of at most max_seconds, in order,
+        cut at pauses where possible. Empty if there is no speech.
+    """
+    # Pack consecutive segments into chunks up to max_seconds; split overlong segments
+    max_samples = int(max_seconds * sample_rate)
+    chunks: List[Tuple[int, int]] = []
+    for start, end in detect_speech(pcm, sample_rate):
+        if chunks:
+            # Padding can reach into the previous chunk
+            start = max(start, chunks[-1][1])
+        if chunks and end - chunks[-1][0] <= max_samples:
+            chunks[-1] = (chunks[-1][0], end)
+            continue
+        while end - start > max_samples:
+            chunks.append((start, start + max_samples))
+            start += max_samples
+        chunks.append((start, end))
+    return chunks
+
+
+# Backend of a pool worker process, created once by _init_worker
+_worker_backend: Optional[RecognizerBackend] = None
+
+
+def _init_worker(name: str) -> None:
+    global _worker_backend
+    _worker_backend = create_recognizer(name)
+    if isinstance(_worker_backend, VoskRecognizer):
+        # Load the model now rather than during the first request
+        _load_vosk_model(_worker_backend.model_path)
+
+
+def _worker_transcribe(pcm: bytes, sample_rate: int) -> str:
+    return _worker_backend.transcribe(pcm, sample_rate)
+
+
+class SpeechTranscriber:
+    """Transcribes recordings of any length with a backend, in parallel chunks."""
+
+    def __init__(self, backend: Optional[RecognizerBackend] = None, workers: int = RECOGNIZER_WORKERS):
+        self.backend = backend or create_recognizer()
+        self.workers = workers
+        self._pool: Optional[Executor] = None
+        self._pool_lock = threading.Lock()
+
+    def _executor(self) -> Executor:
+        with self._pool_lock:
+            if self._pool is None:
+                if self.backend.cpu_bound:
+                    # spawn: forking a multithreaded web server is not safe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker, initargs=(self.backend.name,))
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=GOOGLE_RECOGNIZER_THREADS,
+                                                    thread_name_prefix="speech-recognizer")
+            return self._pool
+
+    def transcribe(self, pcm: bytes, sample_rate: int = SAMPLE_RATE) -> str:
+        """
+        Text of a whole recording ("" if it contains no speech).
+
+        Raises:
+            RecognitionError: if the backend fails
+        """
+        chunks = [pcm[start * 2:end * 2] for start, end in segment_speech(pcm, sample_rate)]
+        if not chunks:
+            return ""
+        if len(chunks) == 1:
+            texts = [self.backend.transcribe(chunks[0], sample_rate)]
+        else:
+            executor = self._executor()
+            if self.backend.cpu_bound:
+                futures = [executor.submit(_worker_transcribe, chunk, sample_rate) for chunk in chunks]
+            else:
+                futures = [executor.submit(self.backend.transcribe, chunk, sample_rate) for chunk in chunks]
+            texts = [future.result() for future in futures]
+        return " ".join(text.strip() for text in texts if text and text.strip())
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+
+_transcriber: Optional[SpeechTranscriber] = None
+_transcriber_lock = threading.Lock()
+
+
+def get_transcriber() -> SpeechTranscriber:
+    """Shared transcriber for the configured backend."""
+    global _transcriber
+
+    with _transcriber_lock:
+        if _transcriber is None:
+            _transcriber = SpeechTranscriber()
+            print(f"[SpeechRecognizer] Using {_transcriber.backend.name} recognizer")
+        return _transcriber
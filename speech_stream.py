@@ -0,0 +1,209 @@
+"""
+Streaming transcription of an answer while it is being recorded
+
+The interview page sends MediaRecorder timeslices as they are recorded. Each
+SpeechStream feeds them to one StreamingDecoder and, every time a piece
+arrives, looks at the audio decoded since the last committed point: speech
+segments that are already followed by a pause are complete, so they are
+committed and transcribed in the background. The transcripts finished so
+far form the partial transcript. When recording stops only the last
+segment is still untranscribed, so the final transcript is ready shortly
+after the candidate stops talking.
+
+Each stream belongs to the user who opened it. A user has at most
+STREAMS_PER_USER open streams (opening another closes their oldest) and the
+process at most MAX_OPEN_STREAMS. StreamReaper closes streams that have had
+no request for STREAM_IDLE_SECONDS; each worker starts its own when it opens
+its first stream.
+
+Streams live in memory (with an ffmpeg process each) in the worker that
+started them, so deployments with several web workers need sticky sessions
+to route a stream's chunks to that worker.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from audio_pipeline import StageTimer, StreamingDecoder, pcm_duration
+from interview_advisor.audio_signal import PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH, VAD_MIN_SILENCE_MS, VAD_PADDING_MS
+from speech_recognizers import detect_speech, get_transcriber
+
+STREAM_IDLE_SECONDS = 300
+STREAM_REAP_INTERVAL_SECONDS = 30
+STREAMS_PER_USER = int(os.environ.get('SPEECH_STREAMS_PER_USER', 2))
+MAX_OPEN_STREAMS = int(os.environ.get('SPEECH_MAX_OPEN_STREAMS', 32))
+STREAM_TRANSCRIBE_THREADS = 4
+
+# Speech that ends closer than this to the end of the decoded audio may still continue
+_COMPLETE_MARGIN = int((VAD_MIN_SILENCE_MS + VAD_PADDING_MS) / 1000 * PCM_SAMPLE_RATE)
+
+_transcribe_executor = ThreadPoolExecutor(max_workers=STREAM_TRANSCRIBE_THREADS,
+                                          thread_name_prefix="speech-stream")
+
+
+class StreamLimitError(Exception):
+    """Raised when the process already has MAX_OPEN_STREAMS streams open."""
+
+
+class SpeechStream:
+    """One recording being transcribed as it arrives."""
+
+    def __init__(self, stream_id: str, owner: Any = None):
+        self.stream_id = stream_id
+        self.owner = owner
+        self.decoder = StreamingDecoder()
+        self.timer = StageTimer()
+        self.last_seen = time.monotonic()
+        # Sample offset up to which audio has been handed to the recognizer
+        self._committed = 0
+        self._segments: List[Future] = []
+        self._next_seq = 0
+        self._lock = threading.Lock()
+
+    def add_chunk(self, data: bytes, seq: Optional[int] = None) -> str:
+        """Feed one timeslice; returns the partial transcript."""
+        with self._lock:
+            self.last_seen = time.monotonic()
+            if seq is not None and seq < self._next_seq:
+                # Retried upload of a piece already fed
+                return self.partial_transcript()
+            self._next_seq = (seq if seq is not None else self._next_seq) + 1
+            self.decoder.feed(data)
+            self._commit_complete_segments(self.decoder.pcm())
+            return self.partial_transcript()
+
+    def _commit_complete_segments(self, pcm: bytes) -> None:
+        total = len(pcm) // PCM_SAMPLE_WIDTH
+        tail = pcm[self._committed * PCM_SAMPLE_WIDTH:]
+        complete = [(start, end) for start, end in detect_speech(tail)
+                    if self._committed + end + _COMPLETE_MARGIN <= total]
+        if not complete:
+            return
+        start, end = complete[0][0], complete[-1][1]
+        self._submit(tail[start * PCM_SAMPLE_WIDTH:end * PCM_SAMPLE_WIDTH])
+        self._committed += end
+
+    def _submit(self, pcm: bytes) -> None:
+        if pcm:
+            self._segments.append(_transcribe_executor.submit(get_transcriber().transcribe, pcm, PCM_SAMPLE_RATE))
+
+    def partial_transcript(self) -> str:
+        """Text of the segments transcribed so far, in order, up to the first one still running."""
+        texts = []
+        for future in self._segments:
+            if not future.done():
+                break
+            if future.exception() is None and future.result():
+                texts.append(future.result())
+        return " ".join(texts)
+
+    def finish(self) -> Tuple[str, Dict[str, float]]:
+        """
+        End the recording and return the full transcript and stage timings.
+
+        Raises:
+            Exception: the recognizer's error, if a segment failed
+        """
+        with self._lock:
+            with self.timer.stage('decode_tail'):
+                pcm = self.decoder.close()
+            with self.timer.stage('transcribe_tail'):
+                self._submit(pcm[self._committed * PCM_SAMPLE_WIDTH:])
+                texts = [future.result() for future in self._segments]
+        timings = self.timer.as_dict()
+        timings['audio_seconds'] = round(pcm_duration(pcm), 3)
+        return " ".join(text for text in texts if text), timings
+
+    def abort(self) -> None:
+        self.decoder.abort()
+        for future in self._segments:
+            future.cancel()
+
+
+_streams: Dict[str, SpeechStream] = {}
+_streams_lock = threading.Lock()
+
+
+def open_stream(stream_id: str, owner: Any) -> SpeechStream:
+    """
+    Start a stream for owner, closing owner's oldest streams beyond STREAMS_PER_USER.
+
+    Raises:
+        StreamLimitError: if MAX_OPEN_STREAMS streams are already open
+        AudioDecodeError: if ffmpeg cannot be started
+    """
+    with _streams_lock:
+        owned = [stream for stream in _streams.values() if stream.owner == owner]
+        superseded = sorted(owned, key=lambda stream: stream.last_seen)[:max(0, len(owned) - STREAMS_PER_USER + 1)]
+        for stream in superseded:
+            del _streams[stream.stream_id]
+        if len(_streams) >= MAX_OPEN_STREAMS:
+            raise StreamLimitError(f"{len(_streams)} audio streams are already open")
+        stream = SpeechStream(stream_id, owner)
+        _streams[stream_id] = stream
+        _reaper.start()
+    for old in superseded:
+        old.abort()
+    return stream
+
+
+def get_stream(stream_id: str, owner: Any) -> Optional[SpeechStream]:
+    """owner's stream stream_id, or None if it does not exist or belongs to someone else."""
+    with _streams_lock:
+        stream = _streams.get(stream_id)
+        return stream if stream is not None and stream.owner == owner else None
+
+
+def close_stream(stream_id: str, owner: Any) -> Optional[SpeechStream]:
+    """Remove owner's stream stream_id and return it (the caller finishes or aborts it)."""
+    with _streams_lock:
+        stream = _streams.get(stream_id)
+        if stream is None or stream.owner != owner:
+            return None
+        return _streams.pop(stream_id)
+
+
+def reap_idle_streams(max_idle: float = STREAM_IDLE_SECONDS) -> int:
+    """Abort streams without a request for max_idle seconds. Returns how many were closed."""
+    now = time.monotonic()
+    with _streams_lock:
+        idle = [_streams.pop(key) for key, stream in list(_streams.items()) if now - stream.last_seen > max_idle]
+    for stream in idle:
+        stream.abort()
+    return len(idle)
+
+
+class StreamReaper:
+    """Closes idle streams on a daemon thread, so abandoned recordings do not keep ffmpeg running."""
+
+    def __init__(self, max_idle: float = STREAM_IDLE_SECONDS):
+        self.max_idle = max_idle
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self, interval: float = STREAM_REAP_INTERVAL_SECONDS) -> None:
+        """Reap every interval seconds."""
+        if self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    reaped = reap_idle_streams(self.max_idle)
+                    if reaped:
+                        print(f"[SpeechStream] Closed {reaped} idle audio streams")
+                except Exception as e:
+                    print(f"[SpeechStream] Reaping failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="speech-stream-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+# Started by the first open_stream in each process
+_reaper = StreamReaper()
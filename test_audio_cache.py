@@ -0,0 +1,63 @@
+import os
+import time
+
+from interview_advisor.audio_cache import AudioCache, audio_cache_key
+
+
+def key(name):
+    return audio_cache_key(name, "voice", "model", {})
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    path = cache.put(key("hello"), b"mp3 data")
+    assert cache.get(key("hello")) == path
+    with open(path, "rb") as file:
+        assert file.read() == b"mp3 data"
+    assert cache.get(key("missing")) is None
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+def test_over_budget_evicts_least_recently_used(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=250)
+    cache.put(key("a"), b"x" * 100)
+    cache.put(key("b"), b"x" * 100)
+    # Reading "a" makes "b" the least recently used
+    assert cache.get(key("a"))
+    cache.put(key("c"), b"x" * 100)
+
+    assert key("b") not in cache
+    assert not os.path.exists(cache.path_for(key("b")))
+    assert cache.get(key("a")) and cache.get(key("c"))
+    assert cache.stats()["bytes"] == 200
+
+
+def test_the_entry_just_written_is_kept(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=50)
+    cache.put(key("a"), b"x" * 40)
+    cache.put(key("big"), b"x" * 100)
+    assert key("a") not in cache
+    assert cache.get(key("big"))
+
+
+def test_old_entries_expire(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    cache.put(key("old"), b"x")
+    cache.put(key("new"), b"x")
+    os.utime(cache.path_for(key("old")), (time.time() - 120, time.time() - 120))
+
+    reopened = AudioCache(str(tmp_path), max_age=60)
+    assert reopened.evict() == 1
+    assert key("old") not in reopened and key("new") in reopened
+
+
+def test_index_is_rebuilt_from_disk_in_access_order(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    for name in ("a", "b"):
+        cache.put(key(name), b"x" * 10)
+    os.utime(cache.path_for(key("a")), (time.time() + 10, time.time() + 10))
+
+    reopened = AudioCache(str(tmp_path), max_bytes=15)
+    assert reopened.stats() == {"entries": 2, "bytes": 20, "hits": 0, "misses": 0}
+    assert reopened.evict() == 1
+    assert key("a") in reopened and key("b") not in reopened
@@ -0,0 +1,49 @@
+from career_index import EXACT_MATCH_WEIGHT, PARTIAL_MATCH_WEIGHT, CareerPathIndex
+
+PATHS = [
+    {"title": "Data Analyst", "skills_needed": ["SQL", "Data Visualization", "Excel"]},
+    {"title": "Web Developer", "skills_needed": ["JavaScript", "HTML", "CSS"]},
+    {"title": "Data Engineer", "skills_needed": ["SQL", "Python", "Data Pipelines"]},
+    {"title": "Designer", "skills_needed": ["Figma", "Visual Design"]},
+]
+
+
+def titles(matches):
+    return [path["title"] for path, _ in matches]
+
+
+def test_exact_and_partial_matches_are_weighted():
+    index = CareerPathIndex(PATHS)
+    scores = index.score(["sql", "Data  Visualization"])
+    # Analyst: both exact; an exact pair does not also count as partial
+    assert scores[0] == 2 * EXACT_MATCH_WEIGHT
+    # Engineer: SQL exact, "data" token shared with "Data Pipelines"
+    assert scores[2] == EXACT_MATCH_WEIGHT + PARTIAL_MATCH_WEIGHT
+    assert 1 not in scores and 3 not in scores
+
+
+def test_top_matches_highest_score_first():
+    index = CareerPathIndex(PATHS)
+    matches = index.top_matches(["SQL", "Python"], limit=2)
+    assert titles(matches) == ["Data Engineer", "Data Analyst"]
+    assert [score for _, score in matches] == [2 * EXACT_MATCH_WEIGHT, EXACT_MATCH_WEIGHT]
+
+
+def test_ties_follow_catalog_order_without_a_seed():
+    index = CareerPathIndex(PATHS)
+    assert titles(index.top_matches(["SQL"], limit=2)) == ["Data Analyst", "Data Engineer"]
+
+
+def test_seeded_tie_break_is_reproducible():
+    index = CareerPathIndex(PATHS)
+    first = titles(index.top_matches(["SQL"], limit=2, tie_break_seed=7))
+    assert first == titles(CareerPathIndex(PATHS).top_matches(["SQL"], limit=2, tie_break_seed=7))
+    assert sorted(first) == ["Data Analyst", "Data Engineer"]
+
+
+def test_unmatched_paths_fill_the_list_with_zero_scores():
+    index = CareerPathIndex(PATHS)
+    matches = index.top_matches(["Figma"], limit=3)
+    assert titles(matches)[0] == "Designer"
+    assert [score for _, score in matches] == [EXACT_MATCH_WEIGHT, 0, 0]
+    assert index.top_matches([], limit=0) == []
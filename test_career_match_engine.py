@@ -0,0 +1,49 @@
+import json
+
+from career_match_engine import CareerMatchEngine, MIN_MATCH_PERCENT, build_catalog
+
+ROLES = [
+    {"role": "Data Analyst", "skills_needed": ["SQL", "Excel", "Tableau"]},
+    {"role": "Software Developer", "skills_needed": ["Python", "Git", "Docker"]},
+    {"role": "DevOps Engineer", "skills_needed": ["Docker", "Kubernetes", "AWS"]},
+]
+
+
+def make_engine(tmp_path):
+    source = tmp_path / "catalog.json"
+    source.write_text(json.dumps(ROLES), encoding="utf-8")
+    out_dir = tmp_path / "compiled"
+    build_catalog(str(source), str(out_dir))
+    return CareerMatchEngine(str(out_dir))
+
+
+def test_no_overlap_returns_no_roles(tmp_path):
+    engine = make_engine(tmp_path)
+    assert engine.top_matches("I enjoy gardening and cooking") == []
+
+
+def test_only_roles_with_shared_skills_are_ranked(tmp_path):
+    engine = make_engine(tmp_path)
+    matches = engine.top_matches("Deployed services with Docker and Kubernetes on AWS", k=3)
+    roles = [match["role"] for match in matches]
+    assert roles == ["DevOps Engineer", "Software Developer"]
+    assert all(match["score"] > 0 and match["matched_skills"] for match in matches)
+    assert all(match["match"] >= MIN_MATCH_PERCENT for match in matches)
+
+
+def test_explicit_skills_count_without_resume_text(tmp_path):
+    engine = make_engine(tmp_path)
+    matches = engine.top_matches(skills=["SQL", "Tableau"], k=1)
+    assert [match["role"] for match in matches] == ["Data Analyst"]
+    assert matches[0]["matched_skills"] == ["SQL", "Tableau"]
+
+
+def test_rebuild_publishes_a_new_build_without_touching_the_loaded_one(tmp_path):
+    engine = make_engine(tmp_path)
+    source = tmp_path / "catalog.json"
+    source.write_text(json.dumps(ROLES[:1]), encoding="utf-8")
+    build_catalog(str(source), str(tmp_path / "compiled"))
+
+    assert engine.n_roles == 3
+    assert engine.top_matches(skills=["Docker"], k=1)[0]["role"] == "Software Developer"
+    assert CareerMatchEngine(str(tmp_path / "compiled")).n_roles == 1
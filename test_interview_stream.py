@@ -0,0 +1,71 @@
+import pytest
+
+import interview_advisor.interview as interview_module
+from interview_advisor.interview import Interview
+
+
+class FakeGateway:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def generate_stream(self, prompt, **kwargs):
+        yield from self.chunks
+
+
+@pytest.fixture
+def make_interview(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def make(chunks):
+        monkeypatch.setattr(interview_module, "get_llm_gateway", lambda ai_client: FakeGateway(chunks))
+        return Interview(ai_client=None, tts_service=None, resume_data={"skills": ["Python"]})
+    return make
+
+
+def streamed(interview):
+    return "".join(interview._stream_turn("I built a data pipeline."))
+
+
+def test_reply_on_the_marker_line(make_interview):
+    interview = make_interview(["VERDICT: question Tell me about ", "the hardest bug you fixed."])
+    assert streamed(interview) == "Tell me about the hardest bug you fixed."
+    assert interview.last_answer_analysis == {"response_type": "question"}
+
+
+def test_marker_on_its_own_line(make_interview):
+    interview = make_interview(["VERDICT: correction\n", "Actually, Python lists are mutable. ",
+                                "How did you use them?"])
+    assert streamed(interview) == "Actually, Python lists are mutable. How did you use them?"
+    assert interview.last_answer_analysis == {"response_type": "correction"}
+
+
+def test_reply_without_a_marker(make_interview):
+    interview = make_interview(["What made you choose ", "that database?"])
+    assert streamed(interview) == "What made you choose that database?"
+    assert interview.last_answer_analysis == {}
+
+
+def test_marker_split_across_chunks(make_interview):
+    interview = make_interview(["VERD", "ICT: ques", "tion\n\nWhy did ", "you pick Kafka?"])
+    assert streamed(interview) == "Why did you pick Kafka?"
+    assert interview.last_answer_analysis == {"response_type": "question"}
+
+
+def test_short_reply_ending_inside_the_header(make_interview):
+    interview = make_interview(["**VERDICT: question** ", "Why?"])
+    assert streamed(interview) == "Why?"
+
+
+def test_stream_broken_off_midway_records_the_regenerated_reply(make_interview, monkeypatch):
+    def broken_stream(previous_answer):
+        yield "Tell me about "
+        raise ConnectionError("stream reset")
+
+    interview = make_interview([])
+    interview.current_question_index = 1
+    monkeypatch.setattr(interview, "_stream_turn", broken_stream)
+    monkeypatch.setattr(interview, "_generate_reply", lambda previous_answer: "Which database did you use?")
+
+    assert list(interview.process_answer_stream("I built a data pipeline.")) == ["Tell me about "]
+    assert interview.last_reply == "Which database did you use?"
+    assert interview.current_question_index == 2
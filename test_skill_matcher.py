@@ -0,0 +1,30 @@
+from skill_matcher import SkillMatcher, get_skill_matcher
+
+
+def test_keywords_match_on_word_boundaries_only():
+    matcher = SkillMatcher(["r", "ai", "java"])
+    assert matcher.match("A career in retail, javascript and maintenance")["skills"] == []
+    assert matcher.match("Statistics in R and applied AI")["skills"] == ["R", "Ai"]
+
+
+def test_punctuated_and_multi_word_keywords():
+    matcher = SkillMatcher(["c++", "node.js", "ci/cd", "machine learning"])
+    result = matcher.match("Built C++ services, Node.js APIs and CI/CD for machine   learning")
+    assert result["skills"] == ["C++", "Node.Js", "Ci/Cd", "Machine Learning"]
+
+
+def test_overlapping_keywords_are_all_found():
+    matcher = SkillMatcher(["data", "data science", "science"])
+    spans = [(start, end, skill) for start, end, skill in matcher.find_all("data science")]
+    assert spans == [(0, 4, "Data"), (0, 12, "Data Science"), (5, 12, "Science")]
+
+
+def test_skills_ordered_by_count_then_first_occurrence():
+    matcher = SkillMatcher(["sql", "python", "excel"], aliases={"sql": "SQL"})
+    result = matcher.match("Excel, Python, SQL, python and more PYTHON; sql")
+    assert result["skills"] == ["Python", "SQL", "Excel"]
+    assert result["counts"] == {"Excel": 1, "Python": 3, "SQL": 2}
+
+
+def test_compiled_matchers_are_reused():
+    assert get_skill_matcher(["git", "docker"]) is get_skill_matcher(["git", "docker"])
@@ -0,0 +1,41 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import interview_advisor.speculative as speculative
+from interview_advisor.speculative import SpeculativeEngine
+
+CANDIDATES = ["Which database did you pick?", "How did you test it?"]
+
+
+class FakeGateway:
+    def __init__(self, verdict):
+        self.verdict = verdict
+
+    def generate(self, prompt, call_site, **kwargs):
+        text = CANDIDATES if call_site == "interview.speculative_candidates" else self.verdict
+        return SimpleNamespace(text=json.dumps(text))
+
+
+def take_with_verdict(monkeypatch, verdict):
+    monkeypatch.setattr(speculative, "get_llm_gateway", lambda ai_client: FakeGateway(verdict))
+    interview = SimpleNamespace(ai_client=None, tts_service=None, current_question_index=1,
+                                last_answer_analysis={}, _question_context=lambda: "context")
+    engine = SpeculativeEngine(interview)
+    engine.prefetch()
+    return engine.take("I built an ETL pipeline.")
+
+
+def test_fitting_candidate_is_taken(monkeypatch):
+    choice = take_with_verdict(monkeypatch, {"has_factual_errors": False,
+                                             "has_inappropriate_language": False, "choice": 1})
+    assert choice["text"] == CANDIDATES[1]
+
+
+@pytest.mark.parametrize("verdict", [[0], "0", 0, None,
+                                     {"choice": True}, {"choice": False}, {"choice": 1.0},
+                                     {"choice": 5}, {"choice": -1},
+                                     {"has_factual_errors": True, "choice": 0}])
+def test_unusable_verdicts_fall_back_to_a_normal_turn(monkeypatch, verdict):
+    assert take_with_verdict(monkeypatch, verdict) is None
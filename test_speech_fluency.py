@@ -0,0 +1,61 @@
+import numpy as np
+
+from interview_advisor.speech_fluency import analyze_pcm, count_fillers, count_repetitions, score_fluency
+
+SAMPLE_RATE = 16000
+rng = np.random.default_rng(0)
+
+
+def test_noise_only_audio_has_no_speech():
+    for level in (0.003, 0.01, 0.1):
+        samples = rng.normal(0.0, level, 3 * SAMPLE_RATE).astype(np.float32)
+        result = analyze_pcm(samples, SAMPLE_RATE)
+        assert result["speaking_time"] == 0.0
+        assert result["fluency_score"] == 0
+        assert result["reasons"] == ["No speech detected"]
+
+
+def metrics(**overrides):
+    values = {
+        "speaking_time": 30.0, "word_count": 70, "filler_word_count": 0, "speech_rate": 140.0,
+        "is_stuttering": False, "repetition_count": 0,
+        "pauses": {"long_count": 0, "max": 0.4, "ratio": 0.1},
+        "pitch": {"std_hz": 30.0},
+    }
+    values.update(overrides)
+    return values
+
+
+def test_fillers_at_the_start_or_after_fillers():
+    words = "so um like i mean the project uh went well".split()
+    assert count_fillers(words) == {"i mean": 1, "so": 1, "um": 1, "like": 1, "uh": 1}
+
+
+def test_context_fillers_doing_grammatical_work_are_not_counted():
+    words = "i like python so i used it well".split()
+    assert count_fillers(words) == {}
+
+
+def test_repetitions():
+    assert count_repetitions("i i think the the plan worked".split()) == 2
+
+
+def test_fluent_answer_scores_full_marks():
+    assert score_fluency(metrics()) == (100, [])
+
+
+def test_each_problem_is_deducted_with_a_reason():
+    score, reasons = score_fluency(metrics(
+        filler_word_count=7, speech_rate=80.0, is_stuttering=True, repetition_count=4,
+        pauses={"long_count": 2, "max": 2.5, "ratio": 0.2}, pitch={"std_hz": 5.0}))
+    assert score < 50
+    assert reasons == ["7 filler words (10% of words)", "Slow speech rate (80 words/min)",
+                       "4 repeated words", "2 long pauses (longest 2.5s)",
+                       "Monotone delivery (little pitch variation)"]
+
+
+def test_score_never_goes_below_zero():
+    score, _ = score_fluency(metrics(
+        filler_word_count=70, speech_rate=300.0, is_stuttering=True, repetition_count=30,
+        pauses={"long_count": 10, "max": 8.0, "ratio": 0.9}, pitch={"std_hz": 1.0}))
+    assert score == 0
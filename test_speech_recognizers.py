@@ -0,0 +1,69 @@
+import numpy as np
+
+from speech_recognizers import SAMPLE_RATE, detect_speech, segment_speech
+
+rng = np.random.default_rng(0)
+
+
+def to_pcm(signal):
+    return (np.clip(signal, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+
+def noise(seconds, level_db):
+    return rng.normal(0.0, 10 ** (level_db / 20), int(seconds * SAMPLE_RATE))
+
+
+def speech(seconds):
+    """Noise with a syllable-rate envelope, loud enough to pass the VAD."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return rng.normal(0.0, 0.1, len(t)) * np.abs(np.sin(2 * np.pi * 2.5 * t)) ** 2
+
+
+def test_steady_noise_is_not_speech():
+    for level_db in (-45, -40, -30, -20):
+        assert detect_speech(to_pcm(noise(3, level_db))) == []
+
+
+def test_silence_is_not_speech():
+    assert detect_speech(bytes(SAMPLE_RATE * 2)) == []
+
+
+def test_continuous_speech_is_detected():
+    segments = detect_speech(to_pcm(speech(4)))
+    assert len(segments) == 1
+    start, end = segments[0]
+    assert start == 0 and end > 3.5 * SAMPLE_RATE
+
+
+def test_speech_after_noise_starts_after_the_noise():
+    clip = np.concatenate([noise(1, -40), speech(2)])
+    segments = detect_speech(to_pcm(clip))
+    assert len(segments) == 1
+    assert 0.8 * SAMPLE_RATE < segments[0][0] < 1.1 * SAMPLE_RATE
+
+
+def test_pauses_split_speech_into_segments():
+    clip = np.concatenate([noise(1, -60), speech(2), noise(1, -60), speech(1)])
+    segments = detect_speech(to_pcm(clip))
+    assert len(segments) == 2
+    (first_start, first_end), (second_start, _) = segments
+    assert first_start < 1.1 * SAMPLE_RATE and first_end < second_start
+
+
+def test_segments_are_packed_into_chunks():
+    clip = np.concatenate([noise(1, -60), speech(2), noise(1, -60), speech(1)])
+    pcm = to_pcm(clip)
+    segments = detect_speech(pcm)
+    assert segment_speech(pcm) == [(segments[0][0], segments[-1][1])]
+
+
+def test_long_speech_is_cut_into_chunks_of_at_most_max_seconds():
+    chunks = segment_speech(to_pcm(speech(7)), max_seconds=3)
+    assert len(chunks) == 3
+    assert all(end - start <= 3 * SAMPLE_RATE for start, end in chunks)
+    # Contiguous: nothing between the chunks is lost
+    assert all(previous[1] == following[0] for previous, following in zip(chunks, chunks[1:]))
+
+
+def test_silence_has_no_chunks():
+    assert segment_speech(bytes(SAMPLE_RATE * 2)) == []
@@ -0,0 +1,32 @@
+from interview_advisor.tts_service import MIN_SENTENCE_CHARS, split_sentences
+
+
+def test_splits_at_sentence_ends():
+    text = "Tell me about your last project. What was the hardest part of it? Why did it matter so much!"
+    assert split_sentences(text) == ["Tell me about your last project.",
+                                     "What was the hardest part of it?",
+                                     "Why did it matter so much!"]
+
+
+def test_short_fragments_merge_with_the_next_sentence():
+    sentences = split_sentences("Great. Thanks. Now tell me about a time you disagreed with your manager.")
+    assert sentences == ["Great. Thanks. Now tell me about a time you disagreed with your manager."]
+    assert all(len(sentence) >= MIN_SENTENCE_CHARS for sentence in sentences)
+
+
+def test_short_tail_joins_the_previous_sentence():
+    assert split_sentences("Describe how you would design the service. Go on.") == [
+        "Describe how you would design the service. Go on."]
+
+
+def test_closing_quotes_and_brackets_stay_with_their_sentence():
+    text = 'You said "it worked fine in testing." Then it failed (in production.) What happened after that?'
+    assert split_sentences(text) == ['You said "it worked fine in testing."',
+                                     "Then it failed (in production.)",
+                                     "What happened after that?"]
+
+
+def test_no_boundary_inside_decimals_or_blank_text():
+    assert split_sentences("It improved latency by 2.5 seconds overall") == [
+        "It improved latency by 2.5 seconds overall"]
+    assert split_sentences("   ") == []
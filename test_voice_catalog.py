@@ -0,0 +1,37 @@
+import requests
+
+from interview_advisor import voice_catalog
+from interview_advisor.voice_catalog import VoiceCatalog
+
+
+def test_failed_fetch_is_not_retried_on_every_call(tmp_path, monkeypatch):
+    calls = []
+
+    def failing_get(*args, **kwargs):
+        calls.append(args)
+        raise requests.exceptions.ConnectTimeout("timed out")
+
+    monkeypatch.setattr(voice_catalog.requests, "get", failing_get)
+    catalog = VoiceCatalog("key", "https://api.example", cache_dir=str(tmp_path))
+    assert catalog.voices() == []
+    assert catalog.voices() == []
+    assert len(calls) == 1
+
+    monkeypatch.setattr(voice_catalog, "VOICE_FETCH_RETRY_SECONDS", 0)
+    assert catalog.voices() == []
+    assert len(calls) == 2
+
+
+def test_successful_fetch_is_cached_to_file(tmp_path, monkeypatch):
+    class Response:
+        status_code = 200
+
+        def json(self):
+            return {"voices": [{"voice_id": "v1", "name": "Rachel"}]}
+
+    monkeypatch.setattr(voice_catalog.requests, "get", lambda *args, **kwargs: Response())
+    VoiceCatalog("key", "https://api.example", cache_dir=str(tmp_path)).voices()
+
+    monkeypatch.setattr(voice_catalog.requests, "get", None)
+    assert VoiceCatalog("key", "https://api.example", cache_dir=str(tmp_path)).voices() == [
+        {"voice_id": "v1", "name": "Rachel"}]